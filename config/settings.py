@@ -2,6 +2,11 @@
 Configuration du jeu Tic Tac Toe
 """
 
+import os
+
+# Répertoire des données locales (journal des parties, statistiques...)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
 # Paramètres de la fenêtre
 WINDOW_CONFIG = {
     'title': 'Jeu de Tic Tac Toe - Edition Deluxe',
@@ -157,7 +162,53 @@ AI_CONFIG = {
             'thinking_time': 2.0
         }
     },
-    'default_level': 'medium'
+    'default_level': 'medium',
+    'search_stats': False  # Affiche les compteurs de recherche de chaque coup de l'IA
+}
+
+# IA de l'Ultimate Tic Tac Toe (recherche alpha-beta à approfondissement itératif)
+ULTIMATE_CONFIG = {
+    'time_limit': 1.0,  # Secondes de recherche par coup au plus
+    'max_depth': {'easy': 2, 'medium': 4, 'hard': 12}
+}
+
+# IA du Qubic 4x4x4 (profondeur de la recherche de menaces forcées, 0 : désactivée)
+QUBIC_CONFIG = {
+    'threat_depth': {'easy': 0, 'medium': 2, 'hard': 6}
+}
+
+# IA du Gomoku 15x15 (alpha-beta sur les meilleurs candidats, victoires par quatres forcés)
+GOMOKU_CONFIG = {
+    'time_limit': 0.8,  # Secondes de recherche par coup au plus
+    'candidates': 10,  # Coups examinés par position
+    'max_depth': {'easy': 1, 'medium': 2, 'hard': 4},
+    'vcf_depth': {'easy': 0, 'medium': 4, 'hard': 10}
+}
+
+# Variante gravité (Puissance 4) : dimensions de la grille et IA alpha-beta
+GRAVITY_CONFIG = {
+    'width': 7,
+    'height': 6,
+    'connect': 4,  # Pions à aligner
+    'time_limit': 1.0,  # Secondes de recherche par coup au plus
+    'max_depth': {'easy': 2, 'medium': 5, 'hard': 42}
+}
+
+# Grille infinie (k pions alignés, sans bord) : la table des menaces a 2^(4(k-1)) entrées, k <= 5 conseillé
+INFINITE_CONFIG = {
+    'connect': 5,  # Pions à aligner
+    'radius': 2,  # Distance aux pions posés des cases candidates de l'IA
+    'max_moves': 400,  # Partie nulle au-delà
+    'time_limit': 0.8,
+    'candidates': 10,
+    'max_depth': {'easy': 1, 'medium': 2, 'hard': 4},
+    'vcf_depth': {'easy': 0, 'medium': 4, 'hard': 10}
+}
+
+# Tables de motifs de lignes (src.patterns), gardées en cache entre deux lancements
+PATTERNS_CONFIG = {
+    'use_cache': True,
+    'cache_dir': os.path.join(DATA_DIR, 'patterns')
 }
 
 # Configuration du menu
@@ -167,3 +218,68 @@ MENU_CONFIG = {
     'particle_background': True,
     'button_animations': True
 }
+
+# Journal des parties (enregistrement binaire en ajout seul)
+GAME_LOG_CONFIG = {
+    'enabled': True,
+    'path': os.path.join(DATA_DIR, 'games.log'),
+    'max_pending': 10000  # Enregistrements en attente avant abandon
+}
+
+# Statistiques persistantes (base SQLite locale)
+STATS_CONFIG = {
+    'enabled': True,
+    'path': os.path.join(DATA_DIR, 'stats.db'),
+    'profile': 'joueur'
+}
+
+# Histogrammes de latence (get_move, make_move, transitions d'écran)
+METRICS_CONFIG = {
+    'enabled': True,
+    'path': os.path.join(DATA_DIR, 'metrics.json'),  # Écrit à la sortie ou sur SIGUSR1
+    'print_on_exit': False
+}
+
+# Serveur de parties local (python -m src.server) et clients légers (main.py --server)
+SERVER_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'ai_workers': 4,  # Threads exécutant les coups de l'IA hors de la boucle asyncio
+    'max_sessions': 10000,
+    'idle_timeout': 900,  # Secondes sans requête avant fermeture d'une session
+    'max_line': 65536,  # Taille maximale d'une requête (octets)
+    'connect_timeout': 5.0,
+    'batch_ai': True,  # Coups de l'IA classique regroupés par src.ai_service
+    'spectator_queue': 64,  # Évènements en attente par spectateur avant coalescence
+    'spectator_overflows': 3,  # Débordements successifs avant de retirer un spectateur
+    'snapshot_path': os.path.join(DATA_DIR, 'sessions.snap'),  # Sessions reprises au redémarrage
+    'snapshot_interval': 60  # Secondes entre deux instantanés (0 : seulement à l'arrêt)
+}
+
+# Service d'IA par lots : compromis latence/débit des coups de l'IA classique
+AI_SERVICE_CONFIG = {
+    'gather_ms': 2.0,  # Attente maximale avant d'évaluer un lot (0 : chaque demande seule)
+    'max_batch': 256,  # Un lot plein est évalué sans attendre la fin de la fenêtre
+    'cache_size': 8192  # Analyses de positions canoniques gardées entre les lots
+}
+
+# Classements Glicko des joueurs et des configurations de l'IA (src.ratings, base des statistiques)
+RATINGS_CONFIG = {
+    'enabled': True,
+    'initial_rating': 1500,
+    'initial_rd': 350,  # Écart type d'une entité sans partie (et plafond)
+    'min_rd': 30,  # Plancher : un classement ancien continue de bouger
+    'rd_growth': 35.0,  # Croissance de l'écart type par jour d'inactivité
+    'matchmaking_games': 20,  # Parties d'une IA avant que son classement choisisse le niveau de repli
+    'batch_size': 32  # Parties classées avant écriture dans la base
+}
+
+# File d'attente des parties entre joueurs du serveur (op "queue", src.matchmaking)
+MATCHMAKING_CONFIG = {
+    'default_rating': 1500,  # Classement d'un joueur qui n'en donne pas
+    'band_width': 50,  # Points de classement par case de la file
+    'widen_seconds': 5.0,  # Attente avant d'accepter une case de plus de chaque côté
+    'max_reach': 8,  # Écart maximal, en cases, entre deux joueurs appariés
+    'ai_fallback': 30.0,  # Secondes sans adversaire avant une partie contre l'IA (0 : jamais)
+    'ai_levels': (('easy', 1300), ('medium', 1700), ('hard', None))  # Niveau de l'IA sous chaque classement
+}
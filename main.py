@@ -4,15 +4,22 @@ Point d'entrée principal du jeu Tic Tac Toe Ultra-Moderne avec Drag & Drop
 
 import sys
 import os
+import time
+import argparse
 import tkinter as tk
 
 # Ajouter le répertoire du projet au path pour les imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.game import GameLogic
+from src.game import GameLogic, VARIANTS
+from src.client import RemoteGameLogic, RemoteError
 from src.modern_ui import ModernGameUI
 from src.enhanced_menu import EnhancedGameMenu
-from config.settings import COLORS
+from src.timers import TimerRegistry
+from src.game_log import GameLogWriter
+from src.stats_store import StatsStore, close_connections
+from src.metrics import recorder
+from config.settings import COLORS, GAME_LOG_CONFIG, STATS_CONFIG, METRICS_CONFIG, SERVER_CONFIG
 
 # Désactiver les anciens modules qui pourraient causer des conflits
 sys.modules['src.ui'] = None
@@ -23,6 +30,11 @@ app_running = False
 current_window = None
 transition_window = None
 root = None
+game_log = None  # Journal des parties partagé par toutes les parties
+stats_store = None  # Scores et statistiques persistants du profil
+metrics = None  # Histogrammes de latence (get_move, make_move, transitions)
+game_variant = 'classic'  # Variante jouée (voir src.game.VARIANTS), choisie par --variant
+game_server = None  # (hôte, port) d'un serveur de parties (--server) : l'interface devient un client léger
 
 def create_transition_window():
     """Crée une fenêtre de transition couvrant tout l'écran pour des transitions fluides"""
@@ -159,6 +171,20 @@ def close_transition_window(delay=500):
 app_running = False
 current_window = None  # Référence à la fenêtre active actuelle
 
+def check_timer_leaks():
+    """Signale les callbacks after() laissés en attente par les écrans précédents"""
+    live_timers = TimerRegistry.total_live()
+    if live_timers:
+        print(f"⚠️ {live_timers} callbacks d'écrans précédents encore en attente")
+        TimerRegistry.report_all()
+    else:
+        print("✓ Aucun callback en attente des écrans précédents")
+
+def record_transition(screen, started, **labels):
+    """Enregistre la durée de construction d'un écran dans les histogrammes de latence"""
+    if metrics is not None:
+        metrics.record('screen_transition', time.perf_counter() - started, screen=screen, **labels)
+
 def start_game(game_mode='pvp', ai_level='medium'):
     """Lance le jeu avec le mode sélectionné"""
     global app_running
@@ -168,7 +194,9 @@ def start_game(game_mode='pvp', ai_level='medium'):
     
     # Marquer l'application comme en cours d'exécution
     app_running = True
+    transition_started = time.perf_counter()
     print(f"⚙️ Démarrage du jeu en mode {game_mode}, niveau IA: {ai_level}")
+    check_timer_leaks()
     
     try:
         # Ne pas créer une nouvelle transition si une transition existe déjà
@@ -209,7 +237,18 @@ def start_game(game_mode='pvp', ai_level='medium'):
         game_window.configure(bg=COLORS['background'])
         
         # Créer une nouvelle instance de logique de jeu
-        game_logic = GameLogic()
+        game_logic = None
+        if game_server is not None:
+            try:
+                game_logic = RemoteGameLogic(game_server, game_mode=game_mode, ai_difficulty=ai_level,
+                                             variant=game_variant)
+                print(f"🌐 Partie hébergée par {game_server[0]}:{game_server[1]}")
+            except (OSError, RemoteError) as e:
+                print(f"⚠️ Serveur de parties injoignable ({e}), partie locale")
+        if game_logic is None:
+            game_logic = GameLogic(game_mode=game_mode, ai_difficulty=ai_level,
+                                   game_log=game_log, stats_store=stats_store, metrics=metrics,
+                                   variant=game_variant)
         
         # Fonction pour retourner au menu de façon robuste
         def back_to_menu():
@@ -279,6 +318,8 @@ def start_game(game_mode='pvp', ai_level='medium'):
         
         # Amener la fenêtre du jeu au premier plan, mais pas encore visible
         game_window.update()
+        record_transition('game', transition_started, level=ai_level if game_mode == 'ai' else 'pvp',
+                          size=game_logic.state.size, variant=game_variant)
         
         # Fermer la transition APRÈS que le jeu soit prêt
         def show_game_window():
@@ -317,7 +358,9 @@ def start_menu():
         return
     
     app_running = True
+    transition_started = time.perf_counter()
     print("🚀 Démarrage du menu principal...")
+    check_timer_leaks()
     
     # Utiliser toujours la fenêtre racine globale
     menu_window = root
@@ -426,6 +469,7 @@ def start_menu():
     menu.setup_ui()
     menu_window.protocol("WM_DELETE_WINDOW", lambda: exit_app(menu_window))
     menu_window.update()
+    record_transition('menu', transition_started)
     
     # Fonction pour afficher le menu après la transition
     def show_menu_window():
@@ -477,6 +521,15 @@ def exit_app(window):
     # Réinitialiser l'état global
     current_window = None
     
+    # Écrire les dernières parties du journal et les statistiques
+    if game_log is not None:
+        game_log.close()
+    if stats_store is not None:
+        stats_store.close()
+        close_connections()
+    if metrics is not None and METRICS_CONFIG['print_on_exit']:
+        metrics.print_report()
+    
     # Forcer le nettoyage des ressources
     import gc
     gc.collect()
@@ -520,7 +573,7 @@ def main():
 
 def init_app():
     """Initialisation complète de l'application avec gestion améliorée du démarrage"""
-    global current_window, app_running, transition_window, root
+    global current_window, app_running, transition_window, root, game_log, stats_store, metrics
     
     print("🎮 Lancement du jeu Tic Tac Toe Ultra-Moderne...")
     print("📁 Architecture modulaire chargée")
@@ -532,6 +585,26 @@ def init_app():
     current_window = None
     transition_window = None
     
+    # Journal des parties écrit en arrière-plan
+    if GAME_LOG_CONFIG['enabled']:
+        game_log = GameLogWriter(GAME_LOG_CONFIG['path'], GAME_LOG_CONFIG['max_pending'])
+        print(f"📝 Journal des parties: {GAME_LOG_CONFIG['path']}")
+    
+    # Scores et statistiques persistants (SQLite)
+    if STATS_CONFIG['enabled']:
+        try:
+            stats_store = StatsStore(STATS_CONFIG['path'], profile=STATS_CONFIG['profile'])
+            print(f"📊 Statistiques du profil '{STATS_CONFIG['profile']}' chargées")
+        except Exception as e:
+            print(f"⚠️ Statistiques indisponibles: {e}")
+            stats_store = None
+    
+    # Histogrammes de latence exportés en JSON à la sortie (ou sur SIGUSR1)
+    if METRICS_CONFIG['enabled']:
+        metrics = recorder
+        metrics.install_dump_handlers(METRICS_CONFIG['path'])
+        print(f"⏱️ Latences exportées dans: {METRICS_CONFIG['path']}")
+    
     try:
         print("🔄 Création de la fenêtre principale...")
         # Créer une fenêtre racine unique pour toute l'application
@@ -621,6 +694,10 @@ def init_app():
         # Démarrer la boucle principale
         print("⏳ Démarrage de la boucle principale Tkinter")
         root.mainloop()
+        if game_log is not None:
+            game_log.close()
+        if stats_store is not None:
+            stats_store.close()
         print("✓ Fin de l'application")
         
     except Exception as e:
@@ -629,5 +706,26 @@ def init_app():
         traceback.print_exc()
         sys.exit(1)
 
+def parse_args(argv=None):
+    """Lit les options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Tic Tac Toe Deluxe")
+    parser.add_argument('--variant', default='classic', choices=sorted(VARIANTS),
+                        help="variante jouée (classic, ultimate 9x9, qubic 4x4x4, gomoku 15x15,"
+                             " gravity Puissance 4, infinite grille infinie)")
+    parser.add_argument('--server', default=None, metavar='HOTE:PORT',
+                        help="jouer sur un serveur de parties (python -m src.server)")
+    return parser.parse_args(argv)
+
+def parse_server_address(text):
+    """(hôte, port) d'une adresse HOTE:PORT, PORT seul ou HOTE seul"""
+    host, _, port = text.rpartition(':')
+    if not host:
+        return (SERVER_CONFIG['host'], int(port)) if port.isdigit() else (port, SERVER_CONFIG['port'])
+    return host, int(port)
+
 if __name__ == "__main__":
+    args = parse_args()
+    game_variant = args.variant
+    if args.server:
+        game_server = parse_server_address(args.server)
     init_app()
@@ -3,33 +3,150 @@ Intelligence artificielle pour le jeu Tic Tac Toe
 IA difficile mais battable avec stratégie adaptative
 """
 
-import random
 import time
-from .utils import check_winner, is_board_full
+from .board import BoardState
+from .utils import ReplayableRandom
+from .search_stats import SearchInstrumentation
 
-class TicTacToeAI:
+# Nature des valeurs de la table de transposition (élagage alpha-beta)
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+class TicTacToeAI(SearchInstrumentation):
     """IA difficile mais battable pour le jeu Tic Tac Toe"""
     
-    def __init__(self, difficulty='hard', player_symbol='O'):
+    def __init__(self, difficulty='hard', player_symbol='O', seed=None):
         # Le paramètre difficulty est conservé pour compatibilité mais ignoré
         self.player_symbol = player_symbol
         self.human_symbol = 'X' if player_symbol == 'O' else 'O'
         self.move_count = 0  # Compteur de coups pour adapter la stratégie
+        self.rng = ReplayableRandom(seed)  # Générateur propre à l'IA (parties rejouables)
+        self._transpositions = {}  # Clé de Zobrist -> (score, nature, coup) pour la recherche en cours
+    
+    def reseed(self, seed):
+        """Réinitialise le générateur aléatoire de l'IA avec une graine donnée"""
+        self.rng.seed(seed)
         
-    def get_move(self, board):
+    def get_move(self, board, analysis=None):
         """
         Retourne le meilleur coup pour l'IA difficile mais battable
         
         Args:
             board: État actuel de la grille (3x3)
+            analysis: Résultats des recherches sur cette position (voir analyze
+                et select), fournis par le service d'IA par lots ; calculés ici si None
             
         Returns:
             tuple: (row, col) du meilleur coup
         """
         self.move_count += 1
-        return self._get_challenging_move(board)
+        started = self._begin_stats()
+        move = self._get_challenging_move(board, analysis)
+        self._end_stats(started, move)
+        return move
+    
+    def analyze(self, board):
+        """
+        Résultats des recherches déterministes de la position, du point de vue de l'IA
+        
+        Ils ne dépendent que de la grille : le service d'IA par lots les calcule
+        une fois pour toutes les sessions qui attendent sur des positions
+        symétriques, puis chaque IA y applique sa propre part d'aléatoire
+        (get_move). Chaque recherche donne toutes ses cases candidates, pas
+        seulement la première : select les départage dans l'ordre des cases
+        de la grille de la session, comme une recherche directe.
+        
+        Returns:
+            dict: win, block, fork, opponent_fork (cases candidates), threats
+            (cases qui créent une menace, pour counter_fork) et minimax
+            ((score, coups optimaux))
+        """
+        state = BoardState.from_grid(board)
+        self._transpositions = {}
+        return {
+            'win': state.winning_cells(self.player_symbol),
+            'block': state.winning_cells(self.human_symbol),
+            'fork': self._fork_cells(state, self.player_symbol),
+            'opponent_fork': self._fork_cells(state, self.human_symbol),
+            'threats': self._threat_cells(state),
+            'minimax': self._minimax_root(state)
+        }
+    
+    @staticmethod
+    def select(analysis, transform=None):
+        """
+        Coups de analyze retenus pour une grille, comme les choisirait une recherche directe
+        
+        Args:
+            analysis: dict retourné par analyze
+            transform: Fonction (row, col) -> (row, col) vers la grille de la
+                session (symétrie), identité si None
+                
+        Returns:
+            dict: win, block, fork, opponent_fork, counter_fork et minimax
+            ((score, coup)), un coup ou None chacun (argument analysis de get_move)
+        """
+        def first(cells, exclude=None):
+            # Les recherches directes retiennent la première case dans l'ordre des lignes
+            cells = [transform(cell) if transform else cell for cell in cells]
+            cells = [cell for cell in cells if cell != exclude]
+            return min(cells) if cells else None
+        
+        opponent_fork = first(analysis['opponent_fork'])
+        score, best = analysis['minimax']
+        return {
+            'win': first(analysis['win']),
+            'block': first(analysis['block']),
+            'fork': first(analysis['fork']),
+            'opponent_fork': opponent_fork,
+            'counter_fork': first(analysis['threats'], opponent_fork) if opponent_fork else None,
+            'minimax': (score, first(best))
+        }
+    
+    def _fork_cells(self, state, symbol):
+        """Toutes les cases qui créent une fourchette pour symbol (voir _find_fork_move)"""
+        cells = []
+        for i, j in state.empty_cells():
+            state.make(i, j, symbol)
+            if self._count_winning_moves(state, symbol) >= 2:
+                cells.append((i, j))
+            state.unmake(i, j)
+        return cells
+    
+    def _threat_cells(self, state):
+        """Toutes les cases qui créent une menace pour l'IA (voir _find_counter_fork)"""
+        cells = []
+        for i, j in state.empty_cells():
+            state.make(i, j, self.player_symbol)
+            if self._count_winning_moves(state, self.player_symbol) > 0:
+                cells.append((i, j))
+            state.unmake(i, j)
+        return cells
     
-    def _get_challenging_move(self, board):
+    def _minimax_root(self, state):
+        """
+        Score minimax de la position et tous les coups qui l'atteignent
+        
+        Chaque coup de la racine est évalué avec une fenêtre complète (score
+        exact) : une recherche directe retient le premier d'entre eux.
+        """
+        inf = float('inf')
+        if state.winner is not None or state.is_full():
+            return self._minimax(state, True, -inf, inf)[0], []
+        values = {}
+        for i, j in state.empty_cells():
+            state.make(i, j, self.player_symbol)
+            values[(i, j)] = self._minimax(state, False, -inf, inf, 1)[0]
+            state.unmake(i, j)
+        best = max(values.values())
+        return best, [move for move, value in values.items() if value == best]
+    
+    def _query(self, analysis, key, label, search, *args):
+        """Résultat d'une recherche : lu dans l'analyse fournie, ou calculé (et chronométré)"""
+        if analysis is not None:
+            return analysis[key]
+        return self._timed(label, search, *args)
+    
+    def _get_challenging_move(self, board, analysis=None):
         """
         IA difficile mais battable : utilise une stratégie adaptative
         - Premier coup : évite le centre (plus humain)
@@ -38,30 +155,34 @@ class TicTacToeAI:
         """
         # Premier coup de l'IA : stratégie variable et plus humaine
         if self.move_count == 1:
-            return self._get_opening_move(board)
+            return self._timed('opening', self._get_opening_move, board)
+        
+        # Les recherches jouent et annulent les coups sur un état incrémental
+        state = BoardState.from_grid(board) if analysis is None else None
         
         # Toujours vérifier si l'IA peut gagner immédiatement
-        win_move = self._find_winning_move(board, self.player_symbol)
+        win_move = self._query(analysis, 'win', 'winning_move', self._find_winning_move, state, self.player_symbol)
         if win_move:
             return win_move
         
         # Toujours bloquer si le joueur peut gagner
-        block_move = self._find_winning_move(board, self.human_symbol)
+        block_move = self._query(analysis, 'block', 'winning_move', self._find_winning_move, state, self.human_symbol)
         if block_move:
             return block_move
         
         # Vérifier les fourchettes (double menace) - priorité élevée
-        fork_move = self._find_fork_move(board, self.player_symbol)
+        fork_move = self._query(analysis, 'fork', 'fork_move', self._find_fork_move, state, self.player_symbol)
         if fork_move:
             # 85% de chance de jouer la fourchette (laisse 15% d'opportunité)
-            if random.random() < 0.85:
+            if self.rng.random() < 0.85:
                 return fork_move
         
         # Bloquer les fourchettes adverses
-        opponent_fork = self._find_fork_move(board, self.human_symbol)
+        opponent_fork = self._query(analysis, 'opponent_fork', 'fork_move', self._find_fork_move, state, self.human_symbol)
         if opponent_fork:
             # Chercher un coup qui bloque la fourchette ou crée une contre-menace
-            counter_move = self._find_counter_fork(board, opponent_fork)
+            counter_move = self._query(analysis, 'counter_fork', 'counter_fork', self._find_counter_fork,
+                                       state, opponent_fork)
             if counter_move:
                 return counter_move
             return opponent_fork  # Bloquer directement si pas de contre-jeu
@@ -72,7 +193,7 @@ class TicTacToeAI:
             return self._get_positional_move(board)
         else:
             # Fin de partie : jeu plus précis mais pas parfait
-            return self._get_endgame_move(board)
+            return self._get_endgame_move(state, board, analysis)
     
     def _get_opening_move(self, board):
         """Premier coup de l'IA - stratégie variée et moins prévisible"""
@@ -81,14 +202,14 @@ class TicTacToeAI:
             corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
             available_corners = [(r, c) for r, c in corners if board[r][c] == ""]
             if available_corners:
-                return random.choice(available_corners)
+                return self.rng.choice(available_corners)
         
         # Si le joueur a pris un coin, ne pas toujours prendre le centre
         corners_taken = sum(1 for r, c in [(0, 0), (0, 2), (2, 0), (2, 2)] if board[r][c] == self.human_symbol)
         
         if corners_taken > 0:
             # 60% de chance de prendre le centre, 40% de prendre un autre coin ou côté
-            if random.random() < 0.6 and board[1][1] == "":
+            if self.rng.random() < 0.6 and board[1][1] == "":
                 return (1, 1)
             else:
                 # Prendre un coin libre ou un côté
@@ -101,79 +222,65 @@ class TicTacToeAI:
                         good_moves.append((r, c))
                 
                 if good_moves:
-                    return random.choice(good_moves)
+                    return self.rng.choice(good_moves)
         
         # Première ouverture : variation entre centre et coins
         if board[1][1] == "":
             # 70% centre, 30% coin (plus imprévisible que toujours centre)
-            if random.random() < 0.7:
+            if self.rng.random() < 0.7:
                 return (1, 1)
         
         # Prendre un coin si disponible
         corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
         available_corners = [(r, c) for r, c in corners if board[r][c] == ""]
         if available_corners:
-            return random.choice(available_corners)
+            return self.rng.choice(available_corners)
         
         # Fallback sur un mouvement aléatoire
         return self._get_random_move(board)
     
-    def _find_fork_move(self, board, symbol):
+    def _find_fork_move(self, state, symbol):
         """Trouve un coup qui crée une fourchette (double menace de victoire)"""
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == "":
-                    # Tester ce coup
-                    board[i][j] = symbol
-                    winning_moves = []
-                    
-                    # Compter combien de coups gagnants ce coup créerait
-                    for x in range(3):
-                        for y in range(3):
-                            if board[x][y] == "":
-                                board[x][y] = symbol
-                                if check_winner(board):
-                                    winning_moves.append((x, y))
-                                board[x][y] = ""
-                    
-                    board[i][j] = ""  # Annuler le coup test
-                    
-                    # C'est une fourchette si on a au moins 2 coups gagnants
-                    if len(winning_moves) >= 2:
-                        return (i, j)
+        for i, j in state.empty_cells():
+            # Tester ce coup
+            state.make(i, j, symbol)
+            winning_moves = self._count_winning_moves(state, symbol)
+            state.unmake(i, j)  # Annuler le coup test
+            
+            # C'est une fourchette si on a au moins 2 coups gagnants
+            if winning_moves >= 2:
+                return (i, j)
         
         return None
     
-    def _find_counter_fork(self, board, fork_position):
+    def _find_counter_fork(self, state, fork_position):
         """Trouve un coup qui bloque une fourchette ou crée une contre-menace"""
         # D'abord essayer de créer une menace qui force l'adversaire à défendre
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == "" and (i, j) != fork_position:
-                    board[i][j] = self.player_symbol
-                    
-                    # Vérifier si ce coup crée une menace immédiate
-                    threats = 0
-                    for x in range(3):
-                        for y in range(3):
-                            if board[x][y] == "":
-                                board[x][y] = self.player_symbol
-                                if check_winner(board):
-                                    threats += 1
-                                board[x][y] = ""
-                    
-                    board[i][j] = ""  # Annuler le coup test
-                    
-                    # Si ce coup crée une menace, c'est un bon contre-jeu
-                    if threats > 0:
-                        return (i, j)
+        for i, j in state.empty_cells():
+            if (i, j) == fork_position:
+                continue
+            state.make(i, j, self.player_symbol)
+            
+            # Vérifier si ce coup crée une menace immédiate
+            threats = self._count_winning_moves(state, self.player_symbol)
+            state.unmake(i, j)  # Annuler le coup test
+            
+            # Si ce coup crée une menace, c'est un bon contre-jeu
+            if threats > 0:
+                return (i, j)
         
         return None
     
+    def _count_winning_moves(self, state, symbol):
+        """Compte les cases vides qui donneraient la victoire à symbol (lecture des tables de motifs)"""
+        if self._stats is not None:
+            self._stats.nodes += 1
+        return len(state.winning_cells(symbol))
+    
     def _get_positional_move(self, board):
         """Stratégie positionnelle avec un peu d'aléatoire"""
         # Prendre le centre si disponible (70% de chance)
-        if board[1][1] == "" and random.random() < 0.7:
+        if board[1][1] == "" and self.rng.random() < 0.7:
             return (1, 1)
         
         # Prendre un coin si disponible
@@ -181,17 +288,23 @@ class TicTacToeAI:
         available_corners = [(r, c) for r, c in corners if board[r][c] == ""]
         if available_corners:
             # 80% de chance de prendre un coin, 20% de faire autre chose
-            if random.random() < 0.8:
-                return random.choice(available_corners)
+            if self.rng.random() < 0.8:
+                return self.rng.choice(available_corners)
         
         # Stratégie alternative : côtés ou mouvement aléatoire
         return self._get_fallback_move(board)
     
-    def _get_endgame_move(self, board):
+    def _get_endgame_move(self, state, board, analysis=None):
         """Stratégie de fin de partie - plus précise mais pas parfaite"""
         # Utiliser minimax avec une probabilité réduite (90%)
-        if random.random() < 0.9:
-            _, move = self._minimax(board, True, -float('inf'), float('inf'))
+        if self.rng.random() < 0.9:
+            # Les scores dépendent de la profondeur depuis la racine : table propre à chaque recherche
+            if analysis is None:
+                self._transpositions = {}
+            score, move = self._query(analysis, 'minimax', 'minimax', self._minimax,
+                                      state, True, -float('inf'), float('inf'))
+            if self._stats is not None:
+                self._stats.score = score
             if move:
                 return move
         
@@ -208,13 +321,13 @@ class TicTacToeAI:
         corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
         available_corners = [(r, c) for r, c in corners if board[r][c] == ""]
         if available_corners:
-            return random.choice(available_corners)
+            return self.rng.choice(available_corners)
         
         # Prendre un côté
         sides = [(0, 1), (1, 0), (1, 2), (2, 1)]
         available_sides = [(r, c) for r, c in sides if board[r][c] == ""]
         if available_sides:
-            return random.choice(available_sides)
+            return self.rng.choice(available_sides)
         
         # Mouvement aléatoire en dernier recours
         empty_cells = []
@@ -223,27 +336,21 @@ class TicTacToeAI:
                 if board[i][j] == "":
                     empty_cells.append((i, j))
         
-        return random.choice(empty_cells) if empty_cells else None
+        return self.rng.choice(empty_cells) if empty_cells else None
     
-    def _find_winning_move(self, board, symbol):
-        """Trouve un coup gagnant pour le symbole donné"""
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == "":
-                    # Tester ce coup
-                    board[i][j] = symbol
-                    if check_winner(board):
-                        board[i][j] = ""  # Annuler le coup
-                        return (i, j)
-                    board[i][j] = ""  # Annuler le coup
-        return None
+    def _find_winning_move(self, state, symbol):
+        """Trouve un coup gagnant pour le symbole donné (le premier dans l'ordre des cases)"""
+        if self._stats is not None:
+            self._stats.nodes += 1
+        cells = state.winning_cells(symbol)
+        return cells[0] if cells else None
     
-    def _minimax(self, board, is_maximizing, alpha, beta, depth=0):
+    def _minimax(self, state, is_maximizing, alpha, beta, depth=0):
         """
         Algorithme minimax avec élagage alpha-beta
         
         Args:
-            board: État de la grille
+            state: État de la grille (BoardState, joué/annulé en place)
             is_maximizing: True si c'est le tour de l'IA
             alpha: Valeur alpha pour l'élagage
             beta: Valeur beta pour l'élagage
@@ -252,78 +359,92 @@ class TicTacToeAI:
         Returns:
             tuple: (score, meilleur_coup)
         """
-        # Vérifier les conditions de fin
-        if check_winner(board):
-            winner = self._get_winner(board)
-            if winner == self.player_symbol:
-                return 10 - depth, None
-            elif winner == self.human_symbol:
-                return depth - 10, None
-        
-        if is_board_full(board):
+        stats = self._stats
+        if stats is not None:
+            stats.nodes += 1
+            if depth > stats.max_depth:
+                stats.max_depth = depth
+        
+        # Vérifier les conditions de fin (bilan incrémental, sans parcourir la grille)
+        if state.winner == self.player_symbol:
+            return 10 - depth, None
+        elif state.winner == self.human_symbol:
+            return depth - 10, None
+        
+        if state.is_full():
             return 0, None
         
+        # Position déjà évaluée (atteinte par un autre ordre de coups)
+        alpha_orig, beta_orig = alpha, beta
+        entry = self._transpositions.get(state.key)
+        if entry is not None:
+            value, bound, move = entry
+            if bound == EXACT:
+                if stats is not None:
+                    stats.cache_hits += 1
+                return value, move
+            if bound == LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                if stats is not None:
+                    stats.cache_hits += 1
+                return value, move
+        
         if is_maximizing:
             max_eval = -float('inf')
             best_move = None
             
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == "":
-                        board[i][j] = self.player_symbol
-                        eval_score, _ = self._minimax(board, False, alpha, beta, depth + 1)
-                        board[i][j] = ""
-                        
-                        if eval_score > max_eval:
-                            max_eval = eval_score
-                            best_move = (i, j)
-                        
-                        alpha = max(alpha, eval_score)
-                        if beta <= alpha:
-                            break  # Élagage alpha-beta
+            for i, j in state.empty_cells():
+                state.make(i, j, self.player_symbol)
+                eval_score, _ = self._minimax(state, False, alpha, beta, depth + 1)
+                state.unmake(i, j)
+                
+                if eval_score > max_eval:
+                    max_eval = eval_score
+                    best_move = (i, j)
+                
+                alpha = max(alpha, eval_score)
+                if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break  # Élagage alpha-beta
             
+            self._store_transposition(state.key, max_eval, best_move, alpha_orig, beta_orig)
             return max_eval, best_move
         
         else:
             min_eval = float('inf')
             best_move = None
             
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == "":
-                        board[i][j] = self.human_symbol
-                        eval_score, _ = self._minimax(board, True, alpha, beta, depth + 1)
-                        board[i][j] = ""
-                        
-                        if eval_score < min_eval:
-                            min_eval = eval_score
-                            best_move = (i, j)
-                        
-                        beta = min(beta, eval_score)
-                        if beta <= alpha:
-                            break  # Élagage alpha-beta
+            for i, j in state.empty_cells():
+                state.make(i, j, self.human_symbol)
+                eval_score, _ = self._minimax(state, True, alpha, beta, depth + 1)
+                state.unmake(i, j)
+                
+                if eval_score < min_eval:
+                    min_eval = eval_score
+                    best_move = (i, j)
+                
+                beta = min(beta, eval_score)
+                if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break  # Élagage alpha-beta
             
+            self._store_transposition(state.key, min_eval, best_move, alpha_orig, beta_orig)
             return min_eval, best_move
     
-    def _get_winner(self, board):
-        """Retourne le gagnant de la grille actuelle"""
-        # Vérifier les lignes
-        for row in board:
-            if row[0] == row[1] == row[2] != "":
-                return row[0]
-        
-        # Vérifier les colonnes
-        for col in range(3):
-            if board[0][col] == board[1][col] == board[2][col] != "":
-                return board[0][col]
-        
-        # Vérifier les diagonales
-        if board[0][0] == board[1][1] == board[2][2] != "":
-            return board[0][0]
-        if board[0][2] == board[1][1] == board[2][0] != "":
-            return board[0][2]
-        
-        return None
+    def _store_transposition(self, key, value, move, alpha, beta):
+        """Mémorise le score d'une position avec sa nature (exact ou borne) selon la fenêtre alpha-beta"""
+        if value <= alpha:
+            bound = UPPER_BOUND
+        elif value >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._transpositions[key] = (value, bound, move)
     
     def reset_game(self):
         """Réinitialise l'état de l'IA pour une nouvelle partie"""
@@ -333,8 +454,8 @@ class TicTacToeAI:
         """Retourne un temps de réflexion pour rendre l'IA plus humaine"""
         # Temps de réflexion variable selon la phase de jeu
         if self.move_count == 1:
-            return random.uniform(0.8, 1.5)  # Premier coup plus rapide
+            return self.rng.uniform(0.8, 1.5)  # Premier coup plus rapide
         elif self.move_count <= 3:
-            return random.uniform(1.2, 2.3)  # Début de partie
+            return self.rng.uniform(1.2, 2.3)  # Début de partie
         else:
-            return random.uniform(1.8, 3.2)  # Fin de partie plus réfléchie
+            return self.rng.uniform(1.8, 3.2)  # Fin de partie plus réfléchie
@@ -0,0 +1,190 @@
+"""
+Service d'IA par lots pour le serveur de parties
+
+Quand beaucoup de sessions attendent l'IA classique en même temps, leurs
+demandes sont regroupées pendant une courte fenêtre (AI_SERVICE_CONFIG :
+gather_ms, ou max_batch demandes) puis évaluées ensemble :
+
+- chaque grille est réduite à sa forme canonique parmi les 8 symétries
+  (tables de src.position_index) : les sessions sur des positions
+  équivalentes partagent une seule analyse ;
+- l'analyse (victoire, parade, fourchettes, minimax) ne dépend que de la
+  position : elle est lue dans une table gardée entre les lots, et calculée
+  une seule fois par position canonique manquante ;
+- chaque IA de session y applique ensuite sa propre part d'aléatoire
+  (TicTacToeAI.get_move avec analysis) et les coups repartent vers les
+  sessions. L'analyse garde toutes les cases candidates de chaque
+  recherche : ramenées dans le repère de la session, elles sont départagées
+  dans l'ordre de ses cases, et une graine donne les mêmes coups que l'IA
+  jouée directement.
+
+gather_ms règle le compromis : 0 évalue chaque demande seule (latence
+minimale), une fenêtre plus longue donne des lots plus gros (débit). Un
+seul lot est évalué à la fois ; les demandes arrivées pendant son
+évaluation forment le lot suivant.
+"""
+
+import asyncio
+
+from .ai import TicTacToeAI
+from .position_index import canonicalize, decode_board, INVERSE_SYMMETRIES, SIZE
+from config.settings import AI_SERVICE_CONFIG
+
+
+class AIService:
+    """Regroupe les demandes de coups de l'IA classique et les évalue par lots"""
+
+    def __init__(self, executor=None, gather_ms=None, max_batch=None, cache_size=None):
+        """
+        Args:
+            executor: Pool où les lots sont évalués (celui de la boucle par défaut)
+            gather_ms: Fenêtre de regroupement en millisecondes (AI_SERVICE_CONFIG par défaut)
+            max_batch: Taille de lot déclenchant l'évaluation sans attendre la fin de la fenêtre
+            cache_size: Analyses de positions canoniques gardées entre les lots
+        """
+        self.executor = executor
+        self.gather_window = 0.0
+        self.max_batch = 1
+        self.configure(AI_SERVICE_CONFIG['gather_ms'] if gather_ms is None else gather_ms,
+                       max_batch or AI_SERVICE_CONFIG['max_batch'])
+        self.cache_size = cache_size or AI_SERVICE_CONFIG['cache_size']
+        self._analyses = {}  # (code canonique, symbole de l'IA) -> analyse (cases candidates) dans le repère canonique
+        self._analysts = {}  # Symbole -> IA réservée aux analyses (sa table de transpositions)
+        self._pending = []  # (ia, grille, future) en attente du prochain lot
+        self._timer = None
+        self._running = False
+        self.requests = 0
+        self.batches = 0
+        self.positions = 0  # Positions canoniques distinctes, cumulées sur les lots
+        self.searches = 0  # Analyses calculées (absentes de la table)
+
+    def configure(self, gather_ms=None, max_batch=None):
+        """Change le compromis latence/débit (pris en compte au prochain lot)"""
+        if gather_ms is not None:
+            self.gather_window = max(0.0, gather_ms) / 1000
+        if max_batch is not None:
+            self.max_batch = max(1, int(max_batch))
+
+    async def get_move(self, ai, board):
+        """
+        Coup de l'IA d'une session, évalué avec le prochain lot
+
+        Args:
+            ai: TicTacToeAI de la session (son aléatoire et son compteur de coups)
+            board: Grille 3x3 de la session (non modifiée avant la réponse)
+
+        Returns:
+            tuple: (row, col)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((ai, board, future))
+        if len(self._pending) >= self.max_batch or self.gather_window == 0:
+            self._flush(loop)
+        elif self._timer is None and not self._running:
+            self._timer = loop.call_later(self.gather_window, self._flush, loop)
+        return await future
+
+    def _flush(self, loop):
+        """Envoie les demandes en attente (max_batch au plus) au pool"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._running or not self._pending:
+            return
+        batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        self._running = True
+        evaluation = loop.run_in_executor(self.executor, self.evaluate,
+                                          [(ai, board) for ai, board, _ in batch])
+        evaluation.add_done_callback(lambda done: self._fan_out(loop, batch, done))
+
+    def _fan_out(self, loop, batch, done):
+        """Renvoie les coups du lot évalué à leurs sessions, puis lance le lot suivant"""
+        self._running = False
+        error = done.exception()
+        moves = done.result() if error is None else [None] * len(batch)
+        for (_, _, future), move in zip(batch, moves):
+            if future.done():
+                continue  # Demande abandonnée (connexion fermée)
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(move)
+        # Les demandes arrivées pendant l'évaluation ont déjà attendu : lot suivant tout de suite
+        self._flush(loop)
+
+    def evaluate(self, requests):
+        """
+        Évalue un lot de demandes (appelable directement, hors asyncio)
+
+        Args:
+            requests: Liste de (TicTacToeAI, grille 3x3)
+
+        Returns:
+            list: Coup (row, col) de chaque demande, dans l'ordre
+        """
+        self.batches += 1
+        self.requests += len(requests)
+        keys = []
+        analyses = {}  # Analyses du lot (la table peut en évincer pendant le lot)
+        for ai, board in requests:
+            if ai.move_count == 0:
+                keys.append(None)  # Premier coup : ouverture, sans recherche
+                continue
+            code, symmetry = canonicalize(board)
+            key = (code, ai.player_symbol)
+            keys.append((key, symmetry))
+            if key not in analyses:
+                analysis = self._analyses.get(key)
+                if analysis is None:
+                    analysis = self._analyst(ai.player_symbol).analyze(decode_board(code))
+                    self._store(key, analysis)
+                analyses[key] = analysis
+        self.positions += len(analyses)
+
+        moves = []
+        for (ai, board), entry in zip(requests, keys):
+            if entry is None:
+                moves.append(ai.get_move(board))
+            else:
+                key, symmetry = entry
+                moves.append(ai.get_move(board, TicTacToeAI.select(analyses[key], _orient(symmetry))))
+        return moves
+
+    def _analyst(self, symbol):
+        """IA qui calcule les analyses pour le symbole donné"""
+        analyst = self._analysts.get(symbol)
+        if analyst is None:
+            analyst = self._analysts[symbol] = TicTacToeAI(player_symbol=symbol)
+        return analyst
+
+    def _store(self, key, analysis):
+        """Ajoute une analyse à la table (la plus ancienne sort quand la table est pleine)"""
+        self.searches += 1
+        if len(self._analyses) >= self.cache_size:
+            del self._analyses[next(iter(self._analyses))]
+        self._analyses[key] = analysis
+
+    def summary(self):
+        """Compteurs du service : demandes, lots, taille moyenne, partage des analyses"""
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch': self.requests / self.batches if self.batches else 0.0,
+            'positions': self.positions,
+            'searches': self.searches,
+            'table_size': len(self._analyses),
+            'gather_ms': self.gather_window * 1000,
+            'max_batch': self.max_batch
+        }
+
+
+def _orient(symmetry):
+    """Case du repère canonique -> case du repère de la grille de la session"""
+    inverse = INVERSE_SYMMETRIES[symmetry]
+
+    def cell(move):
+        original = inverse[move[0] * SIZE + move[1]]
+        return (original // SIZE, original % SIZE)
+
+    return cell
@@ -0,0 +1,148 @@
+"""
+État de grille avec bilan incrémental des lignes gagnantes
+
+Jouer ou annuler un coup ne touche qu'une case et les compteurs des lignes
+qui la contiennent : la détection de victoire et d'égalité est en O(1) par
+coup, sans parcourir la grille. La clé de Zobrist de la position suit de la
+même façon (un XOR par coup), ainsi que le code base 3 de chaque ligne, qui
+indexe les tables de motifs de src.patterns. Utilisé par GameLogic (annuler/rétablir) et
+par la recherche de l'IA (make/unmake).
+"""
+
+from functools import lru_cache
+from .utils import create_empty_board, winning_lines, cell_lines, zobrist_keys
+from .patterns import line_table, SYMBOL_VALUES
+
+
+@lru_cache(maxsize=None)
+def cell_weights(size):
+    """Case -> (ligne, poids de la case dans le code base 3 de la ligne), partagé par tous les états"""
+    lines = winning_lines(size)
+    pow3 = line_table(size).pow3
+    return tuple(
+        tuple((line, pow3[lines[line].index(cell)]) for line in cell_line_ids)
+        for cell, cell_line_ids in enumerate(cell_lines(size))
+    )
+
+
+class BoardState:
+    """Grille de jeu et compteurs de lignes mis à jour coup par coup"""
+
+    def __init__(self, size=3, grid=None):
+        self.size = size
+        self.grid = create_empty_board(size) if grid is None else grid
+        self.lines = winning_lines(size)
+        self.cell_lines = cell_lines(size)
+        self.zobrist = zobrist_keys(size)
+        self.key = 0  # Clé de Zobrist de la position
+        self.counts = {'X': [0] * len(self.lines), 'O': [0] * len(self.lines)}
+        self.patterns = line_table(size)
+        self.codes = [0] * len(self.lines)  # Code base 3 de chaque ligne
+        self.cell_weights = cell_weights(size)
+        self.filled = 0
+        self.completed = 0  # Nombre de lignes complètes
+        self.winner = None
+        self.winning_line = None
+
+        # Reprendre les symboles déjà présents (grille fournie)
+        for row in range(size):
+            for col in range(size):
+                symbol = self.grid[row][col]
+                if symbol:
+                    self._add(row * size + col, symbol)
+
+    def copy(self):
+        """Copie indépendante de la grille et de ses compteurs"""
+        return BoardState(self.size, [row[:] for row in self.grid])
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Construit l'état à partir d'une grille existante (partagée, non copiée)"""
+        return cls(len(grid), grid)
+
+    def _add(self, cell, symbol):
+        """Met à jour les compteurs pour un symbole posé sur une case"""
+        counts = self.counts[symbol]
+        for line in self.cell_lines[cell]:
+            counts[line] += 1
+            if counts[line] == self.size:
+                self.completed += 1
+                self.winner = symbol
+                self.winning_line = line
+        value = SYMBOL_VALUES[symbol]
+        codes = self.codes
+        for line, weight in self.cell_weights[cell]:
+            codes[line] += value * weight
+        self.filled += 1
+        self.key ^= self.zobrist[symbol][cell]
+
+    def make(self, row, col, symbol):
+        """
+        Pose un symbole sur une case vide
+
+        Args:
+            row: Ligne de la case
+            col: Colonne de la case
+            symbol: 'X' ou 'O'
+
+        Returns:
+            bool: True si le coup complète une ligne gagnante
+        """
+        self.grid[row][col] = symbol
+        before = self.completed
+        self._add(row * self.size + col, symbol)
+        return self.completed > before
+
+    def unmake(self, row, col):
+        """Retire le symbole d'une case et annule sa contribution aux lignes"""
+        symbol = self.grid[row][col]
+        self.grid[row][col] = ""
+        cell = row * self.size + col
+        counts = self.counts[symbol]
+        for line in self.cell_lines[cell]:
+            if counts[line] == self.size:
+                self.completed -= 1
+            counts[line] -= 1
+        value = SYMBOL_VALUES[symbol]
+        codes = self.codes
+        for line, weight in self.cell_weights[cell]:
+            codes[line] -= value * weight
+        self.filled -= 1
+        self.key ^= self.zobrist[symbol][cell]
+        if self.completed == 0:
+            self.winner = None
+            self.winning_line = None
+        elif counts[self.winning_line] < self.size:
+            # Cas rare : une autre ligne complète subsiste
+            for symbol, symbol_counts in self.counts.items():
+                for line, count in enumerate(symbol_counts):
+                    if count == self.size:
+                        self.winner = symbol
+                        self.winning_line = line
+
+    def is_legal(self, row, col):
+        """Retourne True si la case (row, col) peut être jouée"""
+        return self.grid[row][col] == ""
+
+    def is_full(self):
+        """Retourne True si toutes les cases sont occupées"""
+        return self.filled == self.size * self.size
+
+    def empty_cells(self):
+        """Retourne les cases vides sous forme de (row, col)"""
+        return [(i, j) for i in range(self.size) for j in range(self.size) if self.grid[i][j] == ""]
+
+    def winning_cells(self, symbol):
+        """Cases vides (row, col) qui compléteraient une ligne pour symbol, triées"""
+        cells = self.patterns.winning_cells(self.codes, self.lines, symbol)
+        return [divmod(cell, self.size) for cell in sorted(cells)]
+
+    def evaluate(self):
+        """Évaluation statique de la position pour X (table des valeurs de lignes)"""
+        return self.patterns.score(self.codes)
+
+    def get_winning_positions(self):
+        """Retourne les positions (row, col) de la ligne gagnante ou None"""
+        if self.winning_line is None:
+            return None
+        return [(cell // self.size, cell % self.size) for cell in self.lines[self.winning_line]]
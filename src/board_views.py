@@ -0,0 +1,362 @@
+"""
+Vues Canvas des grilles des variantes (Ultimate 9x9, Qubic en couches, Gomoku 15x15, Puissance 4)
+
+Le fond (cases, séparateurs) est dessiné une seule fois ; à chaque
+rafraîchissement, seules les cases dont le symbole a changé sont
+redessinées, quelle que soit la taille de la grille. La grille infinie a sa
+propre vue, qui ne dessine que la zone visible.
+"""
+
+import math
+import tkinter as tk
+from .timers import ease_in_quad
+from config.settings import COLORS
+
+# Espace entre deux blocs (sous-grilles ou couches), en fraction de case
+BLOCK_GAP = 0.35
+
+
+def ultimate_layout(row, col):
+    """Position (en cases) d'une case de l'Ultimate : 3x3 sous-grilles séparées"""
+    return col + (col // 3) * BLOCK_GAP, row + (row // 3) * BLOCK_GAP
+
+
+def qubic_layout(row, col):
+    """Position (en cases) d'une case du Qubic : les 4 couches 4x4 disposées en carré 2x2"""
+    layer, row_in_layer = divmod(row, 4)
+    return (layer % 2) * (4 + BLOCK_GAP) + col, (layer // 2) * (4 + BLOCK_GAP) + row_in_layer
+
+
+def square_layout(row, col):
+    """Position (en cases) d'une case d'une grille simple"""
+    return col, row
+
+
+# Variante -> (placement des cases, étendue en cases (None : selon la grille), libellés des blocs)
+LAYOUTS = {
+    'gomoku': (square_layout, 15, None),
+    'gravity': (square_layout, None, None),
+    'ultimate': (ultimate_layout, 9 + 2 * BLOCK_GAP, None),
+    'qubic': (qubic_layout, 8 + BLOCK_GAP, ("Couche 1", "Couche 2", "Couche 3", "Couche 4")),
+}
+
+
+class BoardCanvasView:
+    """Grille d'une variante dessinée sur un Canvas, redessinée case par case"""
+
+    def __init__(self, parent, game_logic, on_cell_click, pixel_size):
+        """
+        Args:
+            parent: Widget parent
+            game_logic: GameLogic de la partie (variante autre que 'classic')
+            on_cell_click: Fonction appelée avec (row, col) lors d'un clic
+            pixel_size: Côté du canvas en pixels
+        """
+        self.game_logic = game_logic
+        self.on_cell_click = on_cell_click
+        self.layout, extent, self.block_labels = LAYOUTS[game_logic.variant]
+        if extent is None:
+            board = game_logic.get_board()
+            extent = max(len(board), len(board[0]))
+        self.cell = pixel_size / (extent + (0.6 if self.block_labels else 0))
+        self.top = self.cell * 0.6 if self.block_labels else 0  # Place des libellés de couches
+        self.enabled = True
+
+        self.canvas = tk.Canvas(
+            parent,
+            bg=COLORS['background_tertiary'],
+            highlightthickness=0,
+            width=pixel_size,
+            height=pixel_size
+        )
+        self.canvas.pack(expand=True)
+
+        self._rects = {}  # (row, col) -> rectangle de fond
+        self._texts = {}  # (row, col) -> texte du symbole
+        self._shown = {}  # (row, col) -> symbole affiché
+        self._highlighted = []
+        self._target = None  # Cadre de la sous-grille imposée (Ultimate)
+        self._draw_background()
+
+    def _cell_bounds(self, row, col):
+        """Rectangle (x0, y0, x1, y1) d'une case en pixels"""
+        x, y = self.layout(row, col)
+        margin = self.cell * 0.06
+        x0, y0 = x * self.cell + margin, y * self.cell + self.top + margin
+        return x0, y0, x0 + self.cell - 2 * margin, y0 + self.cell - 2 * margin
+
+    def _draw_background(self):
+        """Dessine une fois les cases vides et les libellés"""
+        font = ('Segoe UI', max(8, int(self.cell * 0.45)), 'bold')
+        for row, cells in enumerate(self.game_logic.get_board()):
+            for col in range(len(cells)):
+                tag = f"cell_{row}_{col}"
+                bounds = self._cell_bounds(row, col)
+                self._rects[(row, col)] = self.canvas.create_rectangle(
+                    *bounds, fill=COLORS['button_normal'], outline=COLORS['grid_line'], tags=(tag,)
+                )
+                self._texts[(row, col)] = self.canvas.create_text(
+                    (bounds[0] + bounds[2]) / 2, (bounds[1] + bounds[3]) / 2,
+                    text="", font=font, tags=(tag,)
+                )
+                self._shown[(row, col)] = ""
+                self.canvas.tag_bind(tag, '<Button-1>', lambda e, r=row, c=col: self._on_click(r, c))
+
+        if self.block_labels:
+            label_font = ('Segoe UI', max(8, int(self.cell * 0.3)), 'italic')
+            for layer, label in enumerate(self.block_labels):
+                x0, y0, _, _ = self._cell_bounds(layer * 4, 0)
+                self.canvas.create_text(x0, y0 - self.cell * 0.1, text=label, anchor='sw',
+                                        font=label_font, fill=COLORS['accent_secondary'])
+
+        if self.game_logic.variant == 'ultimate':
+            self._target = self.canvas.create_rectangle(0, 0, 0, 0, outline=COLORS['accent_secondary'],
+                                                        width=3, state='hidden')
+        self.refresh()
+
+    def _on_click(self, row, col):
+        """Transmet le clic si la grille est active"""
+        if self.enabled:
+            self.on_cell_click(row, col)
+
+    def refresh(self):
+        """Redessine uniquement les cases dont le symbole a changé"""
+        board = self.game_logic.get_board()
+        for (row, col), shown in self._shown.items():
+            symbol = board[row][col]
+            if symbol != shown:
+                self._draw_cell(row, col, symbol)
+        self._clear_highlight()
+        self._update_target()
+
+    def _draw_cell(self, row, col, symbol):
+        """Redessine une case"""
+        color = COLORS['text_secondary'] if symbol == 'X' else COLORS['text_player_o']
+        self.canvas.itemconfig(self._texts[(row, col)], text=symbol, fill=color)
+        self.canvas.itemconfig(self._rects[(row, col)],
+                               fill=COLORS['button_active'] if symbol else COLORS['button_normal'])
+        self._shown[(row, col)] = symbol
+
+    def _update_target(self):
+        """Encadre la sous-grille où le prochain coup est imposé (Ultimate)"""
+        if self._target is None:
+            return
+        state = self.game_logic.state
+        if state.next_board < 0 or self.game_logic.is_game_over():
+            self.canvas.itemconfig(self._target, state='hidden')
+            return
+        top, left = divmod(state.next_board, 3)
+        x0, y0, _, _ = self._cell_bounds(top * 3, left * 3)
+        _, _, x1, y1 = self._cell_bounds(top * 3 + 2, left * 3 + 2)
+        self.canvas.coords(self._target, x0 - 2, y0 - 2, x1 + 2, y1 + 2)
+        self.canvas.itemconfig(self._target, state='normal')
+
+    def highlight(self, positions):
+        """Met en évidence des cases (ligne gagnante)"""
+        self._clear_highlight()
+        for position in positions or ():
+            self.canvas.itemconfig(self._rects[position], fill=COLORS['winning_highlight'])
+            self._highlighted.append(position)
+
+    def _clear_highlight(self):
+        """Retire la mise en évidence des cases"""
+        for position in self._highlighted:
+            fill = COLORS['button_active'] if self._shown[position] else COLORS['button_normal']
+            self.canvas.itemconfig(self._rects[position], fill=fill)
+        self._highlighted = []
+
+    def flash_invalid(self, row, col, timers):
+        """Signale un coup interdit par un bref flash rouge de la case"""
+        rect = self._rects[(row, col)]
+        self.canvas.itemconfig(rect, fill=COLORS['button_quit'])
+        fill = COLORS['button_active'] if self._shown[(row, col)] else COLORS['button_normal']
+        timers.after(200, lambda: self.canvas.itemconfig(rect, fill=fill) if self.canvas.winfo_exists() else None)
+
+    def animate_drop(self, row, col, tweens, duration=300):
+        """
+        Fait tomber le symbole de la case (row, col) depuis le haut de sa colonne
+
+        La case est dessinée tout de suite mais son symbole reste caché
+        pendant la chute, animée par le TweenScheduler de l'écran.
+
+        Args:
+            row: Ligne d'arrivée
+            col: Colonne jouée
+            tweens: TweenScheduler de l'écran
+            duration: Durée de la chute en millisecondes (pour la hauteur totale)
+        """
+        self.refresh()
+        text = self._texts[(row, col)]
+        symbol = self._shown[(row, col)]
+        x0, y0, x1, y1 = self._cell_bounds(row, col)
+        x, target = (x0 + x1) / 2, (y0 + y1) / 2
+        start = self._cell_bounds(0, col)[1] - self.cell / 2
+        self.canvas.itemconfig(text, state='hidden')
+        falling = self.canvas.create_text(x, start, text=symbol, font=self.canvas.itemcget(text, 'font'),
+                                          fill=self.canvas.itemcget(text, 'fill'))
+
+        def step(t):
+            self.canvas.coords(falling, x, start + (target - start) * t)
+
+        def land():
+            self.canvas.delete(falling)
+            self.canvas.itemconfig(text, state='normal')
+
+        rows = len(self.game_logic.get_board())
+        tweens.tween(duration * (row + 1) / rows, step, land, easing=ease_in_quad)
+
+    def set_enabled(self, enabled):
+        """Active ou désactive les clics sur la grille"""
+        self.enabled = enabled
+
+
+class InfiniteBoardView:
+    """
+    Fenêtre déplaçable et zoomable sur la grille infinie
+
+    Seules les cases visibles sont dessinées : les lignes de la zone affichée
+    et les pions lus dans le hachage spatial de l'état (stones_in). Un
+    glisser déplace la vue, la molette zoome autour du pointeur ; un clic
+    sans déplacement joue la case.
+    """
+
+    MIN_CELL = 14
+    MAX_CELL = 80
+    DRAG_THRESHOLD = 4  # Pixels avant qu'un clic devienne un déplacement
+
+    def __init__(self, parent, game_logic, on_cell_click, pixel_size):
+        """
+        Args:
+            parent: Widget parent
+            game_logic: GameLogic de la partie (variante 'infinite')
+            on_cell_click: Fonction appelée avec (row, col) lors d'un clic
+            pixel_size: Côté du canvas en pixels
+        """
+        self.game_logic = game_logic
+        self.on_cell_click = on_cell_click
+        self.pixel_size = pixel_size
+        self.enabled = True
+        self.cell = 36
+        # Position en pixels du coin de la case (0, 0) : l'origine au centre
+        self.offset_x = self.offset_y = (pixel_size - self.cell) / 2
+        self._highlighted = set()
+        self._drawn_range = None
+        self._press = None
+        self._dragged = False
+
+        self.canvas = tk.Canvas(
+            parent,
+            bg=COLORS['background_tertiary'],
+            highlightthickness=0,
+            width=pixel_size,
+            height=pixel_size
+        )
+        self.canvas.pack(expand=True)
+        self.canvas.bind('<ButtonPress-1>', self._on_press)
+        self.canvas.bind('<B1-Motion>', self._on_drag)
+        self.canvas.bind('<ButtonRelease-1>', self._on_release)
+        self.canvas.bind('<MouseWheel>', lambda e: self._zoom(e.x, e.y, 1.15 if e.delta > 0 else 1 / 1.15))
+        self.canvas.bind('<Button-4>', lambda e: self._zoom(e.x, e.y, 1.15))
+        self.canvas.bind('<Button-5>', lambda e: self._zoom(e.x, e.y, 1 / 1.15))
+        self.refresh()
+
+    def _visible_range(self):
+        """Cases visibles (haut, gauche, bas, droite), bornes incluses"""
+        left = math.floor(-self.offset_x / self.cell)
+        top = math.floor(-self.offset_y / self.cell)
+        right = math.floor((self.pixel_size - self.offset_x) / self.cell)
+        bottom = math.floor((self.pixel_size - self.offset_y) / self.cell)
+        return top, left, bottom, right
+
+    def _cell_at(self, x, y):
+        """Case (row, col) sous un point du canvas"""
+        return math.floor((y - self.offset_y) / self.cell), math.floor((x - self.offset_x) / self.cell)
+
+    def _cell_bounds(self, row, col):
+        """Rectangle (x0, y0, x1, y1) d'une case en pixels"""
+        x0, y0 = col * self.cell + self.offset_x, row * self.cell + self.offset_y
+        return x0, y0, x0 + self.cell, y0 + self.cell
+
+    def _render(self):
+        """Redessine la zone visible : lignes, cases en évidence et pions"""
+        canvas = self.canvas
+        canvas.delete('world')
+        top, left, bottom, right = self._drawn_range = self._visible_range()
+        size = self.pixel_size
+
+        for col in range(left, right + 2):
+            x = col * self.cell + self.offset_x
+            canvas.create_line(x, 0, x, size, fill=COLORS['grid_line'], tags=('world',))
+        for row in range(top, bottom + 2):
+            y = row * self.cell + self.offset_y
+            canvas.create_line(0, y, size, y, fill=COLORS['grid_line'], tags=('world',))
+
+        for row, col in self._highlighted:
+            if top <= row <= bottom and left <= col <= right:
+                canvas.create_rectangle(*self._cell_bounds(row, col), fill=COLORS['winning_highlight'],
+                                        outline='', tags=('world',))
+
+        font = ('Segoe UI', max(8, int(self.cell * 0.5)), 'bold')
+        for (row, col), symbol in self.game_logic.state.stones_in(top, left, bottom, right):
+            x0, y0, x1, y1 = self._cell_bounds(row, col)
+            color = COLORS['text_secondary'] if symbol == 'X' else COLORS['text_player_o']
+            canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2, text=symbol, font=font, fill=color, tags=('world',))
+
+    def _on_press(self, event):
+        """Début d'un clic ou d'un déplacement"""
+        self._press = (event.x, event.y)
+        self._dragged = False
+
+    def _on_drag(self, event):
+        """Déplace la vue ; ne redessine que si de nouvelles cases deviennent visibles"""
+        if self._press is None:
+            return
+        dx, dy = event.x - self._press[0], event.y - self._press[1]
+        if not self._dragged and abs(dx) + abs(dy) < self.DRAG_THRESHOLD:
+            return
+        self._dragged = True
+        self._press = (event.x, event.y)
+        self.offset_x += dx
+        self.offset_y += dy
+        if self._visible_range() != self._drawn_range:
+            self._render()
+        else:
+            self.canvas.move('world', dx, dy)
+
+    def _on_release(self, event):
+        """Fin du geste : un clic sans déplacement joue la case"""
+        clicked = self._press is not None and not self._dragged
+        self._press = None
+        if clicked and self.enabled:
+            self.on_cell_click(*self._cell_at(event.x, event.y))
+
+    def _zoom(self, x, y, factor):
+        """Zoome en gardant fixe le point du canvas sous le pointeur"""
+        cell = min(self.MAX_CELL, max(self.MIN_CELL, self.cell * factor))
+        if cell == self.cell:
+            return
+        scale = cell / self.cell
+        self.offset_x = x - (x - self.offset_x) * scale
+        self.offset_y = y - (y - self.offset_y) * scale
+        self.cell = cell
+        self._render()
+
+    def refresh(self):
+        """Redessine la zone visible après un coup"""
+        self._highlighted = set()
+        self._render()
+
+    def highlight(self, positions):
+        """Met en évidence des cases (alignement gagnant)"""
+        self._highlighted = set(positions or ())
+        self._render()
+
+    def flash_invalid(self, row, col, timers):
+        """Signale un coup interdit par un bref flash rouge de la case"""
+        flash = self.canvas.create_rectangle(*self._cell_bounds(row, col), fill=COLORS['button_quit'],
+                                             outline='', tags=('world',))
+        timers.after(200, lambda: self.canvas.delete(flash) if self.canvas.winfo_exists() else None)
+
+    def set_enabled(self, enabled):
+        """Active ou désactive les clics sur la grille"""
+        self.enabled = enabled
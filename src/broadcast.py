@@ -0,0 +1,186 @@
+"""
+Diffusion d'une partie du serveur à ses spectateurs
+
+Un spectateur reçoit l'état complet de la partie en arrivant, puis une
+ligne par coup : indice de case, symbole et drapeaux de résultat.
+
+    {"event":"move","session":"...","seq":7,"cell":4,"symbol":"X","flags":0}
+
+Annuler, rétablir ou redémarrer envoie un nouvel état complet (event
+"snapshot") ; la fermeture de la session envoie event "closed". seq croît
+d'une unité par évènement : un spectateur qui voit un trou sait qu'il doit
+attendre le prochain état complet.
+
+Chaque évènement est encodé une seule fois et les mêmes octets sont mis
+dans la file de chaque spectateur. Les files sont bornées
+(SERVER_CONFIG['spectator_queue']) et vidées par une tâche par spectateur :
+la partie ne touche jamais au réseau. Un spectateur trop lent voit ses
+coups en retard remplacés par un seul état complet (coalescence) ; après
+SERVER_CONFIG['spectator_overflows'] débordements sans avoir rattrapé son
+retard, il est déconnecté de la partie.
+"""
+
+import asyncio
+import json
+from collections import deque
+
+from config.settings import SERVER_CONFIG
+
+# Drapeaux de résultat d'un coup
+FLAG_GAME_OVER = 1
+FLAG_WIN = 2
+FLAG_DRAW = 4
+
+
+def move_flags(result):
+    """Drapeaux d'un résultat de make_move"""
+    flags = 0
+    if result['game_over']:
+        flags |= FLAG_GAME_OVER
+    if result['winner'] is not None:
+        flags |= FLAG_WIN
+    if result['draw']:
+        flags |= FLAG_DRAW
+    return flags
+
+
+def encode_event(event):
+    """Ligne JSON compacte d'un évènement"""
+    return json.dumps(event, separators=(',', ':')).encode() + b'\n'
+
+
+class Spectator:
+    """Un spectateur : sa connexion, sa file bornée et la tâche qui la vide"""
+
+    __slots__ = ('writer', 'queue', 'resync', 'missed', 'overflows', 'wakeup', 'task')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.queue = deque()  # Lignes encodées, partagées entre spectateurs
+        self.resync = False  # Coups perdus : envoyer un état complet avant la suite
+        self.missed = 0  # Évènements sautés depuis que l'état complet est en attente
+        self.overflows = 0  # Débordements depuis la dernière file vidée
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+
+class Broadcast:
+    """Spectateurs d'une session et diffusion de ses évènements"""
+
+    def __init__(self, session_id, snapshot, queue_size=None, max_overflows=None):
+        """
+        Args:
+            session_id: Identifiant de la session diffusée
+            snapshot: Fonction retournant l'état complet courant (dict)
+            queue_size: Évènements en attente au plus par spectateur
+            max_overflows: Débordements successifs tolérés avant déconnexion
+        """
+        self.session_id = session_id
+        self.snapshot = snapshot
+        self.queue_size = queue_size or SERVER_CONFIG['spectator_queue']
+        self.max_overflows = max_overflows or SERVER_CONFIG['spectator_overflows']
+        self.spectators = {}  # writer -> Spectator
+        self.seq = 0
+        self.dropped = 0  # Spectateurs déconnectés pour lenteur
+        self._snapshot_line = None  # (seq, ligne) : état complet encodé une fois par seq
+
+    def __len__(self):
+        return len(self.spectators)
+
+    def subscribe(self, writer):
+        """
+        Ajoute un spectateur sur une connexion
+
+        Returns:
+            dict: État complet et numéro d'évènement courant, pour la réponse
+        """
+        spectator = self.spectators.get(writer)
+        if spectator is None:
+            spectator = self.spectators[writer] = Spectator(writer)
+            spectator.task = asyncio.ensure_future(self._pump(spectator))
+        return {'seq': self.seq, 'state': self.snapshot()}
+
+    def unsubscribe(self, writer):
+        """Retire le spectateur d'une connexion (sans effet s'il n'y en a pas)"""
+        spectator = self.spectators.pop(writer, None)
+        if spectator is not None:
+            spectator.task.cancel()
+
+    def publish_move(self, cell, symbol, result):
+        """Diffuse un coup joué"""
+        self.seq += 1
+        self._push(encode_event({'event': 'move', 'session': self.session_id, 'seq': self.seq,
+                                 'cell': cell, 'symbol': symbol, 'flags': move_flags(result)}))
+
+    def publish_snapshot(self):
+        """Diffuse l'état complet (annulation, nouvelle partie...)"""
+        self.seq += 1
+        self._push(self._encoded_snapshot())
+
+    def close(self):
+        """Annonce la fin de la session puis libère les spectateurs une fois leurs files vidées"""
+        self.seq += 1
+        line = encode_event({'event': 'closed', 'session': self.session_id, 'seq': self.seq})
+        for spectator in self.spectators.values():
+            spectator.queue.append(line)  # Dernière ligne, même au-delà de la borne
+            spectator.overflows = -1  # Marque de fin pour la tâche
+            spectator.wakeup.set()
+        self.spectators = {}
+
+    def _encoded_snapshot(self):
+        """État complet encodé, partagé par tous les spectateurs au même seq"""
+        if self._snapshot_line is None or self._snapshot_line[0] != self.seq:
+            line = encode_event({'event': 'snapshot', 'session': self.session_id, 'seq': self.seq,
+                                 'state': self.snapshot()})
+            self._snapshot_line = (self.seq, line)
+        return self._snapshot_line[1]
+
+    def _push(self, line):
+        """Met une ligne dans la file de chaque spectateur, sans jamais attendre le réseau"""
+        for writer, spectator in list(self.spectators.items()):
+            if spectator.resync:
+                # L'état complet qu'il va recevoir inclura ce coup ; une file entière
+                # sautée sans qu'il ait pu le lire compte comme un nouveau débordement
+                spectator.missed += 1
+                if spectator.missed < self.queue_size:
+                    continue
+                spectator.missed = 0
+                overflow = True
+            else:
+                overflow = len(spectator.queue) >= self.queue_size
+            if overflow:
+                spectator.overflows += 1
+                if spectator.overflows > self.max_overflows:
+                    # Trop lent : il quitte la partie (la connexion reste ouverte pour ses autres requêtes)
+                    self.dropped += 1
+                    self.unsubscribe(writer)
+                    writer.write(encode_event({'event': 'dropped', 'session': self.session_id,
+                                               'seq': self.seq}))
+                    continue
+                spectator.queue.clear()
+                spectator.resync = True
+            else:
+                spectator.queue.append(line)
+            spectator.wakeup.set()
+
+    async def _pump(self, spectator):
+        """Écrit la file d'un spectateur à son rythme (seule attente réseau de la diffusion)"""
+        writer = spectator.writer
+        try:
+            while True:
+                await spectator.wakeup.wait()
+                spectator.wakeup.clear()
+                if spectator.resync:
+                    spectator.resync = False
+                    spectator.missed = 0
+                    writer.write(self._encoded_snapshot())
+                while spectator.queue:
+                    writer.write(spectator.queue.popleft())
+                await writer.drain()
+                if spectator.queue or spectator.resync:
+                    continue  # Évènements arrivés pendant l'attente (wakeup déjà levé)
+                if spectator.overflows < 0:
+                    return  # Session fermée, dernier évènement écrit
+                spectator.overflows = 0  # Retard rattrapé
+        except ConnectionError:
+            self.spectators.pop(writer, None)
@@ -0,0 +1,329 @@
+"""
+Client léger du serveur de parties (src.server)
+
+RemoteGameLogic a l'interface de GameLogic utilisée par ModernGameUI : la
+partie est jouée par le serveur, qui valide chaque coup et calcule ceux de
+l'IA. Le client garde une copie locale de la grille (une GameLogic sans IA)
+tenue à jour avec les indices de case des réponses, pour que les vues de
+grille lisent l'état comme avec une partie locale. Les évènements de la
+copie locale sont relayés sur events, sauf les scores : ScoreChanged porte
+ceux du serveur.
+
+Les appels sont bloquants (une requête, une réponse), comme l'étaient les
+appels à GameLogic depuis l'interface.
+"""
+
+import itertools
+import json
+import socket
+
+from .game import GameLogic
+from .events import EventBus, EVENT_TYPES, ScoreChanged
+from config.settings import SERVER_CONFIG
+
+
+class RemoteError(RuntimeError):
+    """Requête refusée par le serveur ou connexion perdue"""
+
+
+class _RemoteAI:
+    """IA vue du client : le symbole joué et le délai d'affichage annoncé par le serveur"""
+
+    def __init__(self, client, player_symbol='O'):
+        self.client = client
+        self.player_symbol = player_symbol
+        self.thinking_time = 0
+
+    def get_thinking_time(self):
+        """Délai d'affichage avant le coup de l'IA"""
+        return self.thinking_time
+
+    def get_move(self, board=None):
+        """Coup de l'IA, joué par le serveur"""
+        return self.client.get_ai_move()
+
+    def reset_game(self):
+        """L'IA du serveur est réinitialisée par restart_game"""
+
+
+class RemoteGameLogic:
+    """Partie hébergée par un GameServer, avec l'interface de GameLogic"""
+
+    def __init__(self, address=None, game_mode='pvp', ai_difficulty='medium', variant='classic',
+                 seed=None, timeout=None):
+        """
+        Args:
+            address: (hôte, port) du serveur (SERVER_CONFIG par défaut)
+            game_mode: 'pvp' ou 'ai'
+            ai_difficulty: Niveau de l'IA du serveur
+            variant: Nom de la variante (voir game.VARIANTS)
+            seed: Graine de la partie (choisie par le serveur par défaut)
+            timeout: Délai de connexion en secondes
+        """
+        host, port = address or (SERVER_CONFIG['host'], SERVER_CONFIG['port'])
+        self._socket = socket.create_connection(
+            (host, port), timeout=timeout or SERVER_CONFIG['connect_timeout'])
+        self._socket.settimeout(None)  # La recherche de l'IA peut être longue
+        self._stream = self._socket.makefile('rwb')
+        self._ids = itertools.count(1)
+
+        self.game_mode = game_mode
+        self.ai_difficulty = ai_difficulty
+        self.variant = variant
+        self.ai = _RemoteAI(self) if game_mode == 'ai' else None
+        self._local = GameLogic(game_mode='pvp', variant=variant)
+        self._scores = {'X': 0, 'O': 0}
+        self.events = EventBus()
+        self._local.events.subscribe(self.events.emit, *(kind for kind in EVENT_TYPES if kind is not ScoreChanged))
+        self._redo_count = 0
+        self._ai_result = None  # (coup, résultat) joué par le serveur, en attente de make_move
+
+        fields = {'mode': game_mode, 'level': ai_difficulty, 'variant': variant}
+        if seed is not None:
+            fields['seed'] = seed
+        response = self._request('new', **fields)
+        self.session = response['session']
+        self._sync(response['state'])
+
+    # --- Transport -------------------------------------------------------------
+
+    def _request(self, op, **fields):
+        """Envoie une requête et attend sa réponse"""
+        request_id = next(self._ids)
+        fields.update(id=request_id, op=op)
+        if op != 'new':
+            fields['session'] = self.session
+        try:
+            self._stream.write(json.dumps(fields, separators=(',', ':')).encode() + b'\n')
+            self._stream.flush()
+            while True:
+                line = self._stream.readline()
+                if not line:
+                    raise RemoteError("connexion fermée par le serveur")
+                response = json.loads(line)
+                if response.get('id') == request_id:
+                    break
+        except OSError as e:
+            raise RemoteError(f"serveur injoignable: {e}")
+        if not response.get('ok'):
+            raise RemoteError(response.get('error', 'erreur inconnue'))
+        return response
+
+    def close(self):
+        """Ferme la session sur le serveur puis la connexion"""
+        try:
+            self._request('close')
+        except RemoteError:
+            pass
+        self._stream.close()
+        self._socket.close()
+
+    # --- Copie locale ----------------------------------------------------------
+
+    def _sync(self, state):
+        """Reconstruit la copie locale depuis l'état complet envoyé par le serveur"""
+        local = self._local
+        local.restart_game()
+        for cell in state['moves']:
+            local.make_move(*local.cell_position(cell))
+        self._set_scores(state['scores'])
+        self._redo_count = state['redo']
+        self._ai_result = None
+        if self.ai is not None:
+            self.ai.thinking_time = state['thinking']
+
+    def _apply(self, response):
+        """Reporte sur la copie locale le coup accepté par le serveur"""
+        result = response['result']
+        if result['valid']:
+            self._local.make_move(*self._local.cell_position(response['cell']))
+            self._set_scores(response['scores'])
+            self._redo_count = 0
+            if self.ai is not None:
+                self.ai.thinking_time = response.get('thinking', 0)
+        return result
+
+    def _set_scores(self, scores):
+        """Scores du serveur ; ScoreChanged seulement s'ils ont changé"""
+        if scores != self._scores:
+            self._scores = scores
+            self.events.emit(ScoreChanged(dict(scores)))
+
+    @property
+    def state(self):
+        return self._local.state
+
+    @property
+    def board(self):
+        return self._local.board
+
+    @property
+    def current_player(self):
+        return self._local.current_player
+
+    @property
+    def game_over(self):
+        return self._local.game_over
+
+    @property
+    def moves(self):
+        return self._local.moves
+
+    # --- Interface de GameLogic -----------------------------------------------
+
+    def is_ai_turn(self):
+        """Retourne True si c'est le tour de l'IA"""
+        return self.game_mode == 'ai' and self.current_player == 'O'
+
+    def search_position(self):
+        """Position locale (lecture seule : les coups passent par le serveur)"""
+        return self._local.search_position()
+
+    def get_ai_move(self):
+        """
+        Demande au serveur de jouer le coup de l'IA
+
+        Le coup est déjà joué côté serveur : le make_move qui suit pour cette
+        case reprend son résultat sans nouvel aller-retour.
+        """
+        if not (self.ai and self.is_ai_turn()) or self.game_over:
+            return None
+        response = self._request('ai_move')
+        move = tuple(response['move']) if response.get('move') is not None else None
+        if move is not None:
+            self._ai_result = (move, response)
+        return move
+
+    def get_ai_thinking_time(self):
+        """Retourne le temps de réflexion de l'IA"""
+        return self.ai.get_thinking_time() if self.ai else 0
+
+    def make_move(self, row, col):
+        """
+        Joue un coup, validé par le serveur
+
+        Returns:
+            dict: Résultat du mouvement (même forme que GameLogic.make_move)
+        """
+        pending, self._ai_result = self._ai_result, None
+        if pending is not None and pending[0] == (row, col):
+            return self._apply(pending[1])
+        if self.game_over or not self.state.is_legal(row, col) or self.is_ai_turn():
+            return {'valid': False}
+        return self._apply(self._request('move', row=row, col=col))
+
+    def can_undo(self):
+        """Retourne True s'il reste des coups à annuler"""
+        return bool(self._local.moves)
+
+    def can_redo(self):
+        """Retourne True s'il reste des coups annulés à rétablir"""
+        return self._redo_count > 0
+
+    def undo(self):
+        """Annule le dernier coup (et la réponse de l'IA) ; retourne les cases libérées"""
+        response = self._request('undo')
+        self._sync(response['state'])
+        return [tuple(cell) for cell in response['cells']]
+
+    def redo(self):
+        """Rétablit le dernier coup annulé ; retourne les cases rejouées"""
+        response = self._request('redo')
+        self._sync(response['state'])
+        return [tuple(cell) for cell in response['cells']]
+
+    def restart_game(self):
+        """Redémarre une nouvelle partie"""
+        self._sync(self._request('restart')['state'])
+
+    def reset_scores(self):
+        """Remet les scores à zéro"""
+        self._set_scores(self._request('reset_scores')['scores'])
+
+    def get_board(self):
+        """Retourne l'état actuel de la grille (copie locale)"""
+        return self._local.board
+
+    def position_key(self):
+        """Retourne la clé de Zobrist de la position"""
+        return self._local.position_key()
+
+    def get_current_player(self):
+        """Retourne le joueur actuel"""
+        return self.current_player
+
+    def get_scores(self):
+        """Retourne les scores de la session"""
+        return dict(self._scores)
+
+    def get_stats_summary(self):
+        """Les statistiques persistantes restent locales au profil (aucune pour une partie distante)"""
+        return None
+
+    def is_game_over(self):
+        """Retourne True si le jeu est terminé"""
+        return self.game_over
+
+
+class RemoteSpectator:
+    """Spectateur d'une partie du serveur : copie locale tenue à jour par les évènements"""
+
+    def __init__(self, session, address=None, variant='classic', timeout=None):
+        """
+        Args:
+            session: Identifiant de la session regardée
+            address: (hôte, port) du serveur (SERVER_CONFIG par défaut)
+            variant: Variante de la partie (pour la copie locale)
+            timeout: Délai de connexion en secondes
+        """
+        host, port = address or (SERVER_CONFIG['host'], SERVER_CONFIG['port'])
+        self._socket = socket.create_connection(
+            (host, port), timeout=timeout or SERVER_CONFIG['connect_timeout'])
+        self._socket.settimeout(None)
+        self._stream = self._socket.makefile('rwb')
+        self.session = session
+        self.game = GameLogic(game_mode='pvp', variant=variant)
+        self.seq = 0
+        self.closed = False
+
+        self._stream.write(json.dumps({'id': 1, 'op': 'spectate', 'session': session}).encode() + b'\n')
+        self._stream.flush()
+        response = json.loads(self._stream.readline() or b'{}')
+        if not response.get('ok'):
+            raise RemoteError(response.get('error', 'connexion fermée par le serveur'))
+        self._load(response['state'], response['seq'])
+
+    def _load(self, state, seq):
+        """Reconstruit la copie locale depuis un état complet"""
+        self.game.restart_game()
+        for cell in state['moves']:
+            self.game.make_move(*self.game.cell_position(cell))
+        self.seq = seq
+
+    def poll(self):
+        """
+        Attend et applique le prochain évènement
+
+        Returns:
+            dict: Évènement reçu (event: move, snapshot, closed ou dropped), None si la connexion est fermée
+        """
+        line = self._stream.readline()
+        if not line:
+            self.closed = True
+            return None
+        event = json.loads(line)
+        kind = event.get('event')
+        if kind == 'move' and event['seq'] == self.seq + 1:
+            self.game.make_move(*self.game.cell_position(event['cell']))
+            self.seq = event['seq']
+        elif kind == 'snapshot':
+            self._load(event['state'], event['seq'])
+        elif kind in ('closed', 'dropped'):
+            self.closed = True
+        # Coup après un trou de seq : ignoré, l'état complet qui suit la coalescence le rattrape
+        return event
+
+    def close(self):
+        """Ferme la connexion"""
+        self._stream.close()
+        self._socket.close()
@@ -0,0 +1,349 @@
+"""
+Moteur de jeu persistant : protocole texte ligne par ligne sur stdin/stdout
+
+Inspiré d'UCI : un processus garde les IA, leurs tables et les tables de
+motifs chargées entre les parties, et des programmes externes (bots, bancs
+de test, autres interfaces) lui parlent par des lignes de texte.
+
+Commandes (une par ligne) :
+
+    uci                              -> id name ..., option ..., uciok
+    isready                          -> readyok
+    setoption name <Variant|Level|Seed> value <valeur>
+    ucinewgame                       -> oublie l'état des IA
+    position startpos [moves <i> ...]
+    position board <grille> [moves <i> ...]
+    go [movetime <ms>]               -> info ... puis bestmove <i> (recherche en arrière-plan)
+    stop                             -> interrompt la recherche en cours
+    analyze <position> ...           -> analysis <n> ... par position, puis analyzeok <nombre> ...
+    quit
+
+Les coups sont des indices de case comme dans GameLogic et le journal des
+parties (row * taille + col, ou encode_cell pour la grille infinie). Une
+grille est écrite ligne après ligne avec X, O et . pour les cases vides
+(grilles carrées uniquement). Pour analyze, chaque position est startpos,
+une grille, ou une liste de coups depuis le départ (« m:4,0,8 »).
+
+Usage: python -m src.engine
+"""
+
+import random
+import sys
+import threading
+import time
+
+from .game import VARIANTS
+from .utils import switch_player
+
+ENGINE_NAME = "TicTacToe Deluxe"
+LEVELS = ('easy', 'medium', 'hard')
+
+
+class EngineError(ValueError):
+    """Commande ou position invalide (signalée par une ligne info string)"""
+
+
+class Engine:
+    """Moteur à IA persistantes, piloté ligne par ligne"""
+
+    def __init__(self, out=None):
+        """
+        Args:
+            out: Flux de sortie (sys.stdout par défaut)
+        """
+        self.out = out if out is not None else sys.stdout
+        self.variant = 'classic'
+        self.level = 'hard'
+        self.seed = None
+        self._seed_source = random.Random()
+        self._ais = {}  # (variante, niveau, symbole) -> IA gardée entre les recherches
+        self._output_lock = threading.Lock()
+        self._search_thread = None
+        self._searching_ai = None
+        self.state, self.side = self._parse_position(['startpos'])
+
+    def send(self, line):
+        """Écrit une ligne de réponse (les recherches en arrière-plan écrivent aussi)"""
+        with self._output_lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def handle(self, line):
+        """
+        Traite une ligne de commande
+
+        Returns:
+            bool: False après quit
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        try:
+            if command == 'quit':
+                self._stop_search()
+                return False
+            handler = getattr(self, f"_cmd_{command}", None)
+            if handler is None:
+                raise EngineError(f"commande inconnue: {command}")
+            handler(args)
+        except EngineError as e:
+            self.send(f"info string erreur: {e}")
+        except Exception as e:
+            # Dernier recours : une ligne invalide ne doit pas arrêter le moteur
+            self.send(f"info string erreur: {type(e).__name__}: {e}")
+        return True
+
+    # --- Commandes ------------------------------------------------------------
+
+    def _cmd_uci(self, args):
+        """Présentation du moteur et de ses options"""
+        self.send(f"id name {ENGINE_NAME}")
+        self.send("id author TicTacToe Deluxe")
+        variants = " ".join(f"var {name}" for name in VARIANTS)
+        self.send(f"option name Variant type combo default classic {variants}")
+        self.send(f"option name Level type combo default hard {' '.join(f'var {level}' for level in LEVELS)}")
+        self.send("option name Seed type string default <aléatoire>")
+        self.send("uciok")
+
+    def _cmd_isready(self, args):
+        """Synchronisation : répond quand les commandes précédentes sont traitées"""
+        self.send("readyok")
+
+    def _cmd_setoption(self, args):
+        """Change la variante, le niveau ou la graine des IA"""
+        if len(args) < 4 or args[0] != 'name' or 'value' not in args:
+            raise EngineError("usage: setoption name <nom> value <valeur>")
+        split = args.index('value')
+        name, value = " ".join(args[1:split]).lower(), " ".join(args[split + 1:])
+        if name == 'variant':
+            if value not in VARIANTS:
+                raise EngineError(f"variante inconnue: {value}")
+            self._stop_search()
+            self.variant = value
+            self.state, self.side = self._parse_position(['startpos'])
+        elif name == 'level':
+            if value not in LEVELS:
+                raise EngineError(f"niveau inconnu: {value}")
+            self.level = value
+        elif name == 'seed':
+            try:
+                self.seed = int(value)
+            except ValueError:
+                raise EngineError("graine entière attendue")
+            self._seed_source.seed(self.seed)
+            for ai in self._ais.values():
+                ai.reseed(self._seed_source.getrandbits(64))
+        else:
+            raise EngineError(f"option inconnue: {name}")
+
+    def _cmd_ucinewgame(self, args):
+        """Nouvelle partie : les IA oublient la précédente (les tables restent chargées)"""
+        self._stop_search()
+        for ai in self._ais.values():
+            ai.reset_game()
+        self.state, self.side = self._parse_position(['startpos'])
+
+    def _cmd_position(self, args):
+        """Position de la prochaine recherche"""
+        self._stop_search()
+        self.state, self.side = self._parse_position(args)
+
+    def _cmd_go(self, args):
+        """Lance la recherche en arrière-plan (stop reste lisible pendant ce temps)"""
+        if self._search_thread is not None and self._search_thread.is_alive():
+            raise EngineError("recherche déjà en cours")
+        movetime = None
+        if 'movetime' in args:
+            try:
+                movetime = int(args[args.index('movetime') + 1]) / 1000
+            except (IndexError, ValueError):
+                raise EngineError("movetime attend un nombre de millisecondes")
+        state, side = self.state.copy(), self.side
+        # IA connue avant le démarrage du thread : un stop envoyé juste après go l'atteint
+        ai = self._ai(side)
+        self._clear_stop(ai)
+        self._searching_ai = ai
+
+        def run():
+            try:
+                move, stats = self._search(state, side, movetime)
+            finally:
+                self._searching_ai = None
+            self.send(self._info_line("info", stats))
+            self.send(f"bestmove {self._format_move(state, move)}")
+
+        self._search_thread = threading.Thread(target=run, name='engine-search', daemon=True)
+        self._search_thread.start()
+
+    def _cmd_stop(self, args):
+        """Interrompt la recherche en cours sans attendre sa réponse"""
+        self._stop_search(wait=False)
+
+    def _cmd_analyze(self, args):
+        """Analyse une série de positions en un seul aller-retour"""
+        if not args:
+            raise EngineError("usage: analyze <position> ...")
+        self._stop_search()
+        started = time.perf_counter()
+        for number, token in enumerate(args, 1):
+            if token == 'startpos':
+                position = ['startpos']
+            elif token.startswith('m:'):
+                position = ['startpos', 'moves'] + [move for move in token[2:].split(',') if move]
+            else:
+                position = ['board', token]
+            try:
+                state, side = self._parse_position(position)
+            except EngineError as e:
+                self.send(f"analysis {number} erreur {e}")
+                continue
+            self._clear_stop(self._ai(side))
+            move, stats = self._search(state, side, None)
+            self.send(self._info_line(f"analysis {number} bestmove {self._format_move(state, move)}", stats))
+        self.send(f"analyzeok {len(args)} time {int((time.perf_counter() - started) * 1000)}")
+
+    # --- Positions et recherche ----------------------------------------------
+
+    def _parse_position(self, args):
+        """
+        Construit l'état d'une position (startpos ou grille, puis coups)
+
+        Returns:
+            tuple: (état, joueur au trait)
+        """
+        state = VARIANTS[self.variant][0]()
+        side = 'X'
+        rest = args[1:]
+        if args and args[0] == 'board':
+            if not rest:
+                raise EngineError("grille manquante")
+            side = self._load_board(state, rest[0])
+            rest = rest[1:]
+        elif not args or args[0] != 'startpos':
+            raise EngineError("position attend startpos ou board")
+
+        if rest:
+            if rest[0] != 'moves':
+                raise EngineError(f"attendu moves, reçu {rest[0]}")
+            for token in rest[1:]:
+                try:
+                    index = int(token)
+                except ValueError:
+                    raise EngineError(f"coup invalide: {token}")
+                if index < 0:
+                    raise EngineError(f"coup hors de la grille: {token}")
+                row, col = self._decode_move(state, index)
+                if state.size and not (0 <= row < len(state.grid) and 0 <= col < len(state.grid[0])):
+                    raise EngineError(f"coup hors de la grille: {token}")
+                if not state.is_legal(row, col):
+                    raise EngineError(f"coup illégal: {token}")
+                state.make(row, col, side)
+                side = switch_player(side)
+        return state, side
+
+    def _load_board(self, state, text):
+        """Pose les pions d'une grille carrée écrite ligne après ligne ; retourne le joueur au trait"""
+        size = state.size
+        if not size or len(state.grid) != size or len(text) != size * size:
+            raise EngineError(f"grille de {size * size} cases attendue pour {self.variant}")
+        counts = {'X': 0, 'O': 0}
+        for index, char in enumerate(text.upper()):
+            if char in 'XO':
+                state.make(index // size, index % size, char)
+                counts[char] += 1
+            elif char not in '.-_':
+                raise EngineError(f"caractère invalide dans la grille: {char}")
+        if counts['X'] - counts['O'] not in (0, 1):
+            raise EngineError("nombre de X et de O incohérent")
+        return 'X' if counts['X'] == counts['O'] else 'O'
+
+    def _decode_move(self, state, index):
+        """Case (row, col) d'un indice de coup"""
+        decode = getattr(state, 'decode_move', None)
+        return decode(index) if decode else divmod(index, state.size)
+
+    def _format_move(self, state, move):
+        """Indice de coup d'une case (row, col), ou none"""
+        if move is None:
+            return "none"
+        encode = getattr(state, 'encode_move', None)
+        return str(encode(*move) if encode else move[0] * state.size + move[1])
+
+    def _ai(self, side):
+        """IA persistante du joueur au trait (tables et caches gardés entre les positions)"""
+        key = (self.variant, self.level, side)
+        ai = self._ais.get(key)
+        if ai is None:
+            ai = VARIANTS[self.variant][1](difficulty=self.level, player_symbol=side,
+                                           seed=self._seed_source.getrandbits(64))
+            ai.enable_stats()
+            self._ais[key] = ai
+        return ai
+
+    def _search(self, state, side, movetime):
+        """
+        Cherche le coup du joueur au trait
+
+        Returns:
+            tuple: (coup (row, col) ou None, SearchStats)
+        """
+        ai = self._ai(side)
+        if state.winner is not None or state.is_full():
+            return None, None
+        # Le classique adapte sa stratégie au nombre de coups déjà joués par l'IA
+        ai.move_count = sum(row.count(side) for row in state.grid) if self.variant == 'classic' else 0
+        default_limit = getattr(ai, 'time_limit', None)
+        if movetime is not None and default_limit is not None:
+            ai.time_limit = movetime
+        try:
+            move = ai.get_move(state.grid if self.variant == 'classic' else state)
+        finally:
+            if default_limit is not None:
+                ai.time_limit = default_limit
+        return move, ai.last_stats
+
+    @staticmethod
+    def _clear_stop(ai):
+        """Oublie un stop précédent avant une nouvelle recherche"""
+        if hasattr(ai, 'clear_stop'):
+            ai.clear_stop()
+
+    def close(self):
+        """Attend la fin de la recherche en cours après l'avoir interrompue"""
+        self._stop_search()
+
+    def _stop_search(self, wait=True):
+        """Interrompt la recherche en arrière-plan (le meilleur coup trouvé est annoncé)"""
+        ai = self._searching_ai
+        if ai is not None and hasattr(ai, 'stop'):
+            ai.stop()
+        thread = self._search_thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self._search_thread = None
+
+    @staticmethod
+    def _info_line(prefix, stats):
+        """Ligne info : profondeur, nœuds, score (si évalué), temps et débit"""
+        if stats is None:
+            return f"{prefix} nodes 0"
+        parts = [prefix, f"depth {stats.max_depth}", f"nodes {stats.nodes}"]
+        if stats.score is not None:
+            parts.append(f"score {int(round(stats.score))}")
+        parts.append(f"time {int(stats.total_time * 1000)}")
+        parts.append(f"nps {int(stats.nodes_per_second())}")
+        return " ".join(parts)
+
+
+def main(stream=None):
+    """Boucle de lecture des commandes jusqu'à quit ou fin d'entrée"""
+    engine = Engine()
+    for line in stream if stream is not None else sys.stdin:
+        if not engine.handle(line):
+            break
+    engine.close()
+
+
+if __name__ == '__main__':
+    main()
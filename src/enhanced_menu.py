@@ -8,6 +8,7 @@ import math
 import time
 import random
 from config.settings import COLORS, FONTS
+from .timers import TimerRegistry
 
 class EnhancedGameMenu:
     """Menu principal avec drag & drop et animations avancées"""
@@ -27,6 +28,9 @@ class EnhancedGameMenu:
         self.mode_cards = {}
         self.drop_zone = None
         
+        # Tous les callbacks after() du menu passent par ce registre
+        self.timers = TimerRegistry(master, name='menu')
+        
         if self.master:
             self.master.title("TIC TAC TOE DELUXE - Menu Principal")
             self.master.attributes('-fullscreen', True)
@@ -57,7 +61,7 @@ class EnhancedGameMenu:
         self._create_drag_drop_interface()
         self._create_footer()
         
-        self.master.after(100, self._start_animations)
+        self.timers.after(100, self._start_animations)
         
     def _create_animated_background(self):
         """Crée un fond animé avec des particules"""
@@ -374,7 +378,7 @@ class EnhancedGameMenu:
                 try:
                     for item in items:
                         self.canvas.move(item, dx, dy)
-                    self.master.after(20, lambda: animate_step(step + 1))
+                    self.timers.after(20, lambda: animate_step(step + 1))
                 except:
                     pass
             else:
@@ -390,23 +394,20 @@ class EnhancedGameMenu:
         
     def _launch_game_with_mode(self, mode):
         """Lance le jeu avec le mode sélectionné"""
-        # Animation de succès
-        self._animate_success_feedback()
-        
         # Arrêter toutes les animations en cours
         self.animation_running = False
         
-        # Nettoyer toutes les tâches en attente sauf celle-ci
-        if self.master:
-            for task_id in self.master.tk.call('after', 'info'):
-                try:
-                    if task_id != self.master.tk.call('after', 'info', 'current'):
-                        self.master.after_cancel(task_id)
-                except:
-                    pass
+        # Nettoyer toutes les tâches en attente du menu
+        self.timers.cancel_all()
+        
+        # Animation de succès
+        self._animate_success_feedback()
         
         # Lancer le jeu après l'animation
         def launch_delayed():
+            # Le menu est quitté : plus aucun callback ne doit lui survivre
+            cancelled = self.timers.close()
+            print(f"🧹 {cancelled} callbacks du menu annulés")
             try:
                 if self.on_game_start:
                     print("✓ Mode sélectionné:", mode)
@@ -416,7 +417,7 @@ class EnhancedGameMenu:
                 print(f"Erreur lors du lancement du jeu: {e}")
             
         # Attendre que l'animation soit terminée avant d'appeler le callback
-        self.master.after(600, launch_delayed)
+        self.timers.after(600, launch_delayed)
         
     def _animate_success_feedback(self):
         """Animation de feedback de succès"""
@@ -427,7 +428,7 @@ class EnhancedGameMenu:
             if step < len(colors) and self.drop_zone:
                 try:
                     self.canvas.itemconfig(self.drop_zone, fill=colors[step])
-                    self.master.after(150, lambda: flash_step(step + 1))
+                    self.timers.after(150, lambda: flash_step(step + 1))
                 except:
                     pass
                 
@@ -536,7 +537,7 @@ class EnhancedGameMenu:
         
         # Planifier la prochaine frame
         if self.animation_running and self.master:
-            self.master.after(100, self._animate_particles)
+            self.timers.after(100, self._animate_particles)
             
     def _quit_app(self, event=None):
         """Quitte l'application"""
@@ -544,12 +545,7 @@ class EnhancedGameMenu:
         self.animation_running = False
         
         # Supprimer toutes les tâches en attente
-        if self.master:
-            for task_id in self.master.tk.call('after', 'info'):
-                try:
-                    self.master.after_cancel(task_id)
-                except:
-                    pass
+        self.timers.close()
         
         # Fermer la fenêtre proprement
         try:
@@ -0,0 +1,105 @@
+"""
+Évènements de la partie et abonnements
+
+GameLogic publie ses changements d'état sur un EventBus (game.events) :
+coup joué ou annulé, victoire, égalité, scores, nouvelle partie. Les
+interfaces, le journal, le serveur ou les métriques s'y abonnent au lieu
+d'interroger l'état après chaque appel.
+
+Les évènements sont émis une fois l'état à jour. Une interface regroupe
+ceux qui arrivent dans la même image avec FrameCoalescer : un seul
+redessin par image, quel que soit le nombre d'évènements (une
+resynchronisation du client léger rejoue toute la partie d'un coup).
+"""
+
+from collections import namedtuple
+
+
+MovePlayed = namedtuple('MovePlayed', ['row', 'col', 'player', 'cell'])
+MoveUndone = namedtuple('MoveUndone', ['row', 'col', 'player', 'cell'])
+GameWon = namedtuple('GameWon', ['winner'])
+Draw = namedtuple('Draw', [])
+ScoreChanged = namedtuple('ScoreChanged', ['scores'])  # {'X': ..., 'O': ...}
+Reset = namedtuple('Reset', [])
+
+EVENT_TYPES = (MovePlayed, MoveUndone, GameWon, Draw, ScoreChanged, Reset)
+
+
+class EventBus:
+    """Abonnés par type d'évènement, appelés dans l'ordre d'abonnement"""
+
+    def __init__(self):
+        self._subscribers = {}  # Type d'évènement (None : tous) -> callbacks
+        self.active = False  # Au moins un abonné : les émetteurs peuvent s'épargner la construction des évènements
+
+    def subscribe(self, callback, *event_types):
+        """
+        Abonne un callback à des types d'évènements
+
+        Args:
+            callback: Fonction appelée avec chaque évènement
+            *event_types: Types suivis (tous si aucun)
+
+        Returns:
+            callable: Désabonnement
+        """
+        keys = event_types or (None,)
+        for key in keys:
+            self._subscribers.setdefault(key, []).append(callback)
+        self.active = True
+
+        def unsubscribe():
+            for key in keys:
+                callbacks = self._subscribers.get(key)
+                if callbacks and callback in callbacks:
+                    callbacks.remove(callback)
+                    if not callbacks:
+                        del self._subscribers[key]
+            self.active = bool(self._subscribers)
+
+        return unsubscribe
+
+    def emit(self, event):
+        """Transmet un évènement à ses abonnés puis à ceux de tous les types"""
+        for key in (type(event), None):
+            callbacks = self._subscribers.get(key)
+            if callbacks:
+                # Copie : un abonné peut se désabonner pendant l'émission
+                for callback in list(callbacks):
+                    callback(event)
+
+    def clear(self):
+        """Retire tous les abonnés"""
+        self._subscribers.clear()
+        self.active = False
+
+
+class FrameCoalescer:
+    """Regroupe les évènements d'une image en un seul redessin"""
+
+    FRAME_MS = 16  # Environ 60 images par seconde
+
+    def __init__(self, timers, repaint):
+        """
+        Args:
+            timers: TimerRegistry de l'écran (le redessin en attente est annulé avec lui)
+            repaint: Fonction appelée avec la liste des évènements de l'image
+        """
+        self.timers = timers
+        self.repaint = repaint
+        self._pending = []
+        self._frame = None
+
+    def __call__(self, event):
+        """Callback d'abonnement : garde l'évènement jusqu'à l'image suivante"""
+        self._pending.append(event)
+        if self._frame is None:
+            self._frame = self.timers.after(self.FRAME_MS, self.flush, label='repaint')
+
+    def flush(self):
+        """Redessine tout de suite avec les évènements en attente"""
+        self.timers.cancel(self._frame)
+        self._frame = None
+        events, self._pending = self._pending, []
+        if events:
+            self.repaint(events)
@@ -2,15 +2,39 @@
 Logique du jeu Tic Tac Toe avec support de l'IA
 """
 
-from .utils import create_empty_board, check_winner, is_board_full, switch_player
+import time
+from .utils import ReplayableRandom, switch_player
+from .board import BoardState
 from .ai import TicTacToeAI
-from config.settings import PLAYERS
+from .ultimate import UltimateState, UltimateAI
+from .qubic import QubicState, QubicAI
+from .gomoku import GomokuState, GomokuAI
+from .gravity import GravityState, GravityAI
+from .infinite import InfiniteState, InfiniteAI
+from .game_log import GameRecord
+from .events import EventBus, MovePlayed, MoveUndone, GameWon, Draw, ScoreChanged, Reset
+from config.settings import PLAYERS, AI_CONFIG
+
+# Variantes jouables : état de la grille et IA associée
+VARIANTS = {
+    'classic': (BoardState, TicTacToeAI),
+    'ultimate': (UltimateState, UltimateAI),
+    'qubic': (QubicState, QubicAI),
+    'gomoku': (GomokuState, GomokuAI),
+    'gravity': (GravityState, GravityAI),
+    'infinite': (InfiniteState, InfiniteAI),
+}
 
 class GameLogic:
     """Classe gérant la logique du jeu Tic Tac Toe"""
     
-    def __init__(self, game_mode='pvp', ai_difficulty='medium'):
-        self.board = create_empty_board()
+    def __init__(self, game_mode='pvp', ai_difficulty='medium', seed=None, game_log=None,
+                 stats_store=None, metrics=None, variant='classic'):
+        if variant not in VARIANTS:
+            raise ValueError(f"Variante inconnue: {variant}")
+        self.variant = variant  # Clé de VARIANTS
+        self.state = VARIANTS[variant][0]()  # Grille + bilan incrémental des lignes
+        self.board = self.state.grid
         self.current_player = PLAYERS['starting_player']
         self.game_over = False
         self.score_x = 0
@@ -18,9 +42,34 @@ class GameLogic:
         self.game_mode = game_mode  # 'pvp' ou 'ai'
         self.ai_difficulty = ai_difficulty
         
+        # Scores persistants : reprendre ceux du profil pour ce mode (et cette variante)
+        self.stats_store = stats_store  # StatsStore optionnel
+        self.stats_mode = game_mode if variant == 'classic' else f"{variant}-{game_mode}"
+        if stats_store is not None:
+            scores = stats_store.get_scores(self.stats_mode, ai_difficulty)
+            self.score_x = scores['X']
+            self.score_o = scores['O']
+        
+        # Histogrammes de latence (LatencyRecorder optionnel)
+        self.metrics = metrics
+        
+        # Changements d'état publiés aux abonnés (voir src.events)
+        self.events = EventBus()
+        
+        # Historique de la partie en cours pour le journal des parties
+        self.game_log = game_log  # GameLogWriter optionnel
+        self.moves = []  # Indices des cases jouées (row * taille + col), pile d'annulation
+        self.redo_stack = []  # Coups annulés pouvant être rétablis
+        self._recorded = False  # Partie déjà ajoutée au journal
+        self._seed_source = ReplayableRandom(seed)
+        self.seed = self._seed_source.getrandbits(64)
+        self.started_at = time.time()
+        
         # Initialiser l'IA si nécessaire
         if game_mode == 'ai':
-            self.ai = TicTacToeAI(difficulty=ai_difficulty, player_symbol='O')
+            self.ai = VARIANTS[variant][1](difficulty=ai_difficulty, player_symbol='O', seed=self.seed)
+            if AI_CONFIG.get('search_stats'):
+                self.ai.enable_stats(callback=lambda stats: print(f"🔍 {stats}"))
         else:
             self.ai = None
     
@@ -28,11 +77,20 @@ class GameLogic:
         """Retourne True si c'est le tour de l'IA"""
         return self.game_mode == 'ai' and self.current_player == 'O'
     
+    def search_position(self):
+        """Position transmise aux IA : la grille en classique, l'état complet pour les variantes"""
+        return self.board if self.variant == 'classic' else self.state
+        
     def get_ai_move(self):
         """Retourne le coup de l'IA"""
-        if self.ai and self.is_ai_turn():
-            return self.ai.get_move(self.board)
-        return None
+        if not (self.ai and self.is_ai_turn()):
+            return None
+        if self.metrics is None:
+            return self.ai.get_move(self.search_position())
+        started = time.perf_counter()
+        move = self.ai.get_move(self.search_position())
+        self.metrics.record('get_move', time.perf_counter() - started, **self._metric_labels())
+        return move
     
     def get_ai_thinking_time(self):
         """Retourne le temps de réflexion de l'IA"""
@@ -51,23 +109,47 @@ class GameLogic:
         Returns:
             dict: Résultat du mouvement avec les informations sur l'état du jeu
         """
-        if self.game_over or self.board[row][col] != "":
+        started = time.perf_counter() if self.metrics is not None else None
+        result = self._play(row, col)
+        if result['valid']:
+            # Un nouveau coup rend les coups annulés obsolètes
+            self.redo_stack.clear()
+        if started is not None:
+            self.metrics.record('make_move', time.perf_counter() - started, **self._metric_labels())
+        return result
+        
+    def _metric_labels(self):
+        """Étiquettes des histogrammes de latence : niveau de l'IA et taille de grille"""
+        level = self.ai_difficulty if self.game_mode == 'ai' else 'pvp'
+        return {'level': level, 'size': self.state.size, 'variant': self.variant}
+        
+    def _play(self, row, col):
+        """Joue un coup : une case et les compteurs de ses lignes sont mis à jour"""
+        if self.game_over or not self.state.is_legal(row, col):
             return {'valid': False}
             
         # Sauvegarder le joueur qui fait le coup avant de changer
         player_who_played = self.current_player
             
         # Effectuer le mouvement
-        self.board[row][col] = self.current_player
+        won = self.state.make(row, col, self.current_player)
+        self.moves.append(self.cell_index(row, col))
+        events = self.events if self.events.active else None
+        if events:
+            events.emit(MovePlayed(row, col, player_who_played, self.moves[-1]))
         
         # Vérifier la victoire
-        if check_winner(self.board):
+        if won:
             self.game_over = True
             winner = self.current_player
             if winner == 'X':
                 self.score_x += 1
             else:
                 self.score_o += 1
+            self._record_game(winner)
+            if events:
+                events.emit(GameWon(winner))
+                events.emit(ScoreChanged(self.get_scores()))
             return {
                 'valid': True,
                 'game_over': True,
@@ -77,8 +159,11 @@ class GameLogic:
             }
             
         # Vérifier l'égalité
-        if is_board_full(self.board):
+        if self.state.is_full():
             self.game_over = True
+            self._record_game('draw')
+            if events:
+                events.emit(Draw())
             return {
                 'valid': True,
                 'game_over': True,
@@ -97,21 +182,203 @@ class GameLogic:
             'player_who_played': player_who_played
         }
         
+    def cell_index(self, row, col):
+        """Indice enregistré d'une case : row * taille + col, ou codage propre à l'état (grille infinie)"""
+        encode = getattr(self.state, 'encode_move', None)
+        return encode(row, col) if encode else row * self.state.size + col
+        
+    def cell_position(self, cell):
+        """Case (row, col) d'un indice enregistré par cell_index"""
+        decode = getattr(self.state, 'decode_move', None)
+        return decode(cell) if decode else divmod(cell, self.state.size)
+        
+    def can_undo(self):
+        """Retourne True s'il reste des coups à annuler"""
+        return bool(self.moves)
+        
+    def can_redo(self):
+        """Retourne True s'il reste des coups annulés à rétablir"""
+        return bool(self.redo_stack)
+        
+    def undo(self):
+        """
+        Annule le dernier coup ; en mode IA, annule ensemble le coup de l'IA
+        et celui du joueur qui l'a précédé
+        
+        Returns:
+            list: Positions (row, col) libérées, dans l'ordre d'annulation
+        """
+        undone = []
+        while self.moves:
+            undone.append(self._undo_one())
+            # Continuer tant que le coup annulé était celui de l'IA
+            if not self.is_ai_turn():
+                break
+        return undone
+        
+    def redo(self):
+        """
+        Rétablit le dernier coup annulé ; en mode IA, rétablit aussi la réponse de l'IA
+        
+        Returns:
+            list: Positions (row, col) rejouées, dans l'ordre
+        """
+        redone = []
+        while self.redo_stack:
+            row, col = self.cell_position(self.redo_stack.pop())
+            player = self.current_player
+            self._play(row, col)
+            if self.ai and player == self.ai.player_symbol:
+                self.ai.move_count += 1
+            redone.append((row, col))
+            if self.game_over or not self.is_ai_turn():
+                break
+        return redone
+        
+    def _undo_one(self):
+        """Retire le dernier coup : une case et le bilan victoire/égalité associé"""
+        cell = self.moves.pop()
+        row, col = self.cell_position(cell)
+        player = self.board[row][col]
+        
+        retracted = None
+        if self.game_over:
+            retracted = self.state.winner or 'draw'
+            if retracted == 'X':
+                self.score_x -= 1
+            elif retracted == 'O':
+                self.score_o -= 1
+            if self.stats_store is not None:
+                self.stats_store.retract_game(self.stats_mode, self.ai_difficulty, retracted)
+            self.game_over = False
+        
+        self.state.unmake(row, col)
+        self.current_player = player
+        if self.ai and player == self.ai.player_symbol:
+            self.ai.move_count = max(0, self.ai.move_count - 1)
+        self.redo_stack.append(cell)
+        if self.events.active:
+            self.events.emit(MoveUndone(row, col, player, cell))
+            if retracted in ('X', 'O'):
+                self.events.emit(ScoreChanged(self.get_scores()))
+        return (row, col)
+        
+    def _record_game(self, result):
+        """Ajoute la partie terminée au journal et aux statistiques"""
+        ended_at = time.time()
+        if self.stats_store is not None:
+            self.stats_store.record_game(
+                self.stats_mode, self.ai_difficulty, result,
+                move_count=len(self.moves),
+                duration=ended_at - self.started_at,
+                ended_at=ended_at
+            )
+        # Une partie rejouée après annulation n'est journalisée qu'une fois
+        if self.game_log is None or self._recorded:
+            return
+        self._recorded = True
+        self.game_log.append(GameRecord(
+            self.moves, result,
+            game_mode=self.game_mode,
+            ai_level=self.ai_difficulty,
+            board_size=self.state.size,
+            variant=self.variant,
+            seed=self.seed,
+            started_at=self.started_at,
+            ended_at=ended_at
+        ))
+        
     def restart_game(self):
         """Redémarre une nouvelle partie"""
-        self.board = create_empty_board()
+        self.state = VARIANTS[self.variant][0]()
+        self.board = self.state.grid
         self.current_player = PLAYERS['starting_player']
         self.game_over = False
         
+        # Nouvelle graine par partie pour pouvoir rejouer chaque partie du journal
+        self.moves = []
+        self.redo_stack = []
+        self._recorded = False
+        self.seed = self._seed_source.getrandbits(64)
+        self.started_at = time.time()
+        if self.ai:
+            self.ai.reseed(self.seed)
+            self.ai.reset_game()
+        if self.events.active:
+            self.events.emit(Reset())
+        
+    def export_state(self):
+        """
+        État de la session à sauvegarder (instantanés du serveur, voir src.session_store)
+        
+        La grille n'est pas copiée : from_state la reconstruit en rejouant les
+        coups. Les générateurs sont décrits par leur graine et le nombre de
+        tirages faits depuis.
+        
+        Returns:
+            dict: Variante, mode, niveau, coups, coups annulés, scores, graines et compteur de l'IA
+        """
+        return {
+            'variant': self.variant,
+            'mode': self.game_mode,
+            'level': self.ai_difficulty,
+            'moves': list(self.moves),
+            'redo': list(self.redo_stack),
+            'scores': (self.score_x, self.score_o),
+            'recorded': self._recorded,
+            'seed': self.seed,
+            'seed_source': (self._seed_source.seed_value, self._seed_source.words),
+            'started_at': self.started_at,
+            'ai': (self.ai.move_count, self.ai.rng.seed_value, self.ai.rng.words) if self.ai else None
+        }
+        
+    @classmethod
+    def from_state(cls, state, game_log=None, metrics=None):
+        """
+        Recrée une session depuis export_state
+        
+        Args:
+            state: dict retourné par export_state
+            game_log: GameLogWriter optionnel
+            metrics: LatencyRecorder optionnel
+            
+        Returns:
+            GameLogic: Session dans l'état sauvegardé (grille, joueur, scores, IA)
+        """
+        game = cls(game_mode=state['mode'], ai_difficulty=state['level'], variant=state['variant'],
+                   seed=state['seed_source'][0], game_log=game_log, metrics=metrics)
+        game._seed_source.restore(*state['seed_source'])
+        game.seed = state['seed']
+        game._recorded = True  # Une partie terminée rejouée ici est déjà au journal
+        for cell in state['moves']:
+            game._play(*game.cell_position(cell))
+        game.redo_stack = list(state['redo'])
+        game._recorded = state['recorded']
+        game.score_x, game.score_o = state['scores']
+        game.started_at = state['started_at']
+        if game.ai is not None:
+            move_count, seed, words = state['ai']
+            game.ai.move_count = move_count
+            game.ai.rng.restore(seed, words)
+        return game
+        
     def reset_scores(self):
         """Remet les scores à zéro"""
         self.score_x = 0
         self.score_o = 0
+        if self.stats_store is not None:
+            self.stats_store.reset_scores(self.stats_mode, self.ai_difficulty)
+        if self.events.active:
+            self.events.emit(ScoreChanged(self.get_scores()))
         
     def get_board(self):
         """Retourne l'état actuel de la grille"""
         return self.board
         
+    def position_key(self):
+        """Retourne la clé de Zobrist de la position (tenue à jour coup par coup)"""
+        return self.state.key
+        
     def get_current_player(self):
         """Retourne le joueur actuel"""
         return self.current_player
@@ -120,6 +387,12 @@ class GameLogic:
         """Retourne les scores actuels"""
         return {'X': self.score_x, 'O': self.score_o}
         
+    def get_stats_summary(self):
+        """Retourne les statistiques en cache du mode courant (None sans store)"""
+        if self.stats_store is None:
+            return None
+        return self.stats_store.get_summary(self.stats_mode, self.ai_difficulty)
+        
     def is_game_over(self):
         """Retourne True si le jeu est terminé"""
         return self.game_over
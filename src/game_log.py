@@ -0,0 +1,345 @@
+"""
+Enregistrement des parties et journal binaire en ajout seul
+
+Chaque partie terminée est résumée par un GameRecord (séquence compacte de
+coups, mode, niveau de l'IA, graine, horodatages, résultat). Les
+enregistrements sont ajoutés à un journal binaire préfixé par leur longueur,
+écrit par un thread dédié pour ne jamais bloquer la boucle Tk.
+"""
+
+import atexit
+import json
+import os
+import queue
+import struct
+import threading
+
+# En-tête du fichier journal
+LOG_MAGIC = b'TTTLOG1\n'
+
+# Version du format d'un enregistrement
+RECORD_VERSION = 1
+
+# Préfixe de longueur de chaque enregistrement
+_LENGTH = struct.Struct('<I')
+
+# version, variante, mode, niveau IA, taille, résultat, graine, début, durée (ms)
+_HEADER = struct.Struct('<BBBBBBQdI')
+
+VARIANT_CODES = {'classic': 0, 'ultimate': 1, 'qubic': 2, 'gomoku': 3, 'gravity': 4, 'infinite': 5}
+MODE_CODES = {'pvp': 0, 'ai': 1}
+AI_LEVEL_CODES = {None: 0, 'easy': 1, 'medium': 2, 'hard': 3}
+RESULT_CODES = {None: 0, 'X': 1, 'O': 2, 'draw': 3}
+
+_VARIANTS = {code: name for name, code in VARIANT_CODES.items()}
+_MODES = {code: name for name, code in MODE_CODES.items()}
+_AI_LEVELS = {code: name for name, code in AI_LEVEL_CODES.items()}
+_RESULTS = {code: name for name, code in RESULT_CODES.items()}
+
+# Marqueur de fin pour le thread d'écriture
+_STOP = object()
+
+
+def encode_varint(value, out):
+    """Ajoute un entier positif encodé en LEB128 à un bytearray"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, pos):
+    """Lit un entier LEB128 et retourne (valeur, nouvelle_position)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class GameRecord:
+    """Enregistrement compact d'une partie"""
+
+    __slots__ = ('variant', 'game_mode', 'ai_level', 'board_size', 'seed',
+                 'started_at', 'ended_at', 'result', 'moves')
+
+    def __init__(self, moves, result, game_mode='pvp', ai_level=None, board_size=3,
+                 seed=0, started_at=0.0, ended_at=0.0, variant='classic'):
+        self.variant = variant
+        self.game_mode = game_mode
+        self.ai_level = ai_level if game_mode == 'ai' else None
+        self.board_size = board_size
+        self.seed = seed
+        self.started_at = started_at
+        self.ended_at = ended_at
+        self.result = result  # 'X', 'O', 'draw' ou None si abandonnée
+        self.moves = list(moves)  # Indices de cases (row * taille + col, ou encode_cell pour la grille infinie)
+
+    @property
+    def duration(self):
+        """Durée de la partie en secondes"""
+        return max(0.0, self.ended_at - self.started_at)
+
+    def encode(self):
+        """
+        Sérialise l'enregistrement au format binaire
+
+        Returns:
+            bytes: Charge utile de l'enregistrement (sans préfixe de longueur)
+        """
+        out = bytearray(_HEADER.pack(
+            RECORD_VERSION,
+            VARIANT_CODES[self.variant],
+            MODE_CODES[self.game_mode],
+            AI_LEVEL_CODES.get(self.ai_level, 0),
+            self.board_size,
+            RESULT_CODES[self.result],
+            self.seed & 0xFFFFFFFFFFFFFFFF,
+            self.started_at,
+            min(0xFFFFFFFF, int(self.duration * 1000)),
+        ))
+        encode_varint(len(self.moves), out)
+        for move in self.moves:
+            encode_varint(move, out)
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, payload):
+        """
+        Reconstruit un enregistrement depuis sa charge utile binaire
+
+        Args:
+            payload: Octets produits par encode()
+
+        Returns:
+            GameRecord: L'enregistrement décodé
+        """
+        (version, variant, mode, level, size, result,
+         seed, started_at, duration_ms) = _HEADER.unpack_from(payload, 0)
+        if version != RECORD_VERSION:
+            raise ValueError(f"Version d'enregistrement inconnue: {version}")
+
+        pos = _HEADER.size
+        count, pos = decode_varint(payload, pos)
+        moves = []
+        for _ in range(count):
+            move, pos = decode_varint(payload, pos)
+            moves.append(move)
+
+        return cls(
+            moves, _RESULTS[result],
+            game_mode=_MODES[mode],
+            ai_level=_AI_LEVELS[level],
+            board_size=size,
+            seed=seed,
+            started_at=started_at,
+            ended_at=started_at + duration_ms / 1000,
+            variant=_VARIANTS[variant],
+        )
+
+    def to_dict(self):
+        """Retourne l'enregistrement sous forme de dictionnaire sérialisable en JSON"""
+        return {
+            'variant': self.variant,
+            'game_mode': self.game_mode,
+            'ai_level': self.ai_level,
+            'board_size': self.board_size,
+            'seed': self.seed,
+            'started_at': self.started_at,
+            'ended_at': self.ended_at,
+            'result': self.result,
+            'moves': self.moves,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruit un enregistrement depuis un dictionnaire (export JSON Lines)"""
+        return cls(
+            data['moves'], data['result'],
+            game_mode=data.get('game_mode', 'pvp'),
+            ai_level=data.get('ai_level'),
+            board_size=data.get('board_size', 3),
+            seed=data.get('seed', 0),
+            started_at=data.get('started_at', 0.0),
+            ended_at=data.get('ended_at', 0.0),
+            variant=data.get('variant', 'classic'),
+        )
+
+
+class GameLogWriter:
+    """Écrivain bufferisé du journal des parties, sur un thread dédié"""
+
+    def __init__(self, path, max_pending=10000):
+        self.path = path
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='game-log-writer', daemon=True)
+        self._thread.start()
+        # Ne pas perdre les dernières parties si l'application quitte via sys.exit()
+        atexit.register(self.close)
+
+    def append(self, record):
+        """
+        Ajoute un enregistrement sans jamais bloquer l'appelant
+
+        Args:
+            record: GameRecord à écrire
+
+        Returns:
+            bool: False si l'enregistrement a été abandonné (file pleine ou journal fermé)
+        """
+        if self._closed:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def flush(self):
+        """Attend que tous les enregistrements en file soient écrits sur disque"""
+        self._queue.join()
+
+    def close(self, timeout=2.0):
+        """Écrit les enregistrements restants et arrête le thread d'écriture"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Boucle du thread d'écriture : regroupe les enregistrements en attente"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(self.path, 'ab') as log_file:
+            # Un enregistrement tronqué (arrêt brutal) masquerait tous ceux écrits après lui
+            end = complete_length(self.path)
+            if end < log_file.seek(0, os.SEEK_END):
+                log_file.truncate(end)
+                log_file.seek(end)
+            if end == 0:
+                log_file.write(LOG_MAGIC)
+
+            running = True
+            while running:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                chunks = []
+                for item in batch:
+                    if item is _STOP:
+                        running = False
+                        continue
+                    try:
+                        payload = item.encode()
+                    except Exception as e:
+                        print(f"⚠️ Enregistrement de partie ignoré: {e}")
+                        continue
+                    chunks.append(_LENGTH.pack(len(payload)))
+                    chunks.append(payload)
+
+                try:
+                    if chunks:
+                        log_file.write(b''.join(chunks))
+                        log_file.flush()
+                        self.written += len(chunks) // 2
+                except OSError as e:
+                    print(f"⚠️ Erreur d'écriture du journal des parties: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+
+def complete_length(path):
+    """
+    Taille du journal jusqu'à la fin du dernier enregistrement complet
+
+    Seuls les préfixes de longueur sont lus. Un fichier sans en-tête complet
+    compte pour 0 ; un fichier qui n'est pas un journal est laissé entier.
+    """
+    with open(path, 'rb') as log_file:
+        size = log_file.seek(0, os.SEEK_END)
+        log_file.seek(0)
+        magic = log_file.read(len(LOG_MAGIC))
+        if len(magic) < len(LOG_MAGIC):
+            return 0 if LOG_MAGIC.startswith(magic) else size
+        if magic != LOG_MAGIC:
+            return size
+        end = len(LOG_MAGIC)
+        while end + _LENGTH.size <= size:
+            (length,) = _LENGTH.unpack(log_file.read(_LENGTH.size))
+            if end + _LENGTH.size + length > size:
+                break
+            end += _LENGTH.size + length
+            log_file.seek(end)
+        return end
+
+
+def iter_payloads(path):
+    """
+    Parcourt les charges utiles brutes d'un journal, sans les décoder
+
+    Un enregistrement tronqué en fin de fichier (arrêt brutal) est ignoré.
+    """
+    with open(path, 'rb') as log_file:
+        if log_file.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{path} n'est pas un journal de parties")
+        while True:
+            head = log_file.read(_LENGTH.size)
+            if len(head) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(head)
+            payload = log_file.read(length)
+            if len(payload) < length:
+                return
+            yield payload
+
+
+def read_game_log(path):
+    """Parcourt les enregistrements d'un journal de parties"""
+    for payload in iter_payloads(path):
+        yield GameRecord.decode(payload)
+
+
+def export_jsonl(log_path, out_path):
+    """
+    Exporte un journal binaire au format JSON Lines
+
+    Returns:
+        int: Nombre d'enregistrements exportés
+    """
+    count = 0
+    with open(out_path, 'w', encoding='utf-8') as out:
+        for record in read_game_log(log_path):
+            out.write(json.dumps(record.to_dict(), separators=(',', ':')))
+            out.write('\n')
+            count += 1
+    return count
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Usage: python -m src.game_log <journal.log> <sortie.jsonl>")
+        sys.exit(1)
+    exported = export_jsonl(sys.argv[1], sys.argv[2])
+    print(f"✓ {exported} parties exportées vers {sys.argv[2]}")
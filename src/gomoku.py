@@ -0,0 +1,409 @@
+"""
+Gomoku : grille 15x15, cinq pions alignés pour gagner
+
+Chaque ligne de la grille (lignes, colonnes, diagonales) est tenue à jour
+sous forme de deux masques de bits, un par joueur : un coup ne modifie que
+les 4 lignes de sa case. Le motif d'une case dans une direction (4 cases de
+chaque côté) est extrait de ces masques en quelques décalages et classé par
+une table précalculée (cinq, quatre ouvert, quatre, trois ouvert...) fournie
+par src.patterns, sans reparcourir la grille.
+
+L'IA enchaîne victoire/parade immédiates, recherche de victoire par
+quatres forcés (VCF), parade des menaces adverses et alpha-beta sur les
+meilleurs candidats, avec une limite de temps.
+"""
+
+import time
+from .utils import ReplayableRandom, zobrist_keys, switch_player
+from .search_stats import SearchInstrumentation
+from .patterns import threat_table, OPEN_THREE, FOUR, OPEN_FOUR, FIVE
+from config.settings import GOMOKU_CONFIG
+
+SIZE = 15
+CELL_COUNT = SIZE * SIZE
+WIN_LENGTH = 5
+REACH = WIN_LENGTH - 1  # Cases examinées de chaque côté d'une case
+MOVE_KEYS = zobrist_keys(SIZE)
+
+# Valeur d'un niveau pour l'ordre des coups et l'évaluation
+ATTACK_SCORES = (0, 10, 40, 60, 500, 800, 10000, 100000)
+DEFENSE_SCORES = (0, 8, 30, 50, 400, 700, 8000, 90000)
+
+
+def _build_lines():
+    """Lignes de la grille (4 directions) et position de chaque case dans ses lignes"""
+    lines = []
+    cell_dirs = [[] for _ in range(CELL_COUNT)]
+    for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for row in range(SIZE):
+            for col in range(SIZE):
+                # Une ligne commence sur une case sans prédécesseur dans la direction
+                prev_row, prev_col = row - d_row, col - d_col
+                if 0 <= prev_row < SIZE and 0 <= prev_col < SIZE:
+                    continue
+                cells = []
+                r, c = row, col
+                while 0 <= r < SIZE and 0 <= c < SIZE:
+                    cells.append(r * SIZE + c)
+                    r, c = r + d_row, c + d_col
+                for pos, cell in enumerate(cells):
+                    cell_dirs[cell].append((len(lines), pos))
+                lines.append(tuple(cells))
+    return tuple(lines), tuple(tuple(dirs) for dirs in cell_dirs)
+
+
+LINES, CELL_DIRS = _build_lines()
+
+# Cases hors grille d'une ligne, en positions décalées de REACH : traitées comme bloquées
+BOUNDARY = tuple(((1 << REACH) - 1) | (((1 << REACH) - 1) << (len(line) + REACH)) for line in LINES)
+
+# Cases à distance 2 au plus : candidats autour des pions posés
+NEIGHBORS = tuple(
+    tuple(r * SIZE + c
+          for r in range(max(0, row - 2), min(SIZE, row + 3))
+          for c in range(max(0, col - 2), min(SIZE, col + 3))
+          if (r, c) != (row, col))
+    for row in range(SIZE) for col in range(SIZE)
+)
+
+THREAT_TABLE = threat_table(WIN_LENGTH)
+
+
+class GomokuState:
+    """Grille 15x15 jouée/annulée en place (interface de BoardState)"""
+
+    size = SIZE
+
+    def __init__(self):
+        self.grid = [["" for _ in range(SIZE)] for _ in range(SIZE)]
+        self.cells = [""] * CELL_COUNT
+        self.lines = {'X': [0] * len(LINES), 'O': [0] * len(LINES)}  # Masques décalés de REACH
+        self.near = [0] * CELL_COUNT  # Pions à distance 2 au plus
+        self.filled = 0
+        self.winner = None
+        self.winning_cells = None
+        self.key = 0
+
+    def copy(self):
+        """Copie indépendante (recherche de l'IA sans toucher la partie)"""
+        other = GomokuState.__new__(GomokuState)
+        other.grid = [row[:] for row in self.grid]
+        other.cells = self.cells[:]
+        other.lines = {symbol: masks[:] for symbol, masks in self.lines.items()}
+        other.near = self.near[:]
+        other.filled = self.filled
+        other.winner = self.winner
+        other.winning_cells = self.winning_cells
+        other.key = self.key
+        return other
+
+    def level(self, cell, symbol):
+        """
+        Niveaux de menace obtenus par symbol en jouant sur une case vide
+
+        Returns:
+            list: Un niveau par direction
+        """
+        own_lines, opp_lines = self.lines[symbol], self.lines[switch_player(symbol)]
+        levels = []
+        for line, pos in CELL_DIRS[cell]:
+            own = (own_lines[line] >> pos) & 0x1FF
+            opp = ((opp_lines[line] | BOUNDARY[line]) >> pos) & 0x1FF
+            levels.append(THREAT_TABLE[((own & 0x0F) | ((own >> 1) & 0xF0)) << 8
+                                       | (opp & 0x0F) | ((opp >> 1) & 0xF0)])
+        return levels
+
+    def make_move(self, cell, symbol):
+        """
+        Pose un pion
+
+        Args:
+            cell: Indice de case (row * 15 + col)
+            symbol: 'X' ou 'O'
+
+        Returns:
+            bool: True si le coup aligne cinq pions
+        """
+        won = FIVE in self.level(cell, symbol)
+        self.cells[cell] = symbol
+        self.grid[cell // SIZE][cell % SIZE] = symbol
+        masks = self.lines[symbol]
+        for line, pos in CELL_DIRS[cell]:
+            masks[line] |= 1 << (pos + REACH)
+        for neighbor in NEIGHBORS[cell]:
+            self.near[neighbor] += 1
+        self.filled += 1
+        self.key ^= MOVE_KEYS[symbol][cell]
+        if won:
+            self.winner = symbol
+            self.winning_cells = self._five_through(cell, symbol)
+        return won
+
+    def unmake_move(self, cell):
+        """Retire le pion d'une case (la partie ne peut être gagnée qu'au dernier coup)"""
+        symbol = self.cells[cell]
+        self.cells[cell] = ""
+        self.grid[cell // SIZE][cell % SIZE] = ""
+        masks = self.lines[symbol]
+        for line, pos in CELL_DIRS[cell]:
+            masks[line] &= ~(1 << (pos + REACH))
+        for neighbor in NEIGHBORS[cell]:
+            self.near[neighbor] -= 1
+        self.filled -= 1
+        self.key ^= MOVE_KEYS[symbol][cell]
+        self.winner = None
+        self.winning_cells = None
+
+    def _five_through(self, cell, symbol):
+        """Cases de l'alignement gagnant passant par une case"""
+        for line, pos in CELL_DIRS[cell]:
+            cells = LINES[line]
+            start = end = pos
+            while start > 0 and self.cells[cells[start - 1]] == symbol:
+                start -= 1
+            while end < len(cells) - 1 and self.cells[cells[end + 1]] == symbol:
+                end += 1
+            if end - start + 1 >= WIN_LENGTH:
+                return cells[start:end + 1]
+        return None
+
+    def make(self, row, col, symbol):
+        """Joue un coup en coordonnées de grille (interface BoardState)"""
+        return self.make_move(row * SIZE + col, symbol)
+
+    def unmake(self, row, col):
+        """Annule le coup de la case (row, col)"""
+        self.unmake_move(row * SIZE + col)
+
+    def is_legal(self, row, col):
+        """Retourne True si la case (row, col) peut être jouée"""
+        return self.winner is None and self.grid[row][col] == ""
+
+    def is_full(self):
+        """Retourne True si les 225 cases sont occupées"""
+        return self.filled == CELL_COUNT
+
+    def candidates(self):
+        """Cases vides proches des pions posés (le centre sur une grille vide)"""
+        if self.filled == 0:
+            return [CELL_COUNT // 2]
+        cells, near = self.cells, self.near
+        return [cell for cell in range(CELL_COUNT) if near[cell] and not cells[cell]]
+
+    def empty_cells(self):
+        """Retourne les cases libres sous forme de (row, col)"""
+        return [divmod(cell, SIZE) for cell in range(CELL_COUNT) if not self.cells[cell]]
+
+    def get_winning_positions(self):
+        """Retourne les positions (row, col) de l'alignement gagnant ou None"""
+        if self.winning_cells is None:
+            return None
+        return [divmod(cell, SIZE) for cell in self.winning_cells]
+
+
+class _SearchTimeout(Exception):
+    """Temps de réflexion écoulé pendant la recherche"""
+
+
+class GomokuAI(SearchInstrumentation):
+    """IA de Gomoku : menaces par tables, VCF, alpha-beta sur les meilleurs candidats"""
+
+    def __init__(self, difficulty='hard', player_symbol='O', seed=None, time_limit=None):
+        self.difficulty = difficulty
+        self.player_symbol = player_symbol
+        self.human_symbol = switch_player(player_symbol)
+        self.move_count = 0
+        self.rng = ReplayableRandom(seed)
+        self.max_depth = GOMOKU_CONFIG['max_depth'][difficulty]
+        self.vcf_depth = GOMOKU_CONFIG['vcf_depth'][difficulty]
+        self.width = GOMOKU_CONFIG['candidates']
+        self.time_limit = GOMOKU_CONFIG['time_limit'] if time_limit is None else time_limit
+        self._deadline = 0.0
+        self._stop_requested = False
+
+    def reseed(self, seed):
+        """Réinitialise le générateur aléatoire de l'IA avec une graine donnée"""
+        self.rng.seed(seed)
+
+    def reset_game(self):
+        """Réinitialise l'état de l'IA pour une nouvelle partie"""
+        self.move_count = 0
+
+    def get_thinking_time(self):
+        """Délai d'affichage avant le coup (la recherche a sa propre limite de temps)"""
+        return 0.3
+
+    def stop(self):
+        """Demande l'arrêt de la recherche en cours"""
+        self._stop_requested = True
+
+    def clear_stop(self):
+        """Oublie un stop précédent (à appeler avant de lancer la recherche qu'un stop peut interrompre)"""
+        self._stop_requested = False
+
+    def get_move(self, state):
+        """
+        Retourne le coup de l'IA
+
+        Args:
+            state: GomokuState de la partie (non modifié)
+
+        Returns:
+            tuple: (row, col)
+        """
+        self.move_count += 1
+        started = self._begin_stats()
+        cell = self._choose(state.copy())
+        move = divmod(cell, SIZE) if cell is not None else None
+        self._end_stats(started, move)
+        return move
+
+    def _choose(self, state):
+        """Choisit la case à jouer"""
+        me, opponent = self.player_symbol, self.human_symbol
+        candidates = state.candidates()
+        if not candidates:
+            return None
+        self._deadline = time.perf_counter() + self.time_limit
+
+        mine = {cell: state.level(cell, me) for cell in candidates}
+        theirs = {cell: state.level(cell, opponent) for cell in candidates}
+
+        # Victoire immédiate, puis parade d'un cinq adverse
+        for table in (mine, theirs):
+            for cell, levels in table.items():
+                if FIVE in levels:
+                    return cell
+        # Quatre ouvert ou double menace : gagne au coup suivant
+        for cell, levels in mine.items():
+            if _is_winning_threat(levels):
+                return cell
+
+        if self.vcf_depth:
+            forced = self._timed('vcf', self._vcf, state, me, opponent, self.vcf_depth)
+            if forced is not None:
+                return forced
+
+        # Trois ouvert adverse (ou double menace) : parer, sauf si l'on peut répondre par un quatre
+        danger = [cell for cell, levels in theirs.items() if max(levels) >= OPEN_FOUR or _is_winning_threat(levels)]
+        if danger:
+            counters = danger + [cell for cell, levels in mine.items() if max(levels) >= FOUR and cell not in danger]
+            return max(counters, key=lambda cell: _cell_score(mine[cell], theirs[cell]))
+
+        if self.vcf_depth:
+            # Couper une suite de quatres forcés de l'adversaire à sa première case
+            threat = self._timed('vcf', self._vcf, state, opponent, me, self.vcf_depth)
+            if threat is not None:
+                return threat
+
+        ranked = sorted(candidates, key=lambda cell: -_cell_score(mine[cell], theirs[cell]))[:self.width]
+        return self._timed('alphabeta', self._search, state, ranked)
+
+    def _vcf(self, state, attacker, defender, depth):
+        """
+        Victoire par quatres forcés : chaque quatre oblige l'adversaire à parer
+
+        Returns:
+            int: Première case de la suite gagnante, ou None
+        """
+        if depth == 0 or time.perf_counter() > self._deadline:
+            return None
+        stats = self._stats
+        for cell in state.candidates():
+            levels = state.level(cell, attacker)
+            best = max(levels)
+            if best < FOUR:
+                continue
+            if stats is not None:
+                stats.nodes += 1
+            if best >= OPEN_FOUR or _is_winning_threat(levels):
+                return cell
+            state.make_move(cell, attacker)
+            # Case de parade obligée : celle qui donnerait le cinq
+            blocks = [reply for reply in state.candidates() if FIVE in state.level(reply, attacker)]
+            found = False
+            if len(blocks) >= 2:
+                found = True
+            elif len(blocks) == 1:
+                block = blocks[0]
+                # La parade ne doit pas offrir un quatre au défenseur
+                if max(state.level(block, defender)) < FOUR:
+                    state.make_move(block, defender)
+                    found = self._vcf(state, attacker, defender, depth - 1) is not None
+                    state.unmake_move(block)
+            state.unmake_move(cell)
+            if found:
+                return cell
+        return None
+
+    def _search(self, state, ranked):
+        """Approfondissement itératif de l'alpha-beta sur les candidats classés"""
+        best_cell = ranked[0]
+        stats = self._stats
+        for depth in range(1, self.max_depth + 1):
+            try:
+                alpha, move = -float('inf'), ranked[0]
+                for cell in ranked:
+                    state.make_move(cell, self.player_symbol)
+                    score = -self._alphabeta(state, self.human_symbol, depth - 1, -float('inf'), -alpha)
+                    state.unmake_move(cell)
+                    if score > alpha:
+                        alpha, move = score, cell
+            except _SearchTimeout:
+                break
+            best_cell = move
+            ranked.remove(move)
+            ranked.insert(0, move)
+            if stats is not None:
+                stats.max_depth = depth
+                stats.score = alpha
+        return best_cell
+
+    def _alphabeta(self, state, symbol, depth, alpha, beta):
+        """Négamax alpha-beta limité aux meilleurs candidats de chaque position"""
+        if self._stop_requested or time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+        stats = self._stats
+        if stats is not None:
+            stats.nodes += 1
+        if state.winner is not None:
+            return -ATTACK_SCORES[FIVE]
+        opponent = switch_player(symbol)
+        candidates = state.candidates()
+        if not candidates:
+            return 0
+        scored = []
+        for cell in candidates:
+            mine, theirs = state.level(cell, symbol), state.level(cell, opponent)
+            scored.append((_cell_score(mine, theirs), cell, mine, theirs))
+        scored.sort(reverse=True)
+        if depth == 0:
+            # Feuille : meilleure menace du joueur au trait face à celle de l'adversaire
+            my_best = max(sum(ATTACK_SCORES[level] for level in mine) for _, _, mine, _ in scored)
+            their_best = max(sum(ATTACK_SCORES[level] for level in theirs) for _, _, _, theirs in scored)
+            return my_best - their_best * 0.9
+        best = -float('inf')
+        for _, cell, _, _ in scored[:self.width]:
+            state.make_move(cell, symbol)
+            score = -self._alphabeta(state, opponent, depth - 1, -beta, -alpha)
+            state.unmake_move(cell)
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    if stats is not None:
+                        stats.cutoffs += 1
+                    break
+        return best
+
+
+def _is_winning_threat(levels):
+    """Quatre ouvert, double quatre ou quatre + trois ouvert : victoire au coup suivant"""
+    fours = sum(1 for level in levels if level >= FOUR)
+    return OPEN_FOUR in levels or fours >= 2 or (fours == 1 and OPEN_THREE in levels)
+
+
+def _cell_score(mine, theirs):
+    """Valeur d'une case : menaces créées plus menaces adverses parées"""
+    return sum(ATTACK_SCORES[level] for level in mine) + sum(DEFENSE_SCORES[level] for level in theirs)
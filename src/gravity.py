@@ -0,0 +1,432 @@
+"""
+Puissance 4 (variante « gravité ») : les pions tombent au plus bas de leur colonne
+
+Représentation en bitboards par hauteur de colonne : la colonne c occupe les
+bits c * (H + 1) à c * (H + 1) + H - 1, plus un bit sentinelle toujours vide
+au-dessus qui empêche les alignements de déborder d'une colonne à l'autre.
+heights[c] est le bit de la prochaine case libre de la colonne : jouer ou
+annuler un coup est un OU/ET sur un bit, et une victoire se vérifie par une
+suite de décalages-ET dans chacune des 4 directions (1 : vertical, H + 1 :
+horizontal, H et H + 2 : diagonales).
+
+Largeur, hauteur et nombre de pions à aligner viennent de GRAVITY_CONFIG. La
+grille exposée à GameLogic a la ligne 0 en haut, comme les autres variantes.
+"""
+
+import time
+from functools import lru_cache
+from .utils import ReplayableRandom, zobrist_keys, switch_player
+from .search_stats import SearchInstrumentation
+from config.settings import GRAVITY_CONFIG
+
+
+class Geometry:
+    """Masques et tables d'une grille width x height où il faut aligner connect pions"""
+
+    def __init__(self, width, height, connect):
+        self.width = width
+        self.height = height
+        self.connect = connect
+        self.stride = height + 1  # Bits par colonne, sentinelle comprise
+        self.shifts = (1, self.stride, self.stride - 1, self.stride + 1)
+        self.bottom = tuple(col * self.stride for col in range(width))
+        self.top = tuple(col * self.stride + height for col in range(width))  # Bit sentinelle
+        # Colonnes du centre vers les bords : meilleur ordre des coups pour l'alpha-beta
+        center = (width - 1) / 2
+        self.column_order = tuple(sorted(range(width), key=lambda col: (abs(col - center), col)))
+        self.move_keys = zobrist_keys(max(width, self.stride))
+
+        # Fenêtres de connect cases dans les 4 directions, pour l'évaluation
+        windows = []
+        for col in range(width):
+            for row in range(height):
+                for d_col, d_row in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_col, end_row = col + d_col * (connect - 1), row + d_row * (connect - 1)
+                    if 0 <= end_col < width and 0 <= end_row < height:
+                        windows.append(sum(1 << self.bit(col + d_col * k, row + d_row * k)
+                                           for k in range(connect)))
+        self.windows = tuple(windows)
+
+    def bit(self, col, row):
+        """Indice du bit de la case (col, row), row comptée depuis le bas"""
+        return col * self.stride + row
+
+    def alignments(self, bits):
+        """
+        Masque des débuts d'alignements de connect pions
+
+        Par direction, m &= m >> (k * shift) double la longueur des suites
+        reconnues ; un dernier décalage complète jusqu'à connect (4 pions :
+        deux décalages-ET par direction).
+        """
+        found = 0
+        for shift in self.shifts:
+            m, length = bits, 1
+            while length * 2 <= self.connect:
+                m &= m >> (length * shift)
+                length *= 2
+            if length < self.connect:
+                m &= m >> ((self.connect - length) * shift)
+            found |= m
+        return found
+
+    def has_alignment(self, bits):
+        """True si bits contient connect pions alignés"""
+        return self.alignments(bits) != 0
+
+
+@lru_cache(maxsize=None)
+def geometry(width, height, connect):
+    """Géométrie partagée par tous les états de mêmes dimensions"""
+    return Geometry(width, height, connect)
+
+
+class GravityState:
+    """Grille de Puissance 4 jouée/annulée en place (interface de BoardState)"""
+
+    def __init__(self, width=None, height=None, connect=None):
+        self.geometry = geometry(width or GRAVITY_CONFIG['width'],
+                                 height or GRAVITY_CONFIG['height'],
+                                 connect or GRAVITY_CONFIG['connect'])
+        g = self.geometry
+        self.size = g.width  # Largeur : les coups sont enregistrés row * width + col
+        self.grid = [["" for _ in range(g.width)] for _ in range(g.height)]
+        self.bits = {'X': 0, 'O': 0}
+        self.heights = list(g.bottom)  # Bit de la prochaine case libre de chaque colonne
+        self.history = []  # Colonnes jouées, pile d'annulation
+        self.filled = 0
+        self.winner = None
+        self.key = 0
+
+    def copy(self):
+        """Copie indépendante (recherche de l'IA sans toucher la partie)"""
+        other = GravityState.__new__(GravityState)
+        other.geometry = self.geometry
+        other.size = self.size
+        other.grid = [row[:] for row in self.grid]
+        other.bits = dict(self.bits)
+        other.heights = self.heights[:]
+        other.history = self.history[:]
+        other.filled = self.filled
+        other.winner = self.winner
+        other.key = self.key
+        return other
+
+    def can_play(self, col):
+        """True si la colonne n'est pas pleine (et la partie pas finie)"""
+        return self.winner is None and self.heights[col] != self.geometry.top[col]
+
+    def drop_row(self, col):
+        """Ligne de la grille (0 en haut) où tomberait un pion joué dans col, ou None"""
+        if not 0 <= col < self.geometry.width or not self.can_play(col):
+            return None
+        g = self.geometry
+        return g.height - 1 - (self.heights[col] - g.bottom[col])
+
+    def legal_moves(self):
+        """Colonnes jouables, du centre vers les bords"""
+        if self.winner is not None:
+            return []
+        return [col for col in self.geometry.column_order if self.heights[col] != self.geometry.top[col]]
+
+    def make_move(self, col, symbol):
+        """
+        Fait tomber un pion dans une colonne
+
+        Args:
+            col: Colonne jouée
+            symbol: 'X' ou 'O'
+
+        Returns:
+            bool: True si le coup aligne connect pions
+        """
+        g = self.geometry
+        bit = self.heights[col]
+        self.heights[col] += 1
+        self.bits[symbol] |= 1 << bit
+        self.grid[g.height - 1 - (bit - g.bottom[col])][col] = symbol
+        self.history.append(col)
+        self.filled += 1
+        self.key ^= g.move_keys[symbol][bit]
+        if g.has_alignment(self.bits[symbol]):
+            self.winner = symbol
+        return self.winner is not None
+
+    def unmake_move(self):
+        """Retire le dernier pion joué"""
+        g = self.geometry
+        col = self.history.pop()
+        self.heights[col] -= 1
+        bit = self.heights[col]
+        row = g.height - 1 - (bit - g.bottom[col])
+        symbol = self.grid[row][col]
+        self.bits[symbol] &= ~(1 << bit)
+        self.grid[row][col] = ""
+        self.filled -= 1
+        self.key ^= g.move_keys[symbol][bit]
+        self.winner = None
+
+    def make(self, row, col, symbol):
+        """Joue dans la colonne col (row doit être la ligne d'arrivée, interface BoardState)"""
+        return self.make_move(col, symbol)
+
+    def unmake(self, row, col):
+        """Annule le dernier coup, qui doit être celui de la colonne col"""
+        self.unmake_move()
+
+    def is_legal(self, row, col):
+        """True si (row, col) est la case où tomberait un pion joué dans col"""
+        return row == self.drop_row(col)
+
+    def is_full(self):
+        """Retourne True si toutes les colonnes sont pleines"""
+        return self.filled == self.geometry.width * self.geometry.height
+
+    def empty_cells(self):
+        """Retourne les cases jouables (une par colonne non pleine) sous forme de (row, col)"""
+        return [(self.drop_row(col), col) for col in range(self.geometry.width) if self.can_play(col)]
+
+    def get_winning_positions(self):
+        """Retourne les positions (row, col) des pions alignés, ou None"""
+        if self.winner is None:
+            return None
+        g = self.geometry
+        bits = self.bits[self.winner]
+        for shift in g.shifts:
+            m = bits
+            for k in range(1, g.connect):
+                m &= bits >> (k * shift)
+            if m:
+                start = (m & -m).bit_length() - 1
+                positions = []
+                for k in range(g.connect):
+                    col, row = divmod(start + k * shift, g.stride)
+                    positions.append((g.height - 1 - row, col))
+                return positions
+        return None
+
+
+class _SearchTimeout(Exception):
+    """Temps de réflexion écoulé (ou arrêt demandé) pendant la recherche"""
+
+
+# Bornes des scores : les victoires sont ramenées au nombre de coups pour préférer les plus rapides
+WIN_SCORE = 100000
+MATE_THRESHOLD = WIN_SCORE - 1000
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Valeur d'une fenêtre libre de l'adversaire selon le nombre de pions posés (au plus connect - 1)
+WINDOW_WEIGHTS = (0, 1, 8, 64, 512, 4096, 32768)
+
+
+class GravityAI(SearchInstrumentation):
+    """IA alpha-beta à approfondissement itératif et table de transposition pour le Puissance 4"""
+
+    def __init__(self, difficulty='hard', player_symbol='O', seed=None, time_limit=None):
+        self.difficulty = difficulty
+        self.player_symbol = player_symbol
+        self.human_symbol = switch_player(player_symbol)
+        self.move_count = 0
+        self.rng = ReplayableRandom(seed)
+        self.max_depth = GRAVITY_CONFIG['max_depth'][difficulty]
+        self.time_limit = GRAVITY_CONFIG['time_limit'] if time_limit is None else time_limit
+        self._transpositions = {}
+        self._stop_requested = False
+        self._deadline = 0.0
+        self._nodes = 0
+
+    def reseed(self, seed):
+        """Réinitialise le générateur aléatoire de l'IA avec une graine donnée"""
+        self.rng.seed(seed)
+
+    def reset_game(self):
+        """Réinitialise l'état de l'IA pour une nouvelle partie"""
+        self.move_count = 0
+        self._transpositions = {}
+
+    def get_thinking_time(self):
+        """Délai d'affichage avant le coup (la recherche a sa propre limite de temps)"""
+        return 0.3
+
+    def stop(self):
+        """Demande l'arrêt de la recherche en cours (le meilleur coup trouvé est retourné)"""
+        self._stop_requested = True
+
+    def clear_stop(self):
+        """Oublie un stop précédent (à appeler avant de lancer la recherche qu'un stop peut interrompre)"""
+        self._stop_requested = False
+
+    def get_move(self, state):
+        """
+        Retourne le coup de l'IA
+
+        Args:
+            state: GravityState de la partie (non modifié)
+
+        Returns:
+            tuple: (row, col) de la case d'arrivée du pion
+        """
+        self.move_count += 1
+        started = self._begin_stats()
+        col = self._search(state.copy())
+        move = (state.drop_row(col), col) if col is not None else None
+        self._end_stats(started, move)
+        return move
+
+    def _search(self, state):
+        """Approfondissement itératif jusqu'à la profondeur maximale ou la limite de temps"""
+        moves = state.legal_moves()
+        if not moves:
+            return None
+        if len(moves) == 1:
+            return moves[0]
+
+        # Coup gagnant immédiat, sinon parade obligée
+        for symbol in (self.player_symbol, self.human_symbol):
+            for col in moves:
+                won = state.make_move(col, symbol)
+                state.unmake_move()
+                if won:
+                    return col
+
+        # À évaluation égale, départager les colonnes au hasard (parties variées)
+        ties = {col: self.rng.random() for col in moves}
+        best_move = moves[0]
+        self._deadline = time.perf_counter() + self.time_limit
+        self._nodes = 0
+        stats = self._stats
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._timed('alphabeta', self._root, state, moves, depth, ties)
+            except _SearchTimeout:
+                break
+            best_move = move
+            # Coup trouvé en tête de liste à l'itération suivante
+            moves.remove(move)
+            moves.insert(0, move)
+            if stats is not None:
+                stats.max_depth = depth
+                stats.score = score
+            if abs(score) >= MATE_THRESHOLD or depth >= state.geometry.width * state.geometry.height - state.filled:
+                break
+        return best_move
+
+    def _root(self, state, moves, depth, ties):
+        """Recherche à la racine : retourne (score, meilleur coup)"""
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_move, best_tie = moves[0], -1.0
+        for move in moves:
+            state.make_move(move, self.player_symbol)
+            # Fenêtre élargie d'un point : les égalités avec le meilleur score restent exactes
+            score = -self._alphabeta(state, self.human_symbol, depth - 1, -beta, -alpha + 1, 1)
+            state.unmake_move()
+            if score > alpha or (score == alpha and ties[move] > best_tie):
+                alpha = score
+                best_move, best_tie = move, ties[move]
+        return alpha, best_move
+
+    def _alphabeta(self, state, symbol, depth, alpha, beta, ply):
+        """
+        Négamax avec élagage alpha-beta et table de transposition
+
+        Args:
+            state: Position jouée/annulée en place
+            symbol: Joueur au trait
+            depth: Profondeur restante
+            alpha: Borne basse de la fenêtre
+            beta: Borne haute de la fenêtre
+            ply: Distance à la racine
+
+        Returns:
+            int: Score du point de vue du joueur au trait
+        """
+        self._nodes += 1
+        if self._nodes & 1023 == 0 and (self._stop_requested or time.perf_counter() > self._deadline):
+            raise _SearchTimeout()
+        stats = self._stats
+        if stats is not None:
+            stats.nodes += 1
+
+        # Le coup précédent a gagné : le joueur au trait a perdu
+        if state.winner is not None:
+            return ply - WIN_SCORE
+        if state.is_full():
+            return 0
+        if depth == 0:
+            return self._evaluate(state, symbol)
+
+        alpha_orig = alpha
+        key = state.key if symbol == 'X' else ~state.key
+        entry = self._transpositions.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, value, bound, tt_move = entry
+            if entry_depth >= depth:
+                value = _from_table(value, ply)
+                if bound == EXACT or (bound == LOWER_BOUND and value >= beta) or (bound == UPPER_BOUND and value <= alpha):
+                    if stats is not None:
+                        stats.cache_hits += 1
+                    return value
+
+        moves = state.legal_moves()
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        opponent = switch_player(symbol)
+        best = -WIN_SCORE - 1
+        best_move = moves[0]
+        for move in moves:
+            state.make_move(move, symbol)
+            score = -self._alphabeta(state, opponent, depth - 1, -beta, -alpha, ply + 1)
+            state.unmake_move()
+            if score > best:
+                best = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if stats is not None:
+                            stats.cutoffs += 1
+                        break
+
+        if best <= alpha_orig:
+            bound = UPPER_BOUND
+        elif best >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._transpositions[key] = (depth, _to_table(best, ply), bound, best_move)
+        return best
+
+    def _evaluate(self, state, symbol):
+        """Évaluation statique du point de vue de symbol : fenêtres encore ouvertes de chaque joueur"""
+        mine, theirs = state.bits[symbol], state.bits[switch_player(symbol)]
+        score = 0
+        for window in state.geometry.windows:
+            own, opp = mine & window, theirs & window
+            if not opp:
+                if own:
+                    score += WINDOW_WEIGHTS[bin(own).count('1')]
+            elif not own:
+                score -= WINDOW_WEIGHTS[bin(opp).count('1')]
+        return score
+
+
+def _to_table(score, ply):
+    """Score de victoire rendu indépendant de la distance à la racine (stockage)"""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _from_table(score, ply):
+    """Score de victoire ramené à la distance à la racine courante (lecture)"""
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
@@ -0,0 +1,111 @@
+"""
+Lanceur de parties sans interface (auto-jeu)
+
+Joue des parties complètes contre l'IA sans tkinter : le joueur X est un
+joueur aléatoire ou une seconde IA. Sert à mesurer les latences de get_move
+et make_move sur beaucoup de parties, et à alimenter le journal des parties.
+
+Usage: python -m src.headless --games 500 --level hard --metrics data/metrics-headless.json
+"""
+
+import argparse
+import random
+
+from .game import GameLogic, VARIANTS
+from .metrics import LatencyRecorder
+
+
+def play_game(game_logic, opponent, rng):
+    """
+    Joue une partie jusqu'au bout
+
+    Args:
+        game_logic: GameLogic en mode 'ai' (l'IA joue O)
+        opponent: TicTacToeAI jouant X, ou None pour un joueur aléatoire
+        rng: Générateur aléatoire du joueur aléatoire
+
+    Returns:
+        str: 'X', 'O' ou 'draw'
+    """
+    while not game_logic.is_game_over():
+        if game_logic.is_ai_turn():
+            move = game_logic.get_ai_move()
+        elif opponent is not None:
+            move = opponent.get_move(game_logic.search_position())
+        else:
+            move = rng.choice(game_logic.state.empty_cells())
+        result = game_logic.make_move(*move)
+        if result['game_over']:
+            return result['winner'] or 'draw'
+    return game_logic.state.winner or 'draw'
+
+
+def run_games(games, ai_level='hard', opponent_level=None, seed=None, metrics=None, game_log=None,
+              variant='classic'):
+    """
+    Joue une série de parties sans interface
+
+    Args:
+        games: Nombre de parties
+        ai_level: Niveau de l'IA (joueur O)
+        opponent_level: Niveau de l'IA adverse (X), None pour un joueur aléatoire
+        seed: Graine de la série (parties reproductibles)
+        metrics: LatencyRecorder recevant les latences
+        game_log: GameLogWriter optionnel
+        variant: Nom de la variante (voir game.VARIANTS)
+
+    Returns:
+        dict: Nombre de parties par résultat
+    """
+    rng = random.Random(seed)
+    game_logic = GameLogic(game_mode='ai', ai_difficulty=ai_level, seed=rng.getrandbits(64),
+                           game_log=game_log, metrics=metrics, variant=variant)
+    opponent = None
+    if opponent_level is not None:
+        opponent = VARIANTS[variant][1](difficulty=opponent_level, player_symbol='X', seed=rng.getrandbits(64))
+
+    results = {'X': 0, 'O': 0, 'draw': 0}
+    for game in range(games):
+        if game:
+            game_logic.restart_game()
+            if opponent is not None:
+                opponent.reseed(rng.getrandbits(64))
+                opponent.reset_game()
+        results[play_game(game_logic, opponent, rng)] += 1
+    return results
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Parties Tic Tac Toe sans interface")
+    parser.add_argument('--games', type=int, default=100, help="nombre de parties")
+    parser.add_argument('--level', default='hard', help="niveau de l'IA (joueur O)")
+    parser.add_argument('--opponent', default=None, help="niveau de l'IA adverse (X), aléatoire par défaut")
+    parser.add_argument('--variant', default='classic', choices=sorted(VARIANTS), help="variante jouée")
+    parser.add_argument('--seed', type=int, default=None, help="graine de la série")
+    parser.add_argument('--metrics', default=None, help="fichier JSON des latences")
+    parser.add_argument('--log', default=None, help="journal des parties à compléter")
+    args = parser.parse_args(argv)
+
+    metrics = LatencyRecorder()
+    if args.metrics:
+        # Export à la fin de la série, ou pendant sur SIGUSR1
+        metrics.install_dump_handlers(args.metrics)
+
+    game_log = None
+    if args.log:
+        from .game_log import GameLogWriter
+        game_log = GameLogWriter(args.log)
+
+    try:
+        results = run_games(args.games, args.level, args.opponent, args.seed, metrics, game_log, args.variant)
+    finally:
+        if game_log is not None:
+            game_log.close()
+
+    print(f"✓ {args.games} parties - X: {results['X']}, O: {results['O']}, nuls: {results['draw']}")
+    metrics.print_report()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+"""
+Grille infinie : k pions alignés pour gagner, sans bord
+
+La grille n'existe pas en mémoire : seules les cases occupées sont gardées,
+dans un dictionnaire (row, col) -> symbole, avec deux index qui grandissent
+avec le nombre de pions et non avec l'étendue de la partie :
+
+- near : cases à distance RADIUS au plus d'un pion (candidats de l'IA),
+  avec le nombre de pions voisins ;
+- chunks : hachage spatial des pions par blocs de 2^CHUNK_BITS cases de
+  côté, pour que la vue ne lise que les pions de la zone affichée.
+
+Une victoire se vérifie en comptant les pions alignés de part et d'autre du
+dernier coup. Les coordonnées sont des entiers quelconques (négatifs
+compris) ; le premier coup de l'IA sur une grille vide est (0, 0).
+"""
+
+from .gomoku import GomokuAI
+from .patterns import threat_table
+from config.settings import INFINITE_CONFIG
+
+CONNECT = INFINITE_CONFIG['connect']
+RADIUS = INFINITE_CONFIG['radius']
+CHUNK_BITS = 4
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Fenêtre d'une case dans chaque direction : (bit du motif, décalage de ligne, décalage de colonne)
+REACH = CONNECT - 1
+WINDOW_BITS = 2 * REACH
+WINDOWS = tuple(
+    tuple((1 << (offset + REACH if offset < 0 else offset + REACH - 1), d_row * offset, d_col * offset)
+          for offset in range(-REACH, REACH + 1) if offset)
+    for d_row, d_col in DIRECTIONS
+)
+NEIGHBOR_OFFSETS = tuple((d_row, d_col)
+                         for d_row in range(-RADIUS, RADIUS + 1)
+                         for d_col in range(-RADIUS, RADIUS + 1)
+                         if (d_row, d_col) != (0, 0))
+THREAT_TABLE = threat_table(CONNECT)
+_SYMBOL_SALT = {'X': 0x9E3779B97F4A7C15, 'O': 0xC2B2AE3D27D4EB4F}
+_MASK64 = (1 << 64) - 1
+
+
+def _zigzag(value):
+    """Entier relatif -> entier positif (0, -1, 1, -2... -> 0, 1, 2, 3...)"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    """Inverse de _zigzag"""
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def encode_cell(row, col):
+    """
+    Indice positif unique d'une case (journal des parties, annulation)
+
+    Les cases proches de l'origine ont de petits indices : le journal, qui
+    les écrit en LEB128, reste compact.
+    """
+    a, b = _zigzag(row), _zigzag(col)
+    return a * a + a + b if a >= b else a + b * b
+
+
+def decode_cell(index):
+    """Case (row, col) d'un indice produit par encode_cell"""
+    root = int(index ** 0.5)
+    while root * root > index:
+        root -= 1
+    while (root + 1) * (root + 1) <= index:
+        root += 1
+    rest = index - root * root
+    if rest < root:
+        a, b = rest, root
+    else:
+        a, b = root, rest - root
+    return _unzigzag(a), _unzigzag(b)
+
+
+def _cell_key(cell, symbol):
+    """Clé de Zobrist d'un pion, calculée (splitmix64) faute de table pour une grille infinie"""
+    z = (encode_cell(*cell) + _SYMBOL_SALT[symbol]) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+class SparseGrid:
+    """Vue grid[row][col] sur les pions posés (case vide : "")"""
+
+    __slots__ = ('stones',)
+
+    def __init__(self, stones):
+        self.stones = stones
+
+    def __getitem__(self, row):
+        return _SparseRow(self.stones, row)
+
+
+class _SparseRow:
+    """Ligne d'une SparseGrid"""
+
+    __slots__ = ('stones', 'row')
+
+    def __init__(self, stones, row):
+        self.stones = stones
+        self.row = row
+
+    def __getitem__(self, col):
+        return self.stones.get((self.row, col), "")
+
+
+class InfiniteState:
+    """Grille infinie creuse jouée/annulée en place (interface de BoardState)"""
+
+    size = 0  # Grille non bornée
+
+    def __init__(self):
+        self.stones = {}  # (row, col) -> symbole
+        self.near = {}  # (row, col) -> nombre de pions à distance RADIUS au plus
+        self.chunks = {}  # (row >> CHUNK_BITS, col >> CHUNK_BITS) -> cases occupées du bloc
+        self.grid = SparseGrid(self.stones)
+        self.filled = 0
+        self.winner = None
+        self.winning_cells = None
+        self.key = 0
+
+    def copy(self):
+        """Copie indépendante (recherche de l'IA sans toucher la partie)"""
+        other = InfiniteState.__new__(InfiniteState)
+        other.stones = dict(self.stones)
+        other.near = dict(self.near)
+        other.chunks = {chunk: set(cells) for chunk, cells in self.chunks.items()}
+        other.grid = SparseGrid(other.stones)
+        other.filled = self.filled
+        other.winner = self.winner
+        other.winning_cells = self.winning_cells
+        other.key = self.key
+        return other
+
+    def encode_move(self, row, col):
+        """Indice de case enregistré par GameLogic"""
+        return encode_cell(row, col)
+
+    def decode_move(self, index):
+        """Case (row, col) d'un indice enregistré"""
+        return decode_cell(index)
+
+    def level(self, cell, symbol):
+        """
+        Niveaux de menace obtenus par symbol en jouant sur une case vide
+
+        Returns:
+            list: Un niveau par direction (table de src.patterns)
+        """
+        row, col = cell
+        get = self.stones.get
+        levels = []
+        for offsets in WINDOWS:
+            own = opp = 0
+            for bit, d_row, d_col in offsets:
+                stone = get((row + d_row, col + d_col))
+                if stone:
+                    if stone == symbol:
+                        own |= bit
+                    else:
+                        opp |= bit
+            levels.append(THREAT_TABLE[own << WINDOW_BITS | opp])
+        return levels
+
+    def make_move(self, cell, symbol):
+        """
+        Pose un pion
+
+        Args:
+            cell: Case (row, col)
+            symbol: 'X' ou 'O'
+
+        Returns:
+            bool: True si le coup aligne CONNECT pions
+        """
+        row, col = cell
+        self.stones[cell] = symbol
+        self.chunks.setdefault((row >> CHUNK_BITS, col >> CHUNK_BITS), set()).add(cell)
+        near = self.near
+        for d_row, d_col in NEIGHBOR_OFFSETS:
+            neighbor = (row + d_row, col + d_col)
+            near[neighbor] = near.get(neighbor, 0) + 1
+        self.filled += 1
+        self.key ^= _cell_key(cell, symbol)
+        self.winning_cells = self._run_through(cell, symbol)
+        if self.winning_cells is not None:
+            self.winner = symbol
+        return self.winner is not None
+
+    def unmake_move(self, cell):
+        """Retire le pion d'une case (la partie ne peut être gagnée qu'au dernier coup)"""
+        row, col = cell
+        symbol = self.stones.pop(cell)
+        chunk = (row >> CHUNK_BITS, col >> CHUNK_BITS)
+        cells = self.chunks[chunk]
+        cells.discard(cell)
+        if not cells:
+            del self.chunks[chunk]
+        near = self.near
+        for d_row, d_col in NEIGHBOR_OFFSETS:
+            neighbor = (row + d_row, col + d_col)
+            count = near[neighbor] - 1
+            if count:
+                near[neighbor] = count
+            else:
+                del near[neighbor]
+        self.filled -= 1
+        self.key ^= _cell_key(cell, symbol)
+        self.winner = None
+        self.winning_cells = None
+
+    def _run_through(self, cell, symbol):
+        """Alignement d'au moins CONNECT pions passant par cell, en partant de la case vers l'extérieur"""
+        row, col = cell
+        stones = self.stones
+        for d_row, d_col in DIRECTIONS:
+            before = 0
+            while stones.get((row - (before + 1) * d_row, col - (before + 1) * d_col)) == symbol:
+                before += 1
+            after = 0
+            while stones.get((row + (after + 1) * d_row, col + (after + 1) * d_col)) == symbol:
+                after += 1
+            if before + after + 1 >= CONNECT:
+                return [(row + k * d_row, col + k * d_col) for k in range(-before, after + 1)]
+        return None
+
+    def make(self, row, col, symbol):
+        """Joue un coup en coordonnées de grille (interface BoardState)"""
+        return self.make_move((row, col), symbol)
+
+    def unmake(self, row, col):
+        """Annule le coup de la case (row, col)"""
+        self.unmake_move((row, col))
+
+    def is_legal(self, row, col):
+        """Retourne True si la case (row, col) peut être jouée"""
+        return self.winner is None and (row, col) not in self.stones
+
+    def is_full(self):
+        """Partie nulle au-delà de INFINITE_CONFIG['max_moves'] pions"""
+        return self.filled >= INFINITE_CONFIG['max_moves']
+
+    def candidates(self):
+        """Cases vides proches des pions posés, triées ((0, 0) sur une grille vide)"""
+        if self.filled == 0:
+            return [(0, 0)]
+        stones = self.stones
+        return sorted(cell for cell in self.near if cell not in stones)
+
+    def empty_cells(self):
+        """Cases libres jouables par un joueur automatique (voisinage des pions)"""
+        return self.candidates()
+
+    def stones_in(self, top, left, bottom, right):
+        """
+        Pions d'un rectangle de cases (bornes incluses), lus bloc par bloc
+
+        Returns:
+            list: ((row, col), symbole) des pions visibles
+        """
+        found = []
+        stones = self.stones
+        for chunk_row in range(top >> CHUNK_BITS, (bottom >> CHUNK_BITS) + 1):
+            for chunk_col in range(left >> CHUNK_BITS, (right >> CHUNK_BITS) + 1):
+                for cell in self.chunks.get((chunk_row, chunk_col), ()):
+                    if top <= cell[0] <= bottom and left <= cell[1] <= right:
+                        found.append((cell, stones[cell]))
+        return found
+
+    def get_winning_positions(self):
+        """Retourne les positions (row, col) de l'alignement gagnant ou None"""
+        return self.winning_cells
+
+
+class InfiniteAI(GomokuAI):
+    """
+    IA de la grille infinie : celle du Gomoku (menaces par tables, VCF,
+    alpha-beta), sur les candidats du voisinage des pions
+    """
+
+    def __init__(self, difficulty='hard', player_symbol='O', seed=None, time_limit=None):
+        super().__init__(difficulty, player_symbol, seed, time_limit)
+        self.max_depth = INFINITE_CONFIG['max_depth'][difficulty]
+        self.vcf_depth = INFINITE_CONFIG['vcf_depth'][difficulty]
+        self.width = INFINITE_CONFIG['candidates']
+        if time_limit is None:
+            self.time_limit = INFINITE_CONFIG['time_limit']
+
+    def get_move(self, state):
+        """
+        Retourne le coup de l'IA
+
+        Args:
+            state: InfiniteState de la partie (non modifié)
+
+        Returns:
+            tuple: (row, col)
+        """
+        self.move_count += 1
+        started = self._begin_stats()
+        move = self._choose(state.copy())
+        self._end_stats(started, move)
+        return move
@@ -0,0 +1,407 @@
+"""
+Générateur de charge pour le serveur de parties (src.server)
+
+Chaque joueur simulé ouvre sa propre connexion asyncio, crée une session et
+enchaîne les parties jusqu'à la fin de la durée demandée : temps de
+réflexion tiré d'une distribution, coup choisi par une stratégie, validé
+côté client sur une copie GameLogic de la partie avant d'être envoyé.
+Chaque aller-retour est mesuré dans les histogrammes de src.metrics.
+
+Le rapport donne le débit (coups, parties, requêtes par seconde), les
+percentiles de latence par opération et les erreurs par nature. --find-slo
+augmente le nombre de joueurs (doublement puis dichotomie) jusqu'à trouver
+le plus grand qui tient l'objectif de latence au p99.
+
+Temps de réflexion (--think) : none, fixed:MS, uniform:MIN,MAX, exp:MOYENNE,
+lognormal:MÉDIANE,SIGMA (millisecondes).
+
+Usage: python -m src.loadtest --players 1000 --duration 20 --think exp:300
+       python -m src.loadtest --spawn --find-slo --slo-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from .game import GameLogic, VARIANTS
+from .metrics import LatencyRecorder
+from config.settings import SERVER_CONFIG
+
+STRATEGIES = ('random', 'greedy', 'ai')
+ERROR_KINDS = ('connect', 'refused', 'rejected', 'desync', 'closed')
+
+
+def parse_think(spec):
+    """
+    Distribution des temps de réflexion
+
+    Args:
+        spec: none, fixed:MS, uniform:MIN,MAX, exp:MOYENNE ou lognormal:MÉDIANE,SIGMA
+
+    Returns:
+        function: rng -> secondes
+    """
+    name, _, args = spec.partition(':')
+    try:
+        values = [float(value) for value in args.split(',') if value]
+    except ValueError:
+        values = []
+    if name == 'none':
+        return lambda rng: 0.0
+    if name == 'fixed' and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if name == 'uniform' and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if name == 'exp' and len(values) == 1 and values[0] > 0:
+        return lambda rng: rng.expovariate(1000 / values[0])
+    if name == 'lognormal' and len(values) == 2 and values[0] > 0:
+        mu, sigma = math.log(values[0] / 1000), values[1]
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"distribution de réflexion invalide: {spec}")
+
+
+class LoadStats:
+    """Compteurs et histogrammes partagés par les joueurs d'une série"""
+
+    def __init__(self):
+        self.latencies = LatencyRecorder()
+        self.moves = 0
+        self.games = 0
+        self.requests = 0
+        self.errors = dict.fromkeys(ERROR_KINDS, 0)
+        self.connected = 0
+
+    def error_count(self):
+        """Nombre total d'erreurs"""
+        return sum(self.errors.values())
+
+    def report(self, elapsed, players):
+        """
+        Résumé de la série
+
+        Returns:
+            dict: Débits, latences par opération et taux d'erreur
+        """
+        return {
+            'players': players,
+            'connected': self.connected,
+            'elapsed_s': elapsed,
+            'moves': self.moves,
+            'games': self.games,
+            'moves_per_s': self.moves / elapsed if elapsed else 0.0,
+            'games_per_s': self.games / elapsed if elapsed else 0.0,
+            'requests_per_s': self.requests / elapsed if elapsed else 0.0,
+            'errors': dict(self.errors),
+            'error_rate': self.error_count() / self.requests if self.requests else 0.0,
+            'latencies': {row['labels']['op']: row for row in self.latencies.report()},
+        }
+
+
+class _Disconnected(Exception):
+    """Connexion du joueur perdue"""
+
+
+class SimulatedPlayer:
+    """Un joueur : une connexion, une session, des parties enchaînées"""
+
+    def __init__(self, address, stats, rng, think, strategy='random', variant='classic',
+                 mode='ai', level='medium'):
+        self.address = address
+        self.stats = stats
+        self.rng = rng
+        self.think = think
+        self.strategy = strategy
+        self.variant = variant
+        self.mode = mode
+        self.level = level
+        self.game = GameLogic(game_mode='pvp', variant=variant)  # Copie locale : validation des coups
+        self.agent = None
+        if strategy == 'ai':
+            self.agent = {symbol: VARIANTS[variant][1](difficulty=level, player_symbol=symbol,
+                                                       seed=rng.getrandbits(64))
+                          for symbol in ('X', 'O')}
+        self._reader = None
+        self._writer = None
+        self._ids = 0
+
+    async def run(self, deadline):
+        """Joue jusqu'à l'échéance (temps de la boucle)"""
+        loop = asyncio.get_running_loop()
+        try:
+            self._reader, self._writer = await asyncio.open_connection(
+                *self.address, limit=SERVER_CONFIG['max_line'])
+        except OSError:
+            self.stats.errors['connect'] += 1
+            return
+        self.stats.connected += 1
+        try:
+            response = await self._request('new', mode=self.mode, level=self.level, variant=self.variant)
+            if response is None:
+                return
+            session = response['session']
+            while loop.time() < deadline:
+                if self.game.game_over:
+                    self.stats.games += 1
+                    if await self._request('restart', session=session) is None:
+                        return
+                    self.game.restart_game()
+                    for agent in (self.agent or {}).values():
+                        agent.reset_game()
+                if self.mode == 'ai' and self.game.current_player == 'O':
+                    response = await self._request('ai_move', session=session)
+                else:
+                    delay = self.think(self.rng)
+                    if delay > 0:
+                        await asyncio.sleep(min(delay, max(0.0, deadline - loop.time())))
+                        if loop.time() >= deadline:
+                            break
+                    row, col = self._choose()
+                    response = await self._request('move', session=session, row=row, col=col)
+                if response is None or not self._apply(response):
+                    return
+            await self._request('close', session=session)
+        except _Disconnected:
+            self.stats.errors['closed'] += 1
+        finally:
+            self._writer.close()
+
+    def _choose(self):
+        """Coup du joueur au trait selon la stratégie (toujours légal pour la copie locale)"""
+        game = self.game
+        if self.agent is not None:
+            return self.agent[game.current_player].get_move(game.search_position())
+        cells = game.state.empty_cells()
+        if self.strategy == 'greedy':
+            # Gagner si possible, sinon parer la victoire adverse
+            for symbol in (game.current_player, 'O' if game.current_player == 'X' else 'X'):
+                for cell in cells:
+                    if game.state.make(*cell, symbol):
+                        game.state.unmake(*cell)
+                        return cell
+                    game.state.unmake(*cell)
+        return self.rng.choice(cells)
+
+    def _apply(self, response):
+        """Reporte le coup accepté sur la copie locale ; False si les deux copies divergent"""
+        result = response['result']
+        if not result['valid']:
+            self.stats.errors['rejected'] += 1
+            return False
+        game = self.game
+        row, col = game.cell_position(response['cell'])
+        if not game.state.is_legal(row, col) or not game.make_move(row, col)['valid']:
+            self.stats.errors['desync'] += 1
+            return False
+        if game.game_over != result['game_over']:
+            self.stats.errors['desync'] += 1
+            return False
+        self.stats.moves += 1
+        return True
+
+    async def _request(self, op, **fields):
+        """Envoie une requête, mesure l'aller-retour ; None si le serveur refuse"""
+        self._ids += 1
+        fields.update(id=self._ids, op=op)
+        started = time.perf_counter()
+        try:
+            self._writer.write(json.dumps(fields, separators=(',', ':')).encode() + b'\n')
+            await self._writer.drain()
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    raise _Disconnected()
+                response = json.loads(line)
+                if response.get('id') == self._ids:
+                    break
+        except (OSError, ValueError):
+            raise _Disconnected()
+        self.stats.latencies.record('rtt', time.perf_counter() - started, op=op)
+        self.stats.requests += 1
+        if not response.get('ok'):
+            self.stats.errors['refused'] += 1
+            return None
+        return response
+
+
+async def run_load(address, players, duration, think='exp:300', strategy='random', variant='classic',
+                   mode='ai', level='medium', ramp=1.0, seed=None):
+    """
+    Lance une série de joueurs simulés contre un serveur
+
+    Args:
+        address: (hôte, port) du serveur
+        players: Nombre de joueurs (une connexion chacun)
+        duration: Durée de jeu en secondes, montée en charge comprise
+        think: Distribution des temps de réflexion (voir parse_think)
+        strategy: random, greedy ou ai (IA locale du niveau demandé)
+        variant: Variante jouée
+        mode: 'ai' (le serveur joue O) ou 'pvp' (le joueur simulé joue les deux camps)
+        level: Niveau de l'IA
+        ramp: Durée en secondes sur laquelle les connexions sont étalées
+        seed: Graine de la série
+
+    Returns:
+        dict: Rapport de LoadStats.report
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"stratégie inconnue: {strategy}")
+    think_time = parse_think(think)
+    rng = random.Random(seed)
+    stats = LoadStats()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + duration
+
+    async def start_player(index):
+        await asyncio.sleep(ramp * index / players)
+        player = SimulatedPlayer(address, stats, random.Random(rng.getrandbits(64)), think_time,
+                                 strategy, variant, mode, level)
+        await player.run(deadline)
+
+    await asyncio.gather(*(start_player(index) for index in range(players)))
+    return stats.report(loop.time() - started, players)
+
+
+async def find_slo(address, slo_ms, op='move', start=50, limit=20000, step_duration=10.0,
+                   max_error_rate=0.01, **load_options):
+    """
+    Plus grand nombre de joueurs dont le p99 de l'opération op tient l'objectif
+
+    Double le nombre de joueurs jusqu'au premier échec (p99 au-delà de slo_ms
+    ou taux d'erreur au-delà de max_error_rate), puis affine par dichotomie
+    jusqu'à 10 % près.
+
+    Returns:
+        tuple: (joueurs tenus ou 0, liste des rapports de chaque palier)
+    """
+    steps = []
+
+    async def holds(players):
+        report = await run_load(address, players, step_duration, **load_options)
+        p99 = report['latencies'].get(op, {}).get('p99_ms', float('inf'))
+        report['slo_ok'] = p99 <= slo_ms and report['error_rate'] <= max_error_rate
+        steps.append(report)
+        print(f"{'✅' if report['slo_ok'] else '❌'} {players} joueurs : p99 {op} = {p99:.1f}ms, "
+              f"{report['moves_per_s']:.0f} coups/s, erreurs {report['error_rate']:.2%}")
+        return report['slo_ok']
+
+    good, bad = 0, None
+    players = start
+    while players <= limit:
+        if not await holds(players):
+            bad = players
+            break
+        good = players
+        players *= 2
+    if bad is None:
+        return good, steps
+    while bad - good > max(1, good // 10):
+        middle = (good + bad) // 2
+        if await holds(middle):
+            good = middle
+        else:
+            bad = middle
+    return good, steps
+
+
+def print_report(report):
+    """Affiche un rapport de série"""
+    print(f"📈 {report['players']} joueurs ({report['connected']} connectés) pendant {report['elapsed_s']:.1f}s : "
+          f"{report['moves_per_s']:.0f} coups/s, {report['games_per_s']:.1f} parties/s, "
+          f"{report['requests_per_s']:.0f} requêtes/s")
+    for op, row in sorted(report['latencies'].items()):
+        print(f"⏱️ {op:<10} n={row['count']:<8} p50={row['p50_ms']:.2f}ms p90={row['p90_ms']:.2f}ms "
+              f"p99={row['p99_ms']:.2f}ms max={row['max_ms']:.2f}ms")
+    errors = ", ".join(f"{kind}: {count}" for kind, count in report['errors'].items() if count)
+    print(f"{'⚠️' if errors else '✓'} Erreurs : {errors or 'aucune'} (taux {report['error_rate']:.3%})")
+
+
+def spawn_server():
+    """
+    Lance un serveur local dans un sous-processus, sur un port libre
+
+    Returns:
+        tuple: (processus, (hôte, port))
+    """
+    probe = socket.socket()
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen([sys.executable, '-m', 'src.server', '--host', '127.0.0.1', '--port', str(port),
+                                '--snapshot', '', '--ratings', ''],
+                               cwd=root)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process, ('127.0.0.1', port)
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("le serveur local n'a pas démarré")
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Charge simulée sur le serveur de parties")
+    parser.add_argument('--host', default=SERVER_CONFIG['host'], help="adresse du serveur")
+    parser.add_argument('--port', type=int, default=SERVER_CONFIG['port'], help="port du serveur")
+    parser.add_argument('--spawn', action='store_true', help="lancer un serveur local pour la durée du test")
+    parser.add_argument('--players', type=int, default=100, help="joueurs simulés (une connexion chacun)")
+    parser.add_argument('--duration', type=float, default=10.0, help="durée de jeu en secondes")
+    parser.add_argument('--ramp', type=float, default=1.0, help="étalement des connexions en secondes")
+    parser.add_argument('--think', default='exp:300', help="temps de réflexion (none, fixed:MS, uniform:A,B, "
+                                                          "exp:MOYENNE, lognormal:MÉDIANE,SIGMA)")
+    parser.add_argument('--strategy', default='random', choices=STRATEGIES, help="choix des coups")
+    parser.add_argument('--variant', default='classic', choices=sorted(VARIANTS), help="variante jouée")
+    parser.add_argument('--mode', default='ai', choices=('ai', 'pvp'), help="adversaire IA ou deux camps simulés")
+    parser.add_argument('--level', default='medium', choices=('easy', 'medium', 'hard'), help="niveau de l'IA")
+    parser.add_argument('--seed', type=int, default=None, help="graine de la série")
+    parser.add_argument('--find-slo', action='store_true', help="chercher le nombre de joueurs tenant --slo-ms")
+    parser.add_argument('--slo-ms', type=float, default=50.0, help="objectif de latence au p99 (ms)")
+    parser.add_argument('--slo-op', default='move', help="opération mesurée par l'objectif (move, ai_move...)")
+    parser.add_argument('--json', default=None, help="fichier JSON du rapport")
+    args = parser.parse_args(argv)
+
+    process = None
+    address = (args.host, args.port)
+    if args.spawn:
+        process, address = spawn_server()
+        print(f"🌐 Serveur local lancé sur le port {address[1]}")
+    options = dict(think=args.think, strategy=args.strategy, variant=args.variant, mode=args.mode,
+                   level=args.level, ramp=args.ramp, seed=args.seed)
+    try:
+        if args.find_slo:
+            players, steps = asyncio.run(find_slo(address, args.slo_ms, op=args.slo_op,
+                                                  start=min(args.players, 50), step_duration=args.duration,
+                                                  **options))
+            print(f"🎯 p99 {args.slo_op} ≤ {args.slo_ms:.0f}ms tenu jusqu'à {players} joueurs")
+            result = {'slo_ms': args.slo_ms, 'op': args.slo_op, 'players': players, 'steps': steps}
+        else:
+            result = asyncio.run(run_load(address, args.players, args.duration, **options))
+            print_report(result)
+    finally:
+        if process is not None:
+            process.send_signal(signal.SIGINT)  # Arrêt propre du serveur
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as out:
+            json.dump(result, out, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""
+File d'attente des parties entre joueurs (PvP) du serveur
+
+Un joueur qui demande une partie reçoit un ticket rangé, pour sa variante,
+dans une case de classement de MATCHMAKING_CONFIG['band_width'] points.
+Chaque case est une file FIFO : sa tête attend depuis le plus longtemps.
+
+Deux joueurs sont appariés quand leurs cases sont séparées d'au plus la
+portée de chacun. La portée vaut 0 à l'arrivée et gagne une case toutes les
+widen_seconds d'attente, jusqu'à max_reach. Un ticket ne regarde que la tête
+des cases à sa portée, et n'a qu'un minuteur à la fois (tas de la boucle
+asyncio) : ajouter, retirer et apparier restent logarithmiques avec des
+dizaines de milliers de joueurs en attente. Un ticket annulé reste dans sa
+file et en est retiré quand il arrive en tête.
+
+Après ai_fallback secondes sans adversaire, le joueur reçoit une partie
+contre l'IA, au niveau choisi par le serveur (classement des IA, voir
+src.ratings) ou à défaut par les seuils ai_levels.
+"""
+
+import asyncio
+import itertools
+from collections import deque
+
+from .metrics import LatencyRecorder
+from config.settings import MATCHMAKING_CONFIG
+
+
+class Ticket:
+    """Un joueur en attente d'adversaire"""
+
+    __slots__ = ('id', 'rating', 'variant', 'band', 'enqueued', 'owner', 'player', 'future', 'timer',
+                 'active', 'queued')
+
+    def __init__(self, ticket_id, rating, variant, band, enqueued, owner, future, player=None):
+        self.id = ticket_id
+        self.player = player  # Nom du profil (None : joueur non classé)
+        self.rating = rating
+        self.variant = variant
+        self.band = band  # Case de classement : rating // band_width
+        self.enqueued = enqueued  # Heure de la boucle à l'arrivée
+        self.owner = owner  # Connexion du joueur (pour le serveur)
+        self.future = future  # Résultat de l'appariement (None si annulé)
+        self.timer = None  # Prochain élargissement ou repli sur l'IA
+        self.active = True  # Pas encore apparié ni annulé
+        self.queued = False  # Compté dans la profondeur de la file
+
+
+class Matchmaker:
+    """Apparie les joueurs en attente par case de classement et temps d'attente"""
+
+    def __init__(self, on_match, band_width=None, widen_seconds=None, max_reach=None, ai_fallback=None,
+                 choose_level=None):
+        """
+        Args:
+            on_match: Fonction (tickets, niveau) appelée pour chaque appariement : deux tickets
+                et None entre joueurs, un ticket et le niveau de l'IA sinon ; retourne le
+                résultat de chaque ticket, dans l'ordre (le plus ancien joue X)
+            band_width: Points de classement par case (MATCHMAKING_CONFIG par défaut)
+            widen_seconds: Attente avant que la portée gagne une case
+            max_reach: Portée maximale (en cases de chaque côté)
+            ai_fallback: Secondes avant de jouer contre l'IA (0 : jamais)
+            choose_level: Fonction (classement, variante) donnant le niveau de l'IA de repli
+                (seuils de MATCHMAKING_CONFIG['ai_levels'] par défaut)
+        """
+        self.on_match = on_match
+        self.band_width = band_width or MATCHMAKING_CONFIG['band_width']
+        self.widen_seconds = widen_seconds or MATCHMAKING_CONFIG['widen_seconds']
+        self.max_reach = MATCHMAKING_CONFIG['max_reach'] if max_reach is None else max_reach
+        self.ai_fallback = MATCHMAKING_CONFIG['ai_fallback'] if ai_fallback is None else ai_fallback
+        self.choose_level = choose_level or (lambda rating, variant: self.ai_level(rating))
+        self._queues = {}  # Variante -> {case: deque de tickets}
+        self._ids = itertools.count(1)
+        self.depth = {}  # Variante -> joueurs en attente
+        self.waiting = 0
+        self.matches = 0  # Parties entre joueurs
+        self.ai_matches = 0
+        self.cancelled = 0
+        self.metrics = LatencyRecorder()  # Temps d'attente par issue et variante
+
+    def enqueue(self, rating=None, variant='classic', owner=None, player=None):
+        """
+        Ajoute un joueur à la file de sa variante (apparié tout de suite si possible)
+
+        Args:
+            rating: Classement du joueur (MATCHMAKING_CONFIG['default_rating'] par défaut)
+            variant: Variante demandée
+            owner: Donnée libre rendue avec le ticket (connexion du joueur)
+            player: Nom du profil du joueur, s'il est classé
+
+        Returns:
+            Ticket: Ticket dont future donne le résultat de on_match
+        """
+        loop = asyncio.get_running_loop()
+        rating = MATCHMAKING_CONFIG['default_rating'] if rating is None else rating
+        ticket = Ticket(next(self._ids), rating, variant, int(rating // self.band_width),
+                        loop.time(), owner, loop.create_future(), player)
+        if self._pair(ticket, loop.time()):
+            return ticket
+        bands = self._queues.setdefault(variant, {})
+        bands.setdefault(ticket.band, deque()).append(ticket)
+        ticket.queued = True
+        self.depth[variant] = self.depth.get(variant, 0) + 1
+        self.waiting += 1
+        self._schedule(ticket, loop)
+        return ticket
+
+    def cancel(self, ticket):
+        """Retire un joueur de la file (sans effet s'il est déjà apparié) ; son résultat vaut None"""
+        if not ticket.active:
+            return
+        self._leave(ticket)
+        self.cancelled += 1
+        self.metrics.record('wait', asyncio.get_running_loop().time() - ticket.enqueued,
+                            outcome='cancelled', variant=ticket.variant)
+        if not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def reach(self, ticket, now):
+        """Portée d'un ticket (en cases de chaque côté) après son attente"""
+        return min(self.max_reach, int((now - ticket.enqueued) / self.widen_seconds))
+
+    @staticmethod
+    def ai_level(rating):
+        """Niveau de l'IA proposé pour un classement (MATCHMAKING_CONFIG['ai_levels'])"""
+        for level, ceiling in MATCHMAKING_CONFIG['ai_levels']:
+            if ceiling is None or rating < ceiling:
+                return level
+        return MATCHMAKING_CONFIG['ai_levels'][-1][0]
+
+    # --- Appariement ----------------------------------------------------------
+
+    def _pair(self, ticket, now):
+        """Cherche un adversaire à portée ; retourne True si la partie est créée"""
+        bands = self._queues.get(ticket.variant)
+        if not bands:
+            return False
+        for distance in range(self.reach(ticket, now) + 1):
+            best = None
+            for band in {ticket.band - distance, ticket.band + distance}:
+                head = self._head(bands, band)
+                if head is None or head is ticket or self.reach(head, now) < distance:
+                    continue
+                if best is None or head.enqueued < best.enqueued:
+                    best = head
+            if best is not None:
+                self._start(sorted((best, ticket), key=lambda t: t.enqueued), None, now)
+                return True
+        return False
+
+    def _head(self, bands, band):
+        """Plus ancien ticket actif d'une case (les tickets partis sont retirés au passage)"""
+        queue = bands.get(band)
+        if queue is None:
+            return None
+        while queue and not queue[0].active:
+            queue.popleft()
+        if not queue:
+            del bands[band]
+            return None
+        return queue[0]
+
+    def _schedule(self, ticket, loop):
+        """Programme le prochain élargissement de la portée, ou le repli sur l'IA"""
+        reach = self.reach(ticket, loop.time())
+        times = []
+        if reach < self.max_reach:
+            times.append(ticket.enqueued + (reach + 1) * self.widen_seconds)
+        if self.ai_fallback:
+            times.append(ticket.enqueued + self.ai_fallback)
+        if times:
+            ticket.timer = loop.call_at(min(times), self._step, ticket, loop)
+
+    def _step(self, ticket, loop):
+        """Minuteur d'un ticket : nouvelle recherche avec la portée élargie, ou partie contre l'IA"""
+        ticket.timer = None
+        if not ticket.active:
+            return
+        now = loop.time()
+        if self.ai_fallback and now - ticket.enqueued >= self.ai_fallback:
+            self._start([ticket], self.choose_level(ticket.rating, ticket.variant), now)
+        elif not self._pair(ticket, now):
+            self._schedule(ticket, loop)
+
+    def _leave(self, ticket):
+        """Marque un ticket comme sorti de la file (retiré paresseusement de sa case)"""
+        ticket.active = False
+        if ticket.timer is not None:
+            ticket.timer.cancel()
+            ticket.timer = None
+        if ticket.queued:
+            ticket.queued = False
+            self.depth[ticket.variant] -= 1
+            self.waiting -= 1
+
+    def _start(self, tickets, level, now):
+        """Crée la partie des tickets appariés et rend son résultat à chacun"""
+        outcome = 'human' if level is None else 'ai'
+        for ticket in tickets:
+            self._leave(ticket)
+            self.metrics.record('wait', now - ticket.enqueued, outcome=outcome, variant=ticket.variant)
+        if level is None:
+            self.matches += 1
+        else:
+            self.ai_matches += 1
+        try:
+            results = self.on_match(tickets, level)
+        except Exception as e:
+            for ticket in tickets:
+                if not ticket.future.done():
+                    ticket.future.set_exception(e)
+            return
+        for ticket, result in zip(tickets, results):
+            if not ticket.future.done():
+                ticket.future.set_result(result)
+
+    def summary(self, now=None):
+        """Profondeur des files, appariements et temps d'attente (p50/p90/p99 par issue)"""
+        now = asyncio.get_running_loop().time() if now is None else now
+        longest = 0.0
+        for bands in self._queues.values():
+            for band in list(bands):
+                head = self._head(bands, band)
+                if head is not None:
+                    longest = max(longest, now - head.enqueued)
+        return {
+            'waiting': self.waiting,
+            'depth': {variant: count for variant, count in self.depth.items() if count},
+            'longest_wait_s': longest,
+            'matches': self.matches,
+            'ai_matches': self.ai_matches,
+            'cancelled': self.cancelled,
+            'wait': self.metrics.report()
+        }
@@ -0,0 +1,185 @@
+"""
+Histogrammes de latence à mémoire fixe
+
+Les durées (get_move de l'IA, make_move, transitions d'écran...) sont
+rangées dans des seaux logarithmiques : 8 sous-seaux par puissance de deux,
+soit une erreur relative d'environ 6 % quelle que soit la valeur, pour une
+mémoire constante par histogramme. Les percentiles p50/p90/p99 et le
+maximum révèlent les pics de latence que masquent les moyennes.
+"""
+
+import atexit
+import json
+import os
+import signal
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_VALUE_BITS = 40  # Valeurs en microsecondes jusqu'à ~12 jours
+BUCKET_COUNT = (MAX_VALUE_BITS - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+
+
+def _bucket_index(value):
+    """Indice du seau d'une valeur entière (microsecondes)"""
+    if value < SUB_BUCKETS:
+        return value
+    exponent = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (exponent + 1) * SUB_BUCKETS + (value >> exponent) - SUB_BUCKETS
+
+
+def _bucket_bounds(index):
+    """Bornes (incluses) des valeurs rangées dans un seau"""
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    exponent = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return mantissa << exponent, ((mantissa + 1) << exponent) - 1
+
+
+class LatencyHistogram:
+    """Histogramme de latences à seaux logarithmiques (mémoire constante)"""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Enregistre une durée en secondes"""
+        value = min(MAX_VALUE, max(0, int(seconds * 1_000_000)))
+        self.counts[_bucket_index(value)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        """
+        Retourne le percentile demandé en secondes
+
+        Args:
+            percent: Percentile entre 0 et 100
+
+        Returns:
+            float: Valeur représentative du seau atteint (bornée par le maximum observé)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(percent / 100 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            if seen >= rank:
+                low, high = _bucket_bounds(index)
+                return min(self.max, (low + high) / 2 / 1_000_000)
+        return self.max
+
+    def merge(self, other):
+        """Ajoute les valeurs d'un autre histogramme"""
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def summary(self):
+        """Résumé en millisecondes : nombre, moyenne, p50, p90, p99, max"""
+        return {
+            'count': self.count,
+            'mean_ms': (self.total / self.count * 1000) if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p90_ms': self.percentile(90) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+class LatencyRecorder:
+    """Ensemble d'histogrammes indexés par métrique et étiquettes (niveau IA, taille...)"""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, **labels):
+        """Retourne (en le créant si besoin) l'histogramme d'une métrique"""
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def record(self, name, seconds, **labels):
+        """Enregistre une durée pour une métrique"""
+        self.histogram(name, **labels).record(seconds)
+
+    @contextmanager
+    def measure(self, name, **labels):
+        """Mesure la durée d'un bloc : with recorder.measure('get_move', level='hard'): ..."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, **labels)
+
+    def report(self):
+        """
+        Retourne le résumé de tous les histogrammes
+
+        Returns:
+            list: Dictionnaires {'metric', 'labels', 'count', 'p50_ms', ...}
+        """
+        rows = []
+        for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: str(item[0])):
+            row = {'metric': name, 'labels': dict(labels)}
+            row.update(histogram.summary())
+            rows.append(row)
+        return rows
+
+    def dump_json(self, path):
+        """Écrit le résumé des histogrammes dans un fichier JSON"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as out:
+            json.dump({'generated_at': time.time(), 'latencies': self.report()}, out, indent=2)
+
+    def print_report(self):
+        """Affiche le résumé des latences dans la console"""
+        for row in self.report():
+            labels = " ".join(f"{key}={value}" for key, value in row['labels'].items())
+            print(f"⏱️ {row['metric']:<18} {labels:<24} n={row['count']:<6} "
+                  f"p50={row['p50_ms']:.2f}ms p90={row['p90_ms']:.2f}ms "
+                  f"p99={row['p99_ms']:.2f}ms max={row['max_ms']:.2f}ms")
+
+    def install_dump_handlers(self, path):
+        """
+        Programme l'écriture du JSON à la sortie du processus et sur signal
+
+        SIGUSR1 (lorsque le système le propose) déclenche un export sans
+        arrêter l'application.
+        """
+        atexit.register(self.dump_json, path)
+        if hasattr(signal, 'SIGUSR1') and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.dump_json(path))
+
+
+# Enregistreur partagé par l'application et le lanceur sans interface
+recorder = LatencyRecorder()
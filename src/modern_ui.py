@@ -5,12 +5,16 @@ Interface utilisateur ultra-moderne avec animations et effets visuels
 import tkinter as tk
 from tkinter import messagebox
 import math
+import random
 import time
 import threading
 import sys
 from config.settings import (WINDOW_CONFIG, COLORS, GRID_CONFIG, 
                            MESSAGES, FONTS)
 from .utils import get_winning_positions
+from .timers import TimerRegistry, TweenScheduler
+from .events import FrameCoalescer, ScoreChanged, Draw
+from .board_views import BoardCanvasView, InfiniteBoardView
 
 class ModernGameUI:
     """Interface de jeu ultra-moderne avec effets visuels avancés"""
@@ -26,6 +30,7 @@ class ModernGameUI:
         self.score_label = None
         self.game_frame = None
         self.canvas = None
+        self.board_view = None  # Vue Canvas des variantes (Ultimate, Qubic, Gomoku, gravité, infinie)
         
         # Variables pour les animations et effets
         self.particles = []
@@ -33,8 +38,25 @@ class ModernGameUI:
         self.thinking_indicator = None
         self.ai_thinking = False
         self.button_effects = {}
-        
-        if self.game_mode == 'ai':
+        self._victory_message = None  # after() du message de victoire, annulé par Ctrl+Z
+        self._win_tweens = []  # Clignotements de la ligne gagnante et du titre
+        self._title_color = None  # Couleur du titre avant la célébration
+        
+        # Tous les callbacks after() de l'écran de jeu passent par ce registre
+        self.timers = TimerRegistry(master, name='jeu')
+        # Animations interpolées (flashs, chute des pions), avancées par une seule boucle du registre
+        self.tweens = TweenScheduler(self.timers)
+        
+        # Scores et statistiques redessinés sur les évènements de la partie, au plus une fois par image
+        self._shown_scores = self.game_logic.get_scores() if self.game_logic else {'X': 0, 'O': 0}
+        self._repaints = FrameCoalescer(self.timers, self._repaint_scores)
+        events = getattr(self.game_logic, 'events', None)
+        self._unsubscribe = events.subscribe(self._repaints, ScoreChanged, Draw) if events else None
+        
+        if self.game_mode == 'ai' and getattr(self.game_logic, 'ai', None):
+            # Partager l'IA de la logique de jeu (graine enregistrée dans le journal)
+            self.ai_player = self.game_logic.ai
+        elif self.game_mode == 'ai':
             from .ai import TicTacToeAI
             self.ai_player = TicTacToeAI(difficulty=self.ai_level)
         else:
@@ -51,6 +73,8 @@ class ModernGameUI:
             # Raccourcis clavier
             self.master.bind('<Escape>', self._return_to_menu)
             self.master.bind('<F11>', self._toggle_fullscreen)
+            self.master.bind('<Control-z>', self._on_undo)
+            self.master.bind('<Control-y>', self._on_redo)
             
             self.master.focus_set()
             
@@ -101,9 +125,11 @@ class ModernGameUI:
     
     def _create_background_effects(self):
         """Crée des effets d'arrière-plan animés"""
+        # Générateur à graine fixe : même disposition à chaque partie, sans hacher de chaînes
+        rng = random.Random(0)
         for _ in range(30):
-            x = hash(str(_)) % self.screen_width
-            y = hash(str(_ * 2)) % self.screen_height
+            x = rng.randrange(self.screen_width)
+            y = rng.randrange(self.screen_height)
             size = 3 + (_ % 5)
             speed_x = ((_ % 20) - 10) / 15
             speed_y = ((_ % 15) - 7) / 12
@@ -225,7 +251,11 @@ class ModernGameUI:
         grid_container.pack(expand=True, fill='both', pady=(top_padding, 50), padx=20)
         
         # Configuration de la taille de la grille
+        variant = getattr(self.game_logic, 'variant', 'classic')
         grid_size = min(self.screen_width // 4, self.screen_height // 4)
+        if variant != 'classic':
+            # Grilles de 64 ou 81 cases : plus de place pour garder des cases lisibles
+            grid_size = min(self.screen_width // 2, self.screen_height // 2)
         if self.game_mode == 'pvp':
             grid_size = int(grid_size * 1.05)
             
@@ -247,6 +277,14 @@ class ModernGameUI:
         )
         self.game_frame.pack(expand=True, fill='both', padx=10, pady=10)
         
+        if variant != 'classic':
+            # Variantes : un seul Canvas redessiné case par case au lieu de boutons
+            view_class = InfiniteBoardView if variant == 'infinite' else BoardCanvasView
+            self.board_view = view_class(
+                self.game_frame, self.game_logic, self._on_ultra_button_click, grid_size - 40
+            )
+            return
+        
         # Calcul des dimensions adaptatives
         screen_min_dimension = min(self.screen_width, self.screen_height)
         base_size = screen_min_dimension // 12
@@ -350,7 +388,7 @@ class ModernGameUI:
         """Anime le clic du bouton"""
         original_relief = button['relief']
         button.config(relief='sunken')
-        self.master.after(100, lambda: button.config(relief=original_relief))
+        self.timers.after(100, lambda: button.config(relief=original_relief))
     
     def _create_enhanced_controls(self):
         """Crée des contrôles améliorés avec animations - seulement le tableau de score"""
@@ -434,11 +472,32 @@ class ModernGameUI:
         
         # Les références sont déjà stockées en tant que self.x_label et self.o_label
         
+        # Statistiques persistantes du profil (lues depuis le cache du store)
+        summary = self.game_logic.get_stats_summary()
+        if summary is not None:
+            self.stats_label = tk.Label(
+                score_container,
+                text=self._format_stats_text(summary),
+                font=('Segoe UI', 11, 'italic'),
+                bg=COLORS['background_secondary'],
+                fg=COLORS['accent_secondary']
+            )
+            self.stats_label.pack(pady=(0, 5))
+        
         # Stocker aussi une référence compatible avec le code existant
         self.score_label = score_title  # Fallback uniquement
         
         # Les boutons de contrôle ne sont plus créés ici - uniquement dans le panneau inférieur
     
+    def _format_stats_text(self, summary):
+        """Formate les statistiques en cache du profil pour l'affichage"""
+        results = summary['results']
+        text = f"📊 {summary['games']} parties • Nuls: {results['draw']}"
+        for symbol, (current, best) in summary['streaks'].items():
+            if current > 0:
+                text += f" • Série {symbol}: {current} (record {best})"
+        return text
+    
     def _create_ultra_control_buttons(self, parent):
         """Crée des boutons de contrôle ultra-modernes - FONCTION CONSERVÉE UNIQUEMENT POUR COMPATIBILITÉ"""
         # Cette fonction n'est plus utilisée activement pour éviter les boutons en double
@@ -481,15 +540,30 @@ class ModernGameUI:
         """Gestionnaire de clic avec effets visuels"""
         if self.ai_thinking:
             return  # Empêcher les clics pendant que l'IA réfléchit
+        
+        gravity = getattr(self.game_logic, 'variant', 'classic') == 'gravity'
+        if gravity:
+            # Clic n'importe où dans la colonne : la case d'arrivée vient de la hauteur de la colonne
+            drop_row = self.game_logic.state.drop_row(col)
+            if drop_row is not None:
+                row = drop_row
             
         result = self.game_logic.make_move(row, col)
         
         if not result['valid']:
-            self._animate_invalid_move(self.buttons[row][col])
+            if self.board_view is not None:
+                self.board_view.flash_invalid(row, col, self.timers)
+            else:
+                self._animate_invalid_move(self.buttons[row][col])
             return
         
         # Animation de placement du symbole
-        self._animate_symbol_placement(row, col, result['player_who_played'])
+        if gravity:
+            self.board_view.animate_drop(row, col, self.tweens)
+        elif self.board_view is not None:
+            self.board_view.refresh()
+        else:
+            self._animate_symbol_placement(row, col, result['player_who_played'])
         
         if result['game_over']:
             if result['winner']:
@@ -501,7 +575,7 @@ class ModernGameUI:
             
             # Si c'est le tour de l'IA
             if self.game_logic.is_ai_turn():
-                self.master.after(500, self._handle_ai_turn)
+                self.timers.after(500, self._handle_ai_turn)
     
     def _animate_symbol_placement(self, row, col, symbol):
         """Anime le placement d'un symbole"""
@@ -511,21 +585,18 @@ class ModernGameUI:
         original_bg = button['bg']
         flash_color = COLORS['winning_highlight']
         
-        def flash_sequence():
-            colors = [flash_color, original_bg, flash_color, original_bg]
-            for i, color in enumerate(colors):
-                self.master.after(i * 100, lambda c=color: button.config(bg=c))
-        
-        flash_sequence()
-        
-        # Placer le symbole avec style
+        # Placer le symbole avec style à la fin du flash
         symbol_color = COLORS['text_secondary'] if symbol == 'X' else COLORS['text_player_o']
-        self.master.after(400, lambda: button.config(
-            text=symbol,
-            fg=symbol_color,
-            state='disabled',
-            bg=COLORS['button_active']
-        ))
+        self.tweens.sequence(
+            400, [flash_color, original_bg, flash_color, original_bg],
+            lambda c: button.config(bg=c),
+            done=lambda: button.config(
+                text=symbol,
+                fg=symbol_color,
+                state='disabled',
+                bg=COLORS['button_active']
+            )
+        )
     
     def _animate_invalid_move(self, button):
         """Anime un mouvement invalide"""
@@ -535,11 +606,11 @@ class ModernGameUI:
         def shake_effect():
             positions = [2, -2, 1, -1, 0]
             for i, offset in enumerate(positions):
-                self.master.after(i * 50, lambda: None)  # Simpler shake
+                self.timers.after(i * 50, lambda: None)  # Simpler shake
         
         # Flash rouge
         button.config(bg=error_color)
-        self.master.after(200, lambda: button.config(bg=original_bg))
+        self.timers.after(200, lambda: button.config(bg=original_bg))
         shake_effect()
     
     def _handle_ai_turn(self):
@@ -551,6 +622,10 @@ class ModernGameUI:
         if self.game_logic.current_player != 'O':
             return
         
+        # Le tour de l'IA peut être demandé deux fois (clic + affichage du joueur)
+        if self.ai_thinking:
+            return
+        
         self.ai_thinking = True
         self._start_thinking_animation()
         
@@ -574,13 +649,17 @@ class ModernGameUI:
                             board_state[i][j] = button_text
             
             if hasattr(self, 'ai_player'):
-                move = self.ai_player.get_move(board_state)
+                # L'IA partagée avec la logique passe par elle (latences mesurées)
+                if self.ai_player is getattr(self.game_logic, 'ai', None):
+                    move = self.game_logic.get_ai_move()
+                else:
+                    move = self.ai_player.get_move(board_state)
                 if move:
                     row, col = move
                     self._on_ultra_button_click(row, col)
         
         # Attendre le temps de réflexion
-        self.master.after(int(thinking_time * 1000), make_ai_move)
+        self.timers.after(int(thinking_time * 1000), make_ai_move)
     
     def _start_thinking_animation(self):
         """Démarre l'animation de réflexion de l'IA"""
@@ -598,7 +677,7 @@ class ModernGameUI:
         
         if self.thinking_label.winfo_exists():
             self.thinking_label.config(text=f"🤖 L'IA réfléchit{dots[current_time]}")
-            self.master.after(250, self._animate_thinking_dots)
+            self.timers.after(250, self._animate_thinking_dots)
     
     def _stop_thinking_animation(self):
         """Arrête l'animation de réflexion"""
@@ -621,7 +700,7 @@ class ModernGameUI:
             # Lancer automatiquement le tour de l'IA après un court délai
             # si le jeu n'est pas terminé et que l'IA ne réfléchit pas déjà
             if not self.game_logic.is_game_over() and not self.ai_thinking:
-                self.master.after(500, self._handle_ai_turn)
+                self.timers.after(500, self._handle_ai_turn)
         else:
             # Réactiver les boutons pour le joueur humain
             self._enable_valid_buttons()
@@ -642,13 +721,12 @@ class ModernGameUI:
             label.config(text=new_text, fg=new_color)
         
         fade_out()
-        self.master.after(150, fade_in)
+        self.timers.after(150, fade_in)
     
     def _handle_victory(self, winner):
         """Gère une victoire avec effets spéciaux"""
         self._highlight_winning_line()
         self._animate_victory_celebration()
-        self._update_score_display()
         
         # Message de victoire personnalisé
         if self.game_mode == 'ai':
@@ -659,23 +737,23 @@ class ModernGameUI:
         else:
             message = f"🎉 Victoire du joueur {winner} !"
         
-        self.master.after(1500, lambda: messagebox.showinfo("Victoire !", message))
+        self._victory_message = self.timers.after(1500, lambda: messagebox.showinfo("Victoire !", message))
     
     def _animate_victory_celebration(self):
         """Anime une célébration de victoire"""
         # Faire clignoter le titre
-        original_color = self.title_label['fg']
+        original_color = self._title_color or self.title_label['fg']
+        self._title_color = original_color
         celebration_color = COLORS['winning_highlight']
         
-        def flash_title():
-            colors = [celebration_color, original_color] * 5
-            for i, color in enumerate(colors):
-                self.master.after(i * 200, lambda c=color: self.title_label.config(fg=c))
-        
-        flash_title()
+        self._win_tweens.append(self.tweens.sequence(2000, [celebration_color, original_color] * 5,
+                                                     lambda c: self.title_label.config(fg=c)))
     
     def _highlight_winning_line(self):
         """Met en surbrillance la ligne gagnante avec animation"""
+        if self.board_view is not None:
+            self.board_view.highlight(self.game_logic.state.get_winning_positions())
+            return
         winning_positions = get_winning_positions(self.game_logic.get_board())
         if winning_positions:
             for row, col in winning_positions:
@@ -687,88 +765,54 @@ class ModernGameUI:
         original_bg = button['bg']
         highlight_color = COLORS['winning_highlight']
         
-        def pulse_effect():
-            colors = [highlight_color, original_bg] * 8
-            for i, color in enumerate(colors):
-                self.master.after(i * 150, lambda c=color: button.config(bg=c) if button.winfo_exists() else None)
-        
-        pulse_effect()
+        # Un widget détruit en cours de route arrête simplement l'interpolation
+        self._win_tweens.append(
+            self.tweens.sequence(2400, [highlight_color, original_bg] * 8, lambda c: button.config(bg=c)))
+    
+    def _cancel_victory_effects(self):
+        """Annule le message de victoire en attente et les clignotements (partie annulée ou relancée)"""
+        self.timers.cancel(self._victory_message)
+        self._victory_message = None
+        for tween in self._win_tweens:
+            self.tweens.cancel(tween)
+        self._win_tweens = []
+        if self._title_color is not None:
+            self.title_label.config(fg=self._title_color)
     
     def _handle_draw(self):
         """Gère une égalité"""
         messagebox.showinfo("Égalité", "Match nul ! Bien joué à tous les deux !")
     
+    def _repaint_scores(self, events):
+        """Redessin des scores pour les évènements d'une image (ScoreChanged, Draw)"""
+        self._update_score_display()
+    
     def _update_score_display(self):
-        """Met à jour l'affichage des scores avec animation"""
+        """Met à jour l'affichage des scores ; seuls les scores modifiés clignotent"""
         scores = self.game_logic.get_scores()
         
-        # Mettre à jour les labels X et O du tableau principal
-        if hasattr(self, 'x_label') and hasattr(self, 'o_label'):
-            def blink_main_labels(count=0):
-                if count >= 6:  # 3 clignotements complets
-                    if hasattr(self, 'x_label'):
-                        self.x_label.config(text=f"X: {scores['X']}", fg="white")
-                    if hasattr(self, 'o_label'):
-                        self.o_label.config(text=f"O: {scores['O']}", fg="white")
-                    return
-                
-                # Alterner entre normal et highlight
-                if count % 2 == 0:
-                    if hasattr(self, 'x_label'):
-                        self.x_label.config(fg="yellow")
-                    if hasattr(self, 'o_label'):
-                        self.o_label.config(fg="yellow")
-                else:
-                    if hasattr(self, 'x_label'):
-                        self.x_label.config(fg="white")
-                    if hasattr(self, 'o_label'):
-                        self.o_label.config(fg="white")
-                
-                self.master.after(200, lambda: blink_main_labels(count + 1))
-            
-            # Mettre à jour les labels principaux
-            self.x_label.config(text=f"X: {scores['X']}")
-            self.o_label.config(text=f"O: {scores['O']}")
-            blink_main_labels()
-            
-        # Mettre à jour les scores X et O du panneau du bas avec animation
-        def update_bottom_scores():
-            if hasattr(self, 'bottom_score_x_label') and hasattr(self, 'bottom_score_o_label'):
-                def blink_bottom_score(count=0):
-                    if count >= 6:  # 3 clignotements complets
-                        if hasattr(self, 'bottom_score_x_label'):
-                            self.bottom_score_x_label.config(text=f"X: {scores['X']}", fg="white")
-                        if hasattr(self, 'bottom_score_o_label'):
-                            self.bottom_score_o_label.config(text=f"O: {scores['O']}", fg="white")
-                        return
-                    
-                    # Alterner entre normal et highlight pour les deux labels
-                    if count % 2 == 0:
-                        if hasattr(self, 'bottom_score_x_label'):
-                            self.bottom_score_x_label.config(fg="yellow")
-                        if hasattr(self, 'bottom_score_o_label'):
-                            self.bottom_score_o_label.config(fg="yellow")
-                    else:
-                        if hasattr(self, 'bottom_score_x_label'):
-                            self.bottom_score_x_label.config(fg="white")
-                        if hasattr(self, 'bottom_score_o_label'):
-                            self.bottom_score_o_label.config(fg="white")
-                    
-                    # Continuer l'animation
-                    if self.master:
-                        self.master.after(200, lambda: blink_bottom_score(count + 1))
-                
-                # Mettre à jour les textes
-                if hasattr(self, 'bottom_score_x_label'):
-                    self.bottom_score_x_label.config(text=f"X: {scores['X']}")
-                if hasattr(self, 'bottom_score_o_label'):
-                    self.bottom_score_o_label.config(text=f"O: {scores['O']}")
-                
-                # Lancer l'animation
-                blink_bottom_score()
-        
-        # Lancer la mise à jour du panneau du bas
-        update_bottom_scores()
+        # Les statistiques viennent du cache du store, jamais d'une requête SQL
+        summary = self.game_logic.get_stats_summary()
+        if summary is not None and hasattr(self, 'stats_label'):
+            self.stats_label.config(text=self._format_stats_text(summary))
+        
+        changed = [player for player in ('X', 'O') if scores[player] != self._shown_scores.get(player)]
+        self._shown_scores = scores
+        
+        # Tableau principal et panneau du bas
+        for player in ('X', 'O'):
+            labels = [label for label in (getattr(self, f'{player.lower()}_label', None),
+                                          getattr(self, f'bottom_score_{player.lower()}_label', None))
+                      if label is not None]
+            for label in labels:
+                label.config(text=f"{player}: {scores[player]}")
+            if player in changed and labels:
+                def blink(color, labels=labels):
+                    for label in labels:
+                        label.config(fg=color)
+
+                # 3 clignotements : une seule interpolation pour les deux labels du joueur
+                self.tweens.sequence(1200, ["yellow", "white"] * 3, blink)
     
     def _start_all_animations(self):
         """Démarre toutes les animations d'arrière-plan"""
@@ -806,7 +850,7 @@ class ModernGameUI:
             except:
                 pass
         
-        self.master.after(50, self._animate_background_particles)
+        self.timers.after(50, self._animate_background_particles)
     
     def _animate_title_glow(self):
         """Anime un effet de lueur sur le titre"""
@@ -817,10 +861,11 @@ class ModernGameUI:
         current_time = time.time()
         # Pas d'effet visible pour ne pas être distrayant
         
-        self.master.after(500, self._animate_title_glow)
+        self.timers.after(500, self._animate_title_glow)
     
     def _on_restart_click(self):
         """Redémarre le jeu avec animation"""
+        self._cancel_victory_effects()
         self.game_logic.restart_game()
         
         # Réinitialiser l'IA si elle existe
@@ -831,10 +876,15 @@ class ModernGameUI:
         
         # Si l'IA commence
         if self.game_logic.is_ai_turn():
-            self.master.after(1000, self._handle_ai_turn)
+            self.timers.after(1000, self._handle_ai_turn)
     
     def _reset_ui_with_animation(self):
         """Remet l'interface à zéro avec animation"""
+        if self.board_view is not None:
+            self.board_view.refresh()
+            self.timers.after(500, self._update_player_display)
+            return
+        
         # Animation de nettoyage
         for i in range(3):
             for j in range(3):
@@ -842,7 +892,7 @@ class ModernGameUI:
                 self._animate_button_reset(button, i * 3 + j)
         
         # Mettre à jour l'affichage du joueur
-        self.master.after(500, self._update_player_display)
+        self.timers.after(500, self._update_player_display)
     
     def _animate_button_reset(self, button, delay_index):
         """Anime la remise à zéro d'un bouton"""
@@ -860,15 +910,49 @@ class ModernGameUI:
                 # Flash de reset
                 flash_color = COLORS['accent_secondary']
                 button.config(bg=flash_color)
-                self.master.after(100, lambda: button.config(bg=COLORS['button_normal']))
+                self.timers.after(100, lambda: button.config(bg=COLORS['button_normal']))
         
         # Délai échelonné pour un effet en cascade
-        self.master.after(delay_index * 100, reset_button)
+        self.timers.after(delay_index * 100, reset_button)
+    
+    def _on_undo(self, event=None):
+        """Annule le dernier coup (le coup de l'IA et le vôtre en mode IA)"""
+        if self.ai_thinking or not self.game_logic.can_undo():
+            return
+        self._cancel_victory_effects()
+        self.game_logic.undo()
+        self._refresh_board_buttons()
+        self._update_player_display()
+    
+    def _on_redo(self, event=None):
+        """Rétablit le dernier coup annulé"""
+        if self.ai_thinking or not self.game_logic.can_redo():
+            return
+        result_over = self.game_logic.redo() and self.game_logic.is_game_over()
+        self._refresh_board_buttons()
+        if result_over:
+            self._highlight_winning_line()
+        else:
+            self._update_player_display()
+    
+    def _refresh_board_buttons(self):
+        """Synchronise les boutons de la grille avec l'état de la logique de jeu"""
+        if self.board_view is not None:
+            self.board_view.refresh()
+            return
+        board = self.game_logic.get_board()
+        for i, row in enumerate(board):
+            for j, symbol in enumerate(row):
+                button = self.buttons[i][j]
+                if symbol:
+                    symbol_color = COLORS['text_secondary'] if symbol == 'X' else COLORS['text_player_o']
+                    button.config(text=symbol, fg=symbol_color, state='disabled', bg=COLORS['button_active'])
+                else:
+                    button.config(text="", fg=COLORS['text_primary'], state='normal', bg=COLORS['button_normal'])
     
     def _on_reset_score_click(self):
         """Remet les scores à zéro avec animation"""
         self.game_logic.reset_scores()
-        self._update_score_display()
     
     def _return_to_menu(self, event=None):
         """Retourne au menu principal de manière robuste"""
@@ -886,16 +970,10 @@ class ModernGameUI:
         # Arrêter toutes les animations immédiatement
         self.animation_running = False
         
-        # Annuler toutes les tâches en attente pour éviter les conflits
-        if self.master:
-            try:
-                for task_id in self.master.tk.call('after', 'info'):
-                    try:
-                        self.master.after_cancel(task_id)
-                    except:
-                        pass
-            except:
-                pass  # Ignorer les erreurs potentielles
+        # Annuler tous les callbacks de cet écran pour éviter les conflits
+        cancelled = self.timers.close()
+        self._unsubscribe_events()
+        print(f"🧹 {cancelled} callbacks en attente annulés")
         
         # Capturer les références nécessaires
         callback = self.on_return_menu
@@ -920,6 +998,12 @@ class ModernGameUI:
         if master:
             master.after_idle(execute_return)
     
+    def _unsubscribe_events(self):
+        """Se désabonne des évènements de la partie (fin de l'écran)"""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+    
     def _toggle_fullscreen(self, event=None):
         """Bascule le plein écran (bien que déjà en plein écran)"""
         self.is_fullscreen = not self.is_fullscreen
@@ -933,12 +1017,8 @@ class ModernGameUI:
         self.animation_running = False
         
         # Annuler toutes les tâches en attente
-        if self.master:
-            for task_id in self.master.tk.call('after', 'info'):
-                try:
-                    self.master.after_cancel(task_id)
-                except:
-                    pass
+        self.timers.close()
+        self._unsubscribe_events()
         
         # Fermer la fenêtre
         try:
@@ -951,6 +1031,8 @@ class ModernGameUI:
     
     def _disable_all_buttons(self):
         """Désactive tous les boutons de la grille pour empêcher le joueur de jouer pendant le tour de l'IA"""
+        if self.board_view is not None:
+            self.board_view.set_enabled(False)
         for i in range(3):
             for j in range(3):
                 if hasattr(self, 'buttons') and len(self.buttons) > i and len(self.buttons[i]) > j:
@@ -958,6 +1040,8 @@ class ModernGameUI:
     
     def _enable_valid_buttons(self):
         """Active uniquement les boutons correspondant à des cases vides"""
+        if self.board_view is not None:
+            self.board_view.set_enabled(True)
         for i in range(3):
             for j in range(3):
                 if hasattr(self, 'buttons') and len(self.buttons) > i and len(self.buttons[i]) > j:
@@ -985,7 +1069,7 @@ class ModernGameUI:
         # Ajouter un raccourci texte au centre
         shortcuts_label = tk.Label(
             bottom_panel,
-            text="💡 Échap: Menu • F11: Plein écran • Interface moderne",
+            text="💡 Échap: Menu • F11: Plein écran • Ctrl+Z / Ctrl+Y: Annuler / Rétablir",
             font=('Segoe UI', 10, 'normal'),
             bg=COLORS['background_secondary'],
             fg=COLORS['accent']
@@ -0,0 +1,259 @@
+"""
+Tables de motifs de lignes précalculées
+
+Le contenu d'une ligne est codé en un entier qui indexe une table construite
+une seule fois, au lieu d'être reparcouru case par case à chaque évaluation :
+
+- lignes courtes (3x3, cube 4x4x4...) : code en base 3 (vide = 0, X = 1,
+  O = 2, la i-ème case de la ligne ayant le poids 3^i), tenu à jour coup
+  par coup par l'état de jeu ;
+- fenêtres du Gomoku : deux masques de bits (pions du joueur, cases
+  bloquées) des cases voisines d'une case vide.
+
+Les questions « quelle case gagne ? », « combien de menaces ? » ou « quel
+niveau de menace ? » deviennent des lectures de table. Les tables les plus
+longues à construire sont gardées dans un fichier de cache (PATTERNS_CONFIG).
+"""
+
+import os
+import struct
+from array import array
+from functools import lru_cache
+
+from config.settings import PATTERNS_CONFIG
+
+SYMBOL_VALUES = {'': 0, 'X': 1, 'O': 2}
+
+# Valeur d'une ligne libre de l'adversaire selon le nombre de pions posés
+LINE_SCORES = (0, 1, 10, 100, 1000, 10000)
+
+# Fichier de cache : magic, version des règles de classement, longueur gagnante, taille de la table
+CACHE_MAGIC = b'TTTPAT1\0'
+CACHE_VERSION = 1
+_CACHE_HEADER = struct.Struct('<8sHHI')
+
+# Niveaux de menace d'un coup dans une direction (Gomoku)
+NONE, TWO, OPEN_TWO, THREE, OPEN_THREE, FOUR, OPEN_FOUR, FIVE = range(8)
+
+
+class LineTable:
+    """Tables indexées par le code base 3 d'une ligne complète de length cases"""
+
+    def __init__(self, length):
+        self.length = length
+        self.pow3 = tuple(3 ** i for i in range(length))
+        self.size = 3 ** length
+        # Position de la case vide qui complète la ligne (-1 : aucune), par joueur
+        self.win_points = {'X': array('b', [-1]) * self.size, 'O': array('b', [-1]) * self.size}
+        # Nombre de pions de chaque joueur et valeur statique de la ligne pour X
+        self.counts = {'X': bytearray(self.size), 'O': bytearray(self.size)}
+        self.scores = array('i', bytes(4 * self.size))
+
+        for code in range(self.size):
+            digits = [code // p % 3 for p in self.pow3]
+            x_count, o_count = digits.count(1), digits.count(2)
+            self.counts['X'][code] = x_count
+            self.counts['O'][code] = o_count
+            if o_count == 0:
+                self.scores[code] = LINE_SCORES[x_count]
+            elif x_count == 0:
+                self.scores[code] = -LINE_SCORES[o_count]
+            if x_count + o_count == length - 1:
+                if o_count == 0:
+                    self.win_points['X'][code] = digits.index(0)
+                elif x_count == 0:
+                    self.win_points['O'][code] = digits.index(0)
+
+    def encode(self, symbols):
+        """Code base 3 d'une ligne donnée par ses symboles ('', 'X', 'O')"""
+        return sum(SYMBOL_VALUES[symbol] * weight for symbol, weight in zip(symbols, self.pow3))
+
+    def line_codes(self, cells, lines):
+        """
+        Codes de toutes les lignes d'une position
+
+        Args:
+            cells: Symboles des cases, à plat (indice de case -> symbole)
+            lines: Lignes gagnantes (tuples d'indices de cases, voir utils.winning_lines)
+
+        Returns:
+            list: Un code par ligne
+        """
+        return [self.encode(cells[cell] for cell in line) for line in lines]
+
+    def winning_cells(self, codes, lines, symbol):
+        """
+        Cases vides qui compléteraient une ligne pour symbol
+
+        Args:
+            codes: Code de chaque ligne
+            lines: Lignes correspondantes (tuples d'indices de cases)
+            symbol: 'X' ou 'O'
+
+        Returns:
+            set: Indices des cases gagnantes
+        """
+        points = self.win_points[symbol]
+        cells = set()
+        for line, code in enumerate(codes):
+            point = points[code]
+            if point >= 0:
+                cells.add(lines[line][point])
+        return cells
+
+    def score(self, codes):
+        """Évaluation statique de la position du point de vue de X (somme des lignes)"""
+        scores = self.scores
+        return sum(scores[code] for code in codes)
+
+
+@lru_cache(maxsize=None)
+def line_table(length):
+    """Tables des lignes de length cases (construites une fois par processus)"""
+    return LineTable(length)
+
+
+# --- Fenêtres du Gomoku : deux masques de bits -------------------------------
+
+def _bits(mask, window):
+    """Indices des bits à 1"""
+    return [i for i in range(window) if mask >> i & 1]
+
+
+class _ThreatClassifier:
+    """Classement des fenêtres de 2 * (win_length - 1) + 1 cases centrées sur le coup joué"""
+
+    def __init__(self, win_length):
+        self.win_length = win_length
+        self.reach = win_length - 1
+        self.window = 2 * self.reach + 1
+        self.run_masks = tuple(((1 << win_length) - 1) << shift
+                               for shift in range(self.window - win_length + 1))
+        self.memo = {}
+
+    def has_run(self, own):
+        """True si la fenêtre contient win_length pions consécutifs"""
+        return any(own & run == run for run in self.run_masks)
+
+    def four_level(self, own, empty):
+        """OPEN_FOUR, FOUR ou NONE selon le nombre de cases qui complètent l'alignement"""
+        points = sum(1 for e in _bits(empty, self.window) if self.has_run(own | 1 << e))
+        if points >= 2:
+            return OPEN_FOUR
+        return FOUR if points else NONE
+
+    def best_follow_up(self, own, empty, classify, promotions):
+        """Meilleur niveau atteint en ajoutant un pion, traduit par promotions (ex. quatre ouvert -> trois ouvert)"""
+        best = NONE
+        for e in _bits(empty, self.window):
+            best = max(best, promotions.get(classify(own | 1 << e, empty & ~(1 << e)), NONE))
+        return best
+
+    def classify(self, own, empty):
+        """Niveau de menace d'une fenêtre (pion posé au centre)"""
+        key = (own, empty)
+        if key not in self.memo:
+            if self.has_run(own):
+                level = FIVE
+            else:
+                level = self.four_level(own, empty)
+                # Trois : un pion de plus donne un quatre ; deux : un pion de plus donne un trois
+                if level == NONE:
+                    level = self.best_follow_up(own, empty, self.four_level,
+                                                {OPEN_FOUR: OPEN_THREE, FOUR: THREE})
+                if level == NONE:
+                    level = self.best_follow_up(own, empty, self.classify,
+                                                {OPEN_THREE: OPEN_TWO, THREE: TWO})
+            self.memo[key] = level
+        return self.memo[key]
+
+
+def build_threat_table(win_length=5):
+    """
+    Table des niveaux de menace : index (pions << side) | bloqués
+
+    pions et bloqués sont les 2 * (win_length - 1) cases voisines (win_length - 1
+    de chaque côté) occupées par le joueur et par l'adversaire ou le bord ;
+    le niveau est celui obtenu en posant un pion au centre.
+
+    Args:
+        win_length: Nombre de pions alignés pour gagner
+
+    Returns:
+        bytes: Niveau (NONE à FIVE) pour chaque index
+    """
+    classifier = _ThreatClassifier(win_length)
+    reach = classifier.reach
+    side = 2 * reach
+    low = (1 << reach) - 1
+    center = 1 << reach
+    full = (1 << classifier.window) - 1
+
+    def expand(mask):
+        # Fenêtre sans le centre -> fenêtre complète
+        return (mask & low) | ((mask & ~low) << 1)
+
+    table = bytearray(1 << (2 * side))
+    for own_side in range(1 << side):
+        own = expand(own_side) | center
+        for opp_side in range(1 << side):
+            if own_side & opp_side:
+                continue
+            empty = ~(own | expand(opp_side)) & full
+            table[own_side << side | opp_side] = classifier.classify(own, empty)
+    return bytes(table)
+
+
+def _cache_path(win_length):
+    """Fichier de cache de la table des menaces"""
+    return os.path.join(PATTERNS_CONFIG['cache_dir'], f"threats-{win_length}.bin")
+
+
+def _load_cached(path, win_length, size):
+    """Relit une table depuis le cache, ou None si absente ou périmée"""
+    try:
+        with open(path, 'rb') as source:
+            data = source.read()
+    except OSError:
+        return None
+    if len(data) != _CACHE_HEADER.size + size:
+        return None
+    if _CACHE_HEADER.unpack_from(data, 0) != (CACHE_MAGIC, CACHE_VERSION, win_length, size):
+        return None
+    return data[_CACHE_HEADER.size:]
+
+
+def _save_cached(path, win_length, table):
+    """Écrit une table dans le cache (un cache impossible à écrire n'est pas une erreur)"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as out:
+            out.write(_CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, win_length, len(table)))
+            out.write(table)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Cache des motifs non écrit ({path}): {e}")
+
+
+@lru_cache(maxsize=None)
+def threat_table(win_length=5):
+    """
+    Table des niveaux de menace, relue depuis le cache ou construite puis sauvegardée
+
+    Args:
+        win_length: Nombre de pions alignés pour gagner
+
+    Returns:
+        bytes: Table indexée comme build_threat_table
+    """
+    size = 1 << (4 * (win_length - 1))
+    use_cache = PATTERNS_CONFIG['use_cache']
+    if use_cache:
+        table = _load_cached(_cache_path(win_length), win_length, size)
+        if table is not None:
+            return table
+    table = build_threat_table(win_length)
+    if use_cache:
+        _save_cached(_cache_path(win_length), win_length, table)
+    return table
@@ -0,0 +1,348 @@
+"""
+Index des positions jouées, construit hors ligne depuis les journaux de parties
+
+Chaque position 3x3 est codée en base 3 (case vide = 0, X = 1, O = 2, case
+(row, col) au rang row * 3 + col, comme la grille de TicTacToeAI) puis réduite
+à sa forme canonique parmi les 8 symétries du plateau. Le fichier d'index est
+une table d'entiers 32 bits adressée directement par ce code : les requêtes
+lisent le fichier projeté en mémoire (mmap), sans copie ni relecture des
+journaux.
+
+La commande analyze parcourt tout l'index et repère, grâce aux tables de
+motifs de src.patterns, les coups humains qui ont manqué une victoire
+immédiate ou la parade d'une menace.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+from .game_log import iter_payloads, GameRecord
+from .patterns import line_table
+from .utils import winning_lines
+
+# En-tête : magic, nombre de positions, largeur d'un enregistrement, parties indexées
+INDEX_MAGIC = b'TTTIDX1\0'
+_HEADER = struct.Struct('<8sIIQ')
+
+SIZE = 3
+CELLS = SIZE * SIZE
+POSITIONS = 3 ** CELLS
+POW3 = [3 ** i for i in range(CELLS)]
+
+# Champs d'un enregistrement (entiers 32 bits)
+VISITS, X_WINS, O_WINS, DRAWS = range(4)
+MOVES = 4  # 9 compteurs de coups humains joués depuis la position
+RECORD_WIDTH = MOVES + CELLS
+
+SYMBOL_VALUES = {'': 0, 'X': 1, 'O': 2}
+_SYMBOLS = {0: '', 1: 'X', 2: 'O'}
+
+# Les 8 symétries du plateau : case d'origine -> case image
+_TRANSFORMS = [
+    lambda r, c: (r, c),
+    lambda r, c: (c, SIZE - 1 - r),
+    lambda r, c: (SIZE - 1 - r, SIZE - 1 - c),
+    lambda r, c: (SIZE - 1 - c, r),
+    lambda r, c: (r, SIZE - 1 - c),
+    lambda r, c: (SIZE - 1 - r, c),
+    lambda r, c: (c, r),
+    lambda r, c: (SIZE - 1 - c, SIZE - 1 - r),
+]
+SYMMETRIES = [
+    tuple(t(cell // SIZE, cell % SIZE)[0] * SIZE + t(cell // SIZE, cell % SIZE)[1] for cell in range(CELLS))
+    for t in _TRANSFORMS
+]
+# Permutation inverse de chaque symétrie (case image -> case d'origine)
+INVERSE_SYMMETRIES = [
+    tuple(perm.index(cell) for cell in range(CELLS)) for perm in SYMMETRIES
+]
+
+
+@lru_cache(maxsize=None)
+def canonical_tables():
+    """
+    Calcule pour chaque code de position sa forme canonique
+
+    Returns:
+        tuple: (canonique, symétrie) — deux listes indexées par code, où
+        symétrie est l'indice de la permutation qui mène à la forme canonique
+    """
+    canonical = [0] * POSITIONS
+    symmetry = [0] * POSITIONS
+    for code in range(POSITIONS):
+        digits = []
+        value = code
+        for _ in range(CELLS):
+            digits.append(value % 3)
+            value //= 3
+        best_code = None
+        best_sym = 0
+        for sym, perm in enumerate(SYMMETRIES):
+            image = 0
+            for cell, digit in enumerate(digits):
+                if digit:
+                    image += digit * POW3[perm[cell]]
+            if best_code is None or image < best_code:
+                best_code = image
+                best_sym = sym
+        canonical[code] = best_code
+        symmetry[code] = best_sym
+    return canonical, symmetry
+
+
+def encode_board(board):
+    """Code base 3 d'une grille 3x3 au format de TicTacToeAI"""
+    code = 0
+    for i in range(SIZE):
+        for j in range(SIZE):
+            value = SYMBOL_VALUES[board[i][j]]
+            if value:
+                code += value * POW3[i * SIZE + j]
+    return code
+
+
+def decode_board(code):
+    """Grille 3x3 correspondant à un code base 3"""
+    board = []
+    for i in range(SIZE):
+        row = []
+        for j in range(SIZE):
+            row.append(_SYMBOLS[code // POW3[i * SIZE + j] % 3])
+        board.append(row)
+    return board
+
+
+def canonicalize(board):
+    """
+    Retourne la forme canonique d'une grille
+
+    Returns:
+        tuple: (code canonique, indice de la symétrie appliquée)
+    """
+    canonical, symmetry = canonical_tables()
+    code = encode_board(board)
+    return canonical[code], symmetry[code]
+
+
+def build_index(log_paths, out_path, human_only=True):
+    """
+    Construit l'index des positions à partir de journaux de parties
+
+    Args:
+        log_paths: Chemins des journaux binaires (src.game_log)
+        out_path: Fichier d'index à écrire
+        human_only: En mode IA, ne compter que les coups du joueur humain (X)
+
+    Returns:
+        int: Nombre de parties indexées
+    """
+    canonical, symmetry = canonical_tables()
+    table = array('I', bytes(4 * POSITIONS * RECORD_WIDTH))
+    games = 0
+
+    for log_path in log_paths:
+        for payload in iter_payloads(log_path):
+            record = GameRecord.decode(payload)
+            if record.variant != 'classic' or record.board_size != SIZE:
+                continue
+
+            result_field = {'X': X_WINS, 'O': O_WINS, 'draw': DRAWS}.get(record.result)
+            code = 0
+            for ply, cell in enumerate(record.moves):
+                base = canonical[code] * RECORD_WIDTH
+                table[base + VISITS] += 1
+                if result_field is not None:
+                    table[base + result_field] += 1
+
+                # Coup joué depuis cette position, ramené dans le repère canonique
+                player_value = 1 if ply % 2 == 0 else 2
+                if not human_only or record.game_mode == 'pvp' or player_value == 1:
+                    table[base + MOVES + SYMMETRIES[symmetry[code]][cell]] += 1
+                code += player_value * POW3[cell]
+
+            # Position finale (sans coup joué)
+            base = canonical[code] * RECORD_WIDTH
+            table[base + VISITS] += 1
+            if result_field is not None:
+                table[base + result_field] += 1
+            games += 1
+
+    directory = os.path.dirname(out_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as out:
+        out.write(_HEADER.pack(INDEX_MAGIC, POSITIONS, RECORD_WIDTH, games))
+        if sys.byteorder != 'little':
+            table.byteswap()
+        table.tofile(out)
+    os.replace(tmp_path, out_path)
+    return games
+
+
+class PositionStats:
+    """Statistiques d'une position, exprimées dans le repère de la grille demandée"""
+
+    __slots__ = ('visits', 'x_wins', 'o_wins', 'draws', 'move_counts')
+
+    def __init__(self, visits, x_wins, o_wins, draws, move_counts):
+        self.visits = visits
+        self.x_wins = x_wins
+        self.o_wins = o_wins
+        self.draws = draws
+        self.move_counts = move_counts  # {(row, col): nombre de fois joué}
+
+    def win_rate(self, symbol):
+        """Proportion des parties passées par cette position gagnées par symbol"""
+        if not self.visits:
+            return 0.0
+        return (self.x_wins if symbol == 'X' else self.o_wins) / self.visits
+
+    def move_probabilities(self):
+        """Distribution des coups humains joués depuis cette position"""
+        total = sum(self.move_counts.values())
+        if not total:
+            return {}
+        return {move: count / total for move, count in self.move_counts.items()}
+
+
+class PositionIndex:
+    """Lecture de l'index des positions projeté en mémoire (accès sans copie)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, positions, width, self.games = _HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC or positions != POSITIONS or width != RECORD_WIDTH:
+            self.close()
+            raise ValueError(f"{path} n'est pas un index de positions valide")
+        if sys.byteorder != 'little':
+            self.close()
+            raise ValueError("L'index projeté en mémoire suppose une machine little-endian")
+        self._table = memoryview(self._mmap)[_HEADER.size:].cast('I')
+        self._canonical, self._symmetry = canonical_tables()
+
+    def lookup(self, board):
+        """
+        Statistiques de la position (toutes symétries confondues)
+
+        Args:
+            board: Grille 3x3 au format de TicTacToeAI
+
+        Returns:
+            PositionStats: Compteurs, coups exprimés dans le repère de board
+        """
+        code = encode_board(board)
+        base = self._canonical[code] * RECORD_WIDTH
+        table = self._table
+        perm = SYMMETRIES[self._symmetry[code]]
+        move_counts = {}
+        for cell in range(CELLS):
+            count = table[base + MOVES + perm[cell]]
+            if count:
+                move_counts[(cell // SIZE, cell % SIZE)] = count
+        return PositionStats(
+            table[base + VISITS], table[base + X_WINS],
+            table[base + O_WINS], table[base + DRAWS],
+            move_counts
+        )
+
+    def human_move_probabilities(self, board):
+        """Probabilités des coups humains depuis cette position ({(row, col): p})"""
+        return self.lookup(board).move_probabilities()
+
+    def close(self):
+        """Libère la projection mémoire"""
+        if getattr(self, '_table', None) is not None:
+            self._table.release()
+            self._table = None
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def analyze_index(index):
+    """
+    Bilan tactique des coups humains enregistrés dans l'index
+
+    Pour chaque position (canonique) visitée, les cases gagnantes de chaque
+    joueur sont lues dans les tables de motifs à partir des codes des 8
+    lignes ; un coup joué hors de ces cases alors qu'une victoire ou une
+    parade s'imposait est compté comme une erreur.
+
+    Args:
+        index: PositionIndex ouvert
+
+    Returns:
+        dict: positions, moves, missed_wins, missed_blocks
+    """
+    patterns = line_table(SIZE)
+    lines = winning_lines(SIZE)
+    table = index._table
+    summary = {'positions': 0, 'moves': 0, 'missed_wins': 0, 'missed_blocks': 0}
+
+    for code in range(POSITIONS):
+        base = code * RECORD_WIDTH
+        if not table[base + VISITS]:
+            continue
+        summary['positions'] += 1
+        move_counts = {cell: table[base + MOVES + cell] for cell in range(CELLS) if table[base + MOVES + cell]}
+        if not move_counts:
+            continue
+
+        cells = [_SYMBOLS[code // POW3[cell] % 3] for cell in range(CELLS)]
+        codes = patterns.line_codes(cells, lines)
+        to_move = 'X' if cells.count('X') == cells.count('O') else 'O'
+        wins = patterns.winning_cells(codes, lines, to_move)
+        blocks = patterns.winning_cells(codes, lines, 'O' if to_move == 'X' else 'X')
+
+        for cell, count in move_counts.items():
+            summary['moves'] += count
+            if wins:
+                if cell not in wins:
+                    summary['missed_wins'] += count
+            elif blocks and cell not in blocks:
+                summary['missed_blocks'] += count
+    return summary
+
+
+def parse_board(text):
+    """Convertit une chaîne de 9 caractères (X, O, . ou -) en grille 3x3"""
+    cells = [('' if ch in '.-_ ' else ch.upper()) for ch in text]
+    if len(cells) != CELLS or any(cell not in SYMBOL_VALUES for cell in cells):
+        raise ValueError(f"Position invalide: {text!r}")
+    return [cells[i * SIZE:(i + 1) * SIZE] for i in range(SIZE)]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 4 and sys.argv[1] == 'build':
+        indexed = build_index(sys.argv[3:], sys.argv[2])
+        print(f"✓ {indexed} parties indexées dans {sys.argv[2]}")
+    elif len(sys.argv) == 4 and sys.argv[1] == 'query':
+        with PositionIndex(sys.argv[2]) as index:
+            board = parse_board(sys.argv[3])
+            stats = index.lookup(board)
+            print(f"Position vue {stats.visits} fois (X: {stats.x_wins}, O: {stats.o_wins}, nuls: {stats.draws})")
+            for (row, col), p in sorted(stats.move_probabilities().items(), key=lambda item: -item[1]):
+                print(f"  ({row}, {col}) : {p:.1%}")
+    elif len(sys.argv) == 3 and sys.argv[1] == 'analyze':
+        with PositionIndex(sys.argv[2]) as index:
+            summary = analyze_index(index)
+        print(f"📊 {summary['positions']} positions, {summary['moves']} coups analysés")
+        print(f"  Victoires manquées : {summary['missed_wins']}")
+        print(f"  Parades manquées : {summary['missed_blocks']}")
+    else:
+        print("Usage: python -m src.position_index build <index> <journal>...")
+        print("       python -m src.position_index query <index> <XO.......>")
+        print("       python -m src.position_index analyze <index>")
+        sys.exit(1)
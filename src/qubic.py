@@ -0,0 +1,301 @@
+"""
+Qubic : Tic Tac Toe en 3D sur un cube 4x4x4
+
+Les 76 lignes gagnantes et l'appartenance des cases aux lignes viennent
+des tables de utils (les mêmes que check_winner). Chaque joueur a un
+bitboard de 64 bits ; les compteurs par ligne sont tenus à jour coup par
+coup : un coup ne touche que les 4 à 7 lignes de sa case.
+
+La grille exposée à GameLogic est une pile de 4 couches 4x4 : la ligne
+layer * 4 + row et la colonne col désignent la case layer * 16 + row * 4 + col.
+"""
+
+from .utils import ReplayableRandom, winning_lines, cell_lines, zobrist_keys, switch_player
+from .search_stats import SearchInstrumentation
+from config.settings import QUBIC_CONFIG
+
+SIZE = 4
+CELL_COUNT = SIZE ** 3
+LINES = winning_lines(SIZE, 3)
+CELL_LINES = cell_lines(SIZE, 3)
+LINE_MASKS = tuple(sum(1 << cell for cell in line) for line in LINES)
+FULL_MASK = (1 << CELL_COUNT) - 1
+MOVE_KEYS = zobrist_keys(SIZE, 3)
+
+# Valeur d'une ligne selon le nombre de pions : attaque (lignes libres de l'adversaire) et défense
+ATTACK_WEIGHTS = (1, 4, 32, 0, 0)
+DEFENSE_WEIGHTS = (0, 3, 24, 0, 0)
+
+
+class QubicState:
+    """Cube 4x4x4 joué/annulé en place (interface de BoardState)"""
+
+    size = SIZE
+
+    def __init__(self):
+        self.grid = [["" for _ in range(SIZE)] for _ in range(SIZE * SIZE)]  # 4 couches de 4 lignes
+        self.bits = {'X': 0, 'O': 0}  # Bitboards 64 bits
+        self.counts = {'X': [0] * len(LINES), 'O': [0] * len(LINES)}
+        self.filled = 0
+        self.winner = None
+        self.winning_line = None
+        self.key = 0
+
+    def copy(self):
+        """Copie indépendante (recherche de l'IA sans toucher la partie)"""
+        other = QubicState.__new__(QubicState)
+        other.grid = [row[:] for row in self.grid]
+        other.bits = dict(self.bits)
+        other.counts = {symbol: counts[:] for symbol, counts in self.counts.items()}
+        other.filled = self.filled
+        other.winner = self.winner
+        other.winning_line = self.winning_line
+        other.key = self.key
+        return other
+
+    def occupied(self):
+        """Bitboard des cases occupées"""
+        return self.bits['X'] | self.bits['O']
+
+    def make_move(self, cell, symbol):
+        """
+        Pose un symbole sur une case du cube
+
+        Args:
+            cell: Indice de case (layer * 16 + row * 4 + col)
+            symbol: 'X' ou 'O'
+
+        Returns:
+            bool: True si le coup complète une ligne
+        """
+        self.bits[symbol] |= 1 << cell
+        self.grid[cell // SIZE][cell % SIZE] = symbol
+        self.filled += 1
+        self.key ^= MOVE_KEYS[symbol][cell]
+        counts = self.counts[symbol]
+        won = False
+        for line in CELL_LINES[cell]:
+            counts[line] += 1
+            if counts[line] == SIZE:
+                won = True
+                self.winning_line = line
+        if won:
+            self.winner = symbol
+        return won
+
+    def unmake_move(self, cell):
+        """Retire le symbole d'une case (la partie ne peut être gagnée qu'au dernier coup)"""
+        symbol = self.grid[cell // SIZE][cell % SIZE]
+        self.bits[symbol] &= ~(1 << cell)
+        self.grid[cell // SIZE][cell % SIZE] = ""
+        self.filled -= 1
+        self.key ^= MOVE_KEYS[symbol][cell]
+        counts = self.counts[symbol]
+        for line in CELL_LINES[cell]:
+            counts[line] -= 1
+        self.winner = None
+        self.winning_line = None
+
+    def make(self, row, col, symbol):
+        """Joue un coup en coordonnées de la pile de couches (interface BoardState)"""
+        return self.make_move(row * SIZE + col, symbol)
+
+    def unmake(self, row, col):
+        """Annule le coup de la case (row, col)"""
+        self.unmake_move(row * SIZE + col)
+
+    def is_legal(self, row, col):
+        """Retourne True si la case (row, col) peut être jouée"""
+        return self.winner is None and self.grid[row][col] == ""
+
+    def is_full(self):
+        """Retourne True si les 64 cases sont occupées"""
+        return self.filled == CELL_COUNT
+
+    def legal_moves(self):
+        """Retourne les indices des cases libres"""
+        free = ~self.occupied() & FULL_MASK
+        moves = []
+        while free:
+            low = free & -free
+            moves.append(low.bit_length() - 1)
+            free ^= low
+        return moves
+
+    def empty_cells(self):
+        """Retourne les cases libres sous forme de (row, col)"""
+        return [divmod(cell, SIZE) for cell in self.legal_moves()]
+
+    def threats(self, symbol, cells=None):
+        """
+        Cases qui donneraient la victoire immédiate à symbol
+
+        Args:
+            symbol: 'X' ou 'O'
+            cells: Ne regarder que les lignes de ces cases (None : les 76 lignes)
+
+        Returns:
+            set: Indices des cases gagnantes
+        """
+        mine, theirs = self.counts[symbol], self.counts[switch_player(symbol)]
+        occupied = self.occupied()
+        if cells is None:
+            lines = range(len(LINES))
+        else:
+            lines = {line for cell in cells for line in CELL_LINES[cell]}
+        winning = set()
+        for line in lines:
+            if mine[line] == SIZE - 1 and theirs[line] == 0:
+                free = LINE_MASKS[line] & ~occupied
+                winning.add(free.bit_length() - 1)
+        return winning
+
+    def get_winning_positions(self):
+        """Retourne les positions (row, col) de la ligne gagnante ou None"""
+        if self.winning_line is None:
+            return None
+        return [divmod(cell, SIZE) for cell in LINES[self.winning_line]]
+
+
+class QubicAI(SearchInstrumentation):
+    """
+    IA de Qubic : victoire et parade immédiates, recherche de menaces
+    forcées (suites de 3-alignements jusqu'à une double menace), puis
+    évaluation des lignes de chaque case libre
+    """
+
+    def __init__(self, difficulty='hard', player_symbol='O', seed=None):
+        self.difficulty = difficulty
+        self.player_symbol = player_symbol
+        self.human_symbol = switch_player(player_symbol)
+        self.move_count = 0
+        self.rng = ReplayableRandom(seed)
+        self.threat_depth = QUBIC_CONFIG['threat_depth'][difficulty]
+
+    def reseed(self, seed):
+        """Réinitialise le générateur aléatoire de l'IA avec une graine donnée"""
+        self.rng.seed(seed)
+
+    def reset_game(self):
+        """Réinitialise l'état de l'IA pour une nouvelle partie"""
+        self.move_count = 0
+
+    def get_thinking_time(self):
+        """Délai d'affichage avant le coup"""
+        return 0.4
+
+    def get_move(self, state):
+        """
+        Retourne le coup de l'IA
+
+        Args:
+            state: QubicState de la partie (non modifié)
+
+        Returns:
+            tuple: (row, col) dans la pile de couches
+        """
+        self.move_count += 1
+        started = self._begin_stats()
+        cell = self._choose(state.copy())
+        move = divmod(cell, SIZE) if cell is not None else None
+        self._end_stats(started, move)
+        return move
+
+    def _choose(self, state):
+        """Choisit la case à jouer"""
+        me, opponent = self.player_symbol, self.human_symbol
+        if not state.legal_moves():
+            return None
+
+        wins = state.threats(me)
+        if wins:
+            return min(wins)
+        blocks = state.threats(opponent)
+        if blocks:
+            return max(blocks, key=lambda cell: self._score_cell(state, cell, me))
+
+        if self.threat_depth:
+            forcing = self._timed('threat_search', self._forcing_win, state, me, opponent, self.threat_depth)
+            if forcing is not None:
+                return forcing
+            # Couper la suite forcée de l'adversaire à sa première case
+            danger = self._timed('threat_search', self._forcing_win, state, opponent, me, self.threat_depth)
+            if danger is not None:
+                return danger
+
+        return self._timed('evaluation', self._best_positional, state, me)
+
+    def _forcing_win(self, state, attacker, defender, depth):
+        """
+        Cherche une suite de menaces forcées menant à une double menace
+
+        Chaque coup de l'attaquant crée un 3-alignement ; le défenseur est
+        obligé de parer sur la case restante. La recherche ne suit que ces
+        coups forcés, ce qui la garde rapide malgré les 64 cases.
+
+        Args:
+            state: Position jouée/annulée en place
+            attacker: Joueur qui enchaîne les menaces
+            defender: Joueur obligé de parer
+            depth: Nombre de menaces encore autorisées
+
+        Returns:
+            int: Première case de la suite gagnante, ou None
+        """
+        if depth == 0:
+            return None
+        stats = self._stats
+        occupied = state.occupied()
+        attacker_counts, defender_counts = state.counts[attacker], state.counts[defender]
+
+        # Cases qui créent au moins un 3-alignement sur une ligne libre du défenseur
+        candidates = set()
+        for line, mask in enumerate(LINE_MASKS):
+            if attacker_counts[line] == SIZE - 2 and defender_counts[line] == 0:
+                free = mask & ~occupied
+                while free:
+                    low = free & -free
+                    candidates.add(low.bit_length() - 1)
+                    free ^= low
+
+        for cell in sorted(candidates):
+            if stats is not None:
+                stats.nodes += 1
+            state.make_move(cell, attacker)
+            threats = state.threats(attacker, (cell,))
+            found = False
+            if len(threats) >= 2 and not state.threats(defender):
+                found = True
+            elif len(threats) == 1:
+                block = next(iter(threats))
+                # La parade ne doit pas donner au défenseur sa propre menace de victoire
+                defender_wins = state.make_move(block, defender)
+                if not defender_wins and not state.threats(defender, (block,)):
+                    found = self._forcing_win(state, attacker, defender, depth - 1) is not None
+                state.unmake_move(block)
+            state.unmake_move(cell)
+            if found:
+                return cell
+        return None
+
+    def _best_positional(self, state, symbol):
+        """Case libre la mieux placée selon les lignes qui la traversent"""
+        best_cells, best_score = [], -1
+        for cell in state.legal_moves():
+            score = self._score_cell(state, cell, symbol)
+            if score > best_score:
+                best_cells, best_score = [cell], score
+            elif score == best_score:
+                best_cells.append(cell)
+        return self.rng.choice(best_cells)
+
+    def _score_cell(self, state, cell, symbol):
+        """Somme des valeurs d'attaque et de défense des lignes d'une case"""
+        mine, theirs = state.counts[symbol], state.counts[switch_player(symbol)]
+        score = 0
+        for line in CELL_LINES[cell]:
+            if theirs[line] == 0:
+                score += ATTACK_WEIGHTS[mine[line]]
+            if mine[line] == 0:
+                score += DEFENSE_WEIGHTS[theirs[line]]
+        return score
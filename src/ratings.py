@@ -0,0 +1,342 @@
+"""
+Classements Glicko des joueurs et des configurations de l'IA
+
+Chaque profil humain et chaque configuration de l'IA (moteur, niveau,
+budget de recherche) est une entité classée séparément, dans la réserve de
+sa variante : un classement de Gomoku ne se compare pas à un classement de
+Tic Tac Toe. On peut ainsi situer « difficile mais battable » sur la même
+échelle que les joueurs, et proposer au matchmaking du serveur l'IA dont le
+classement est le plus proche de celui du joueur.
+
+Mise à jour Glicko après chaque partie, en O(1) : les deux entités sont
+mises à jour avec les valeurs d'avant la partie. L'écart type (RD) grandit
+avec l'inactivité (rd_growth points par jour) et diminue avec les parties
+jouées.
+
+Les classements sont gardés en mémoire et écrits par lots dans la base
+SQLite des statistiques (table ratings). Le journal des parties peut être
+rejoué en un seul passage (recompute) ou suivi au fil de l'eau (sync_log).
+Le journal ne nomme pas les joueurs : X y est le profil donné, et les
+parties entre joueurs humains n'y sont pas classées.
+
+Usage: python -m src.ratings data/games.log [--profile joueur] [--recompute] [--top 20]
+"""
+
+import argparse
+import math
+import sqlite3
+import time
+
+from .game import VARIANTS
+from .game_log import iter_payloads, GameRecord
+from .stats_store import get_connection
+from config.settings import RATINGS_CONFIG, STATS_CONFIG, GAME_LOG_CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ratings (
+    variant TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    rating REAL NOT NULL,
+    rd REAL NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (variant, entity)
+);
+CREATE TABLE IF NOT EXISTS rating_sources (
+    source TEXT PRIMARY KEY,
+    records INTEGER NOT NULL
+);
+"""
+
+_Q = math.log(10) / 400
+_DAY = 86400.0
+
+
+def human_entity(name):
+    """Entité classée d'un profil humain"""
+    return f"human:{name}"
+
+
+def ai_entity(variant='classic', level='hard', budget=None):
+    """
+    Entité classée d'une configuration de l'IA
+
+    Args:
+        variant: Variante (le moteur est l'IA de VARIANTS)
+        level: Niveau de l'IA
+        budget: Budget de recherche (ex. '500ms'), si différent de celui de la configuration
+    """
+    entity = f"ai:{VARIANTS[variant][1].__name__}:{level}"
+    return f"{entity}:{budget}" if budget else entity
+
+
+def _g(rd):
+    """Atténuation de l'écart de classement par l'incertitude de l'adversaire"""
+    return 1 / math.sqrt(1 + 3 * (_Q * rd) ** 2 / math.pi ** 2)
+
+
+class Rating:
+    """Classement d'une entité dans une variante"""
+
+    __slots__ = ('rating', 'rd', 'games', 'wins', 'losses', 'draws', 'updated_at')
+
+    def __init__(self, rating, rd, games=0, wins=0, losses=0, draws=0, updated_at=0.0):
+        self.rating = rating
+        self.rd = rd  # Écart type du classement
+        self.games = games
+        self.wins = wins
+        self.losses = losses
+        self.draws = draws
+        self.updated_at = updated_at  # Fin de la dernière partie classée
+
+    def current_rd(self, now):
+        """Écart type à la date donnée (il grandit avec l'inactivité)"""
+        if not self.games:
+            return self.rd
+        days = max(0.0, now - self.updated_at) / _DAY
+        return min(RATINGS_CONFIG['initial_rd'],
+                   math.sqrt(self.rd ** 2 + RATINGS_CONFIG['rd_growth'] ** 2 * days))
+
+    def expected(self, other, now):
+        """Score attendu contre un autre classement (0 à 1)"""
+        return 1 / (1 + 10 ** (-_g(other.current_rd(now)) * (self.rating - other.rating) / 400))
+
+    def to_dict(self):
+        """Résumé sérialisable en JSON"""
+        return {'rating': round(self.rating, 1), 'rd': round(self.rd, 1), 'games': self.games,
+                'wins': self.wins, 'losses': self.losses, 'draws': self.draws}
+
+
+class RatingStore:
+    """Classements en mémoire, écrits par lots dans la base des statistiques"""
+
+    def __init__(self, path=None, batch_size=None):
+        """
+        Args:
+            path: Base SQLite (celle des statistiques) ; None pour des classements en mémoire seulement
+            batch_size: Parties classées avant écriture (RATINGS_CONFIG par défaut)
+        """
+        self.path = path
+        self.batch_size = batch_size or RATINGS_CONFIG['batch_size']
+        self._ratings = {}  # (variante, entité) -> Rating
+        self._dirty = set()
+        self._games = 0  # Parties classées depuis la dernière écriture
+        self._sources = {}  # Journal -> enregistrements déjà classés (sans base)
+        self._conn = self._lock = None
+        if path is not None:
+            self._conn, self._lock = get_connection(path)
+            with self._lock:
+                self._conn.executescript(_SCHEMA)
+                rows = self._conn.execute(
+                    "SELECT variant, entity, rating, rd, games, wins, losses, draws, updated_at FROM ratings"
+                ).fetchall()
+            for variant, entity, *values in rows:
+                self._ratings[(variant, entity)] = Rating(*values)
+
+    def get(self, entity, variant='classic'):
+        """Classement d'une entité (valeurs initiales si elle n'a jamais joué)"""
+        rating = self._ratings.get((variant, entity))
+        if rating is None:
+            rating = Rating(RATINGS_CONFIG['initial_rating'], RATINGS_CONFIG['initial_rd'])
+        return rating
+
+    def _entry(self, variant, entity):
+        """Classement modifiable d'une entité (créé à sa première partie)"""
+        rating = self._ratings.get((variant, entity))
+        if rating is None:
+            rating = self._ratings[(variant, entity)] = self.get(entity, variant)
+        return rating
+
+    def record(self, x_entity, o_entity, result, variant='classic', ended_at=None):
+        """
+        Classe une partie terminée (les deux entités, en O(1))
+
+        Args:
+            x_entity: Entité qui jouait X
+            o_entity: Entité qui jouait O
+            result: 'X', 'O' ou 'draw'
+            variant: Variante de la partie
+            ended_at: Fin de la partie (maintenant par défaut)
+
+        Returns:
+            tuple: (Rating de X, Rating de O) après la partie
+        """
+        if x_entity == o_entity:
+            raise ValueError(f"{x_entity} ne peut pas être classé contre lui-même")
+        now = time.time() if ended_at is None else ended_at
+        x, o = self._entry(variant, x_entity), self._entry(variant, o_entity)
+        score = 1.0 if result == 'X' else 0.0 if result == 'O' else 0.5
+        x_rd, o_rd = x.current_rd(now), o.current_rd(now)
+        x_expected, o_expected = x.expected(o, now), o.expected(x, now)
+        # Les deux mises à jour partent des valeurs d'avant la partie
+        x_update = self._update(x.rating, x_rd, o_rd, x_expected, score)
+        o_update = self._update(o.rating, o_rd, x_rd, o_expected, 1.0 - score)
+        for rating, (value, rd), own_score in ((x, x_update, score), (o, o_update, 1.0 - score)):
+            rating.rating, rating.rd = value, rd
+            rating.games += 1
+            if own_score == 1.0:
+                rating.wins += 1
+            elif own_score == 0.0:
+                rating.losses += 1
+            else:
+                rating.draws += 1
+            rating.updated_at = now
+        self._dirty.add((variant, x_entity))
+        self._dirty.add((variant, o_entity))
+        self._games += 1
+        if self._games >= self.batch_size:
+            self.flush()
+        return x, o
+
+    @staticmethod
+    def _update(rating, rd, opponent_rd, expected, score):
+        """Nouveau (classement, écart type) après une partie (formules de Glicko)"""
+        g = _g(opponent_rd)
+        d2 = 1 / (_Q ** 2 * g ** 2 * expected * (1 - expected))
+        precision = 1 / rd ** 2 + 1 / d2
+        rating += _Q / precision * g * (score - expected)
+        return rating, max(RATINGS_CONFIG['min_rd'], math.sqrt(1 / precision))
+
+    def record_game(self, record, profile=None):
+        """
+        Classe une partie du journal (GameRecord)
+
+        Returns:
+            bool: False si la partie n'est pas classée (abandonnée, ou entre joueurs humains)
+        """
+        if record.result is None or record.game_mode != 'ai':
+            return False
+        self.record(human_entity(profile or STATS_CONFIG['profile']),
+                    ai_entity(record.variant, record.ai_level),
+                    record.result, record.variant, record.ended_at)
+        return True
+
+    def sync_log(self, log_path, profile=None):
+        """
+        Classe les parties ajoutées au journal depuis le dernier appel (lecture en flux)
+
+        Returns:
+            int: Parties classées
+        """
+        done = self._source_records(log_path)
+        count = ranked = 0
+        for payload in iter_payloads(log_path):
+            count += 1
+            if count > done and self.record_game(GameRecord.decode(payload), profile):
+                ranked += 1
+        self._set_source_records(log_path, count)
+        self.flush()
+        return ranked
+
+    def recompute(self, log_path, profile=None):
+        """
+        Recalcule tous les classements en rejouant le journal en un seul passage
+
+        Returns:
+            int: Parties classées
+        """
+        self._ratings = {}
+        self._dirty = set()
+        self._sources = {}
+        if self._conn is not None:
+            with self._lock:
+                self._conn.execute("DELETE FROM ratings")
+                self._conn.execute("DELETE FROM rating_sources")
+        return self.sync_log(log_path, profile)
+
+    def _source_records(self, source):
+        """Enregistrements d'un journal déjà classés"""
+        if self._conn is None:
+            return self._sources.get(source, 0)
+        with self._lock:
+            row = self._conn.execute("SELECT records FROM rating_sources WHERE source = ?",
+                                     (source,)).fetchone()
+        return row[0] if row else 0
+
+    def _set_source_records(self, source, records):
+        """Retient le nombre d'enregistrements classés d'un journal"""
+        if self._conn is None:
+            self._sources[source] = records
+            return
+        with self._lock:
+            self._conn.execute("INSERT INTO rating_sources (source, records) VALUES (?, ?)"
+                               " ON CONFLICT (source) DO UPDATE SET records = excluded.records",
+                               (source, records))
+
+    def leaderboard(self, variant='classic', limit=None):
+        """
+        Entités d'une variante, de la mieux classée à la moins bien classée
+
+        Returns:
+            list: Tuples (entité, Rating)
+        """
+        rows = sorted(((entity, rating) for (pool, entity), rating in self._ratings.items()
+                       if pool == variant), key=lambda row: -row[1].rating)
+        return rows[:limit] if limit else rows
+
+    def variants(self):
+        """Variantes ayant des parties classées"""
+        return sorted({variant for variant, _ in self._ratings})
+
+    def flush(self):
+        """Écrit en une transaction les classements modifiés"""
+        self._games = 0
+        if self._conn is None or not self._dirty:
+            self._dirty = set()
+            return
+        dirty, self._dirty = self._dirty, set()
+        rows = []
+        for variant, entity in dirty:
+            r = self._ratings[(variant, entity)]
+            rows.append((variant, entity, r.rating, r.rd, r.games, r.wins, r.losses, r.draws, r.updated_at))
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO ratings (variant, entity, rating, rd, games, wins, losses, draws, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (variant, entity) DO UPDATE SET"
+                    " rating = excluded.rating, rd = excluded.rd, games = excluded.games,"
+                    " wins = excluded.wins, losses = excluded.losses, draws = excluded.draws,"
+                    " updated_at = excluded.updated_at", rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                self._dirty |= dirty  # Nouvelle tentative à la prochaine écriture
+                print(f"⚠️ Erreur d'écriture des classements: {e}")
+
+    def close(self):
+        """Écrit les classements en attente (la connexion partagée reste ouverte)"""
+        self.flush()
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : classe le journal puis affiche les classements"""
+    parser = argparse.ArgumentParser(description="Classements Glicko des joueurs et de l'IA")
+    parser.add_argument('log', nargs='?', default=GAME_LOG_CONFIG['path'], help="journal des parties")
+    parser.add_argument('--db', default=STATS_CONFIG['path'], help="base SQLite des classements")
+    parser.add_argument('--profile', default=STATS_CONFIG['profile'], help="profil qui jouait X")
+    parser.add_argument('--recompute', action='store_true', help="recalculer depuis le début du journal")
+    parser.add_argument('--top', type=int, default=20, help="entités affichées par variante")
+    args = parser.parse_args(argv)
+
+    store = RatingStore(args.db)
+    started = time.perf_counter()
+    if args.recompute:
+        ranked = store.recompute(args.log, args.profile)
+    else:
+        ranked = store.sync_log(args.log, args.profile)
+    print(f"✓ {ranked} parties classées en {time.perf_counter() - started:.2f}s")
+    for variant in store.variants():
+        print(f"🏆 {variant}")
+        for entity, rating in store.leaderboard(variant, args.top):
+            print(f"   {rating.rating:7.1f} ±{rating.rd:5.1f}  {entity:<32} "
+                  f"{rating.wins}V {rating.losses}D {rating.draws}N")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Compteurs d'instrumentation de la recherche des IA
+
+Un SearchStats est rempli pendant un appel à get_move lorsque
+l'instrumentation est activée : nœuds visités, coupures alpha-beta, succès
+de cache, profondeur atteinte, score du coup choisi (quand la recherche
+en calcule un) et temps passé dans chaque phase.
+"""
+
+import time
+
+
+class SearchStats:
+    """Compteurs d'un appel de recherche (ou cumul de plusieurs appels)"""
+
+    __slots__ = ('calls', 'nodes', 'cutoffs', 'cache_hits', 'max_depth',
+                 'phase_times', 'phase_calls', 'total_time', 'move', 'score')
+
+    def __init__(self):
+        self.calls = 0
+        self.nodes = 0
+        self.cutoffs = 0
+        self.cache_hits = 0
+        self.max_depth = 0
+        self.phase_times = {}  # phase -> secondes
+        self.phase_calls = {}  # phase -> nombre d'appels
+        self.total_time = 0.0
+        self.move = None  # Coup retourné (dernier appel)
+        self.score = None  # Score du coup pour le joueur au trait, si la recherche l'a évalué
+
+    def add_phase(self, phase, elapsed):
+        """Ajoute le temps passé dans une phase de la recherche"""
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + elapsed
+        self.phase_calls[phase] = self.phase_calls.get(phase, 0) + 1
+
+    def accumulate(self, other):
+        """Ajoute les compteurs d'un autre SearchStats (cumul sur une session)"""
+        self.calls += other.calls
+        self.nodes += other.nodes
+        self.cutoffs += other.cutoffs
+        self.cache_hits += other.cache_hits
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.total_time += other.total_time
+        self.move = other.move
+        self.score = other.score
+        for phase, elapsed in other.phase_times.items():
+            self.phase_times[phase] = self.phase_times.get(phase, 0.0) + elapsed
+            self.phase_calls[phase] = self.phase_calls.get(phase, 0) + other.phase_calls.get(phase, 0)
+
+    def nodes_per_second(self):
+        """Débit de la recherche en nœuds par seconde"""
+        return self.nodes / self.total_time if self.total_time > 0 else 0.0
+
+    def as_dict(self):
+        """Retourne les compteurs sous forme de dictionnaire (JSON, journaux)"""
+        return {
+            'calls': self.calls,
+            'nodes': self.nodes,
+            'cutoffs': self.cutoffs,
+            'cache_hits': self.cache_hits,
+            'max_depth': self.max_depth,
+            'total_time': self.total_time,
+            'phase_times': dict(self.phase_times),
+            'phase_calls': dict(self.phase_calls),
+            'move': self.move,
+            'score': self.score,
+        }
+
+    def __repr__(self):
+        phases = ", ".join(f"{phase}={elapsed * 1000:.2f}ms" for phase, elapsed in self.phase_times.items())
+        return (f"SearchStats(nodes={self.nodes}, cutoffs={self.cutoffs}, cache_hits={self.cache_hits}, "
+                f"depth={self.max_depth}, time={self.total_time * 1000:.2f}ms, {phases})")
+
+
+class SearchInstrumentation:
+    """
+    Mixin d'instrumentation opt-in pour les IA
+
+    Désactivée, elle ne coûte qu'un test `self._stats is not None` aux points
+    de mesure. Activée, chaque get_move produit un SearchStats lisible via
+    last_stats, cumulé dans total_stats et transmis au callback éventuel.
+    """
+
+    _stats = None
+    _stats_callback = None
+    last_stats = None
+    total_stats = None
+
+    def enable_stats(self, callback=None):
+        """
+        Active l'instrumentation de la recherche
+
+        Args:
+            callback: Fonction appelée avec le SearchStats de chaque get_move
+        """
+        self._stats_enabled = True
+        self._stats_callback = callback
+        if self.total_stats is None:
+            self.total_stats = SearchStats()
+
+    def disable_stats(self):
+        """Désactive l'instrumentation (coût quasi nul)"""
+        self._stats_enabled = False
+        self._stats_callback = None
+        self._stats = None
+
+    def stats_enabled(self):
+        """Retourne True si l'instrumentation est active"""
+        return getattr(self, '_stats_enabled', False)
+
+    def _begin_stats(self):
+        """Démarre la mesure d'un appel ; retourne l'instant de départ ou None"""
+        if not getattr(self, '_stats_enabled', False):
+            return None
+        self._stats = SearchStats()
+        self._stats.calls = 1
+        return time.perf_counter()
+
+    def _end_stats(self, started, move):
+        """Termine la mesure d'un appel et la publie"""
+        if started is None:
+            return
+        stats = self._stats
+        self._stats = None
+        stats.total_time = time.perf_counter() - started
+        stats.move = move
+        self.last_stats = stats
+        self.total_stats.accumulate(stats)
+        if self._stats_callback is not None:
+            self._stats_callback(stats)
+
+    def _timed(self, phase, func, *args):
+        """Appelle une phase de la recherche en mesurant sa durée si l'instrumentation est active"""
+        stats = self._stats
+        if stats is None:
+            return func(*args)
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            stats.add_phase(phase, time.perf_counter() - started)
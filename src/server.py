@@ -0,0 +1,708 @@
+"""
+Serveur de parties local : beaucoup de sessions GameLogic dans un seul processus
+
+Boucle asyncio sur TCP (localhost par défaut), protocole JSON par lignes :
+chaque requête est un objet sur une ligne, chaque réponse reprend son id.
+
+    {"id": 1, "op": "new", "mode": "ai", "level": "hard", "variant": "classic"}
+    -> {"id": 1, "ok": true, "session": "...", "state": {...}}
+    {"id": 2, "op": "move", "session": "...", "row": 1, "col": 1}
+    -> {"id": 2, "ok": true, "result": {...}, "cell": 4, "player": "O", "scores": {...}}
+    {"id": 3, "op": "ai_move", "session": "..."}
+    -> {"id": 3, "ok": true, "move": [0, 0], "result": {...}, "cell": 0, ...}
+
+Opérations : new, move, ai_move, undo, redo, restart, reset_scores, state,
+spectate, unspectate, queue, unqueue, rating, close, stats. En cas d'erreur :
+{"id": ..., "ok": false, "error": "..."}.
+
+spectate abonne la connexion à une partie : la réponse porte l'état
+complet, puis des lignes d'évènements sans id suivent chaque coup (voir
+src.broadcast).
+
+queue met la connexion en attente d'un adversaire (src.matchmaking) ; la
+réponse arrive quand la partie est créée, avec la place du joueur :
+
+    {"id": 4, "op": "queue", "rating": 1480, "variant": "classic"}
+    -> {"id": 4, "ok": true, "session": "...", "seat": "...", "symbol": "X", "opponent": "human", ...}
+
+Dans une partie appariée, chaque requête porte le jeton seat : seul le
+joueur dont c'est le tour peut jouer, et les coups ne s'annulent pas.
+Chacun suit les coups de l'autre avec spectate. Un joueur qui donne son
+profil (player) est classé (src.ratings) : son classement remplace rating
+dans la file, et chaque partie terminée met à jour celui des deux camps.
+{"op": "rating", "player": "...", "variant": "..."} retourne un classement.
+
+Les sessions sont sauvegardées dans un instantané binaire
+(SERVER_CONFIG['snapshot_path'], voir src.session_store) toutes les
+snapshot_interval secondes et à l'arrêt. Au démarrage, une session de
+l'instantané n'est recréée qu'à sa première requête : les clients
+reprennent leur partie avec le même identifiant.
+
+Le serveur fait autorité : chaque coup passe par GameLogic.make_move, un
+client ne peut pas jouer à la place de l'IA, et le coup de l'IA est calculé
+et appliqué par le serveur. La recherche de l'IA tourne dans un pool de
+threads (SERVER_CONFIG['ai_workers']) pour que la boucle continue de servir
+les autres sessions ; un verrou par session sérialise ses requêtes. Les
+coups de l'IA classique passent par le service par lots de src.ai_service.
+
+Usage: python -m src.server --host 127.0.0.1 --port 8765 [--snapshot data/sessions.snap]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .ai_service import AIService
+from .broadcast import Broadcast
+from .game import GameLogic, VARIANTS
+from .matchmaking import Matchmaker
+from .ratings import RatingStore, human_entity, ai_entity
+from .session_store import encode_session, session_key, write_snapshot, SessionSnapshot
+from config.settings import SERVER_CONFIG, STATS_CONFIG, RATINGS_CONFIG
+
+GAME_MODES = ('pvp', 'ai')
+AI_LEVELS = ('easy', 'medium', 'hard')
+
+
+class ServerError(ValueError):
+    """Requête refusée (renvoyée au client dans le champ error)"""
+
+
+class Session:
+    """Une partie hébergée : sa logique de jeu et de quoi sérialiser ses requêtes"""
+
+    __slots__ = ('id', 'game', 'lock', 'touched', 'broadcast', 'seats', 'players')
+
+    def __init__(self, session_id, game, seats=None, players=None):
+        self.id = session_id
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.touched = time.monotonic()
+        self.broadcast = None  # Broadcast créé au premier spectateur
+        self.seats = seats  # Partie appariée : {symbole: jeton du joueur}
+        self.players = players  # Partie classée : {symbole: entité de src.ratings}
+
+
+class Connection:
+    """Une connexion cliente : son flux d'écriture et les parties qu'elle regarde"""
+
+    __slots__ = ('writer', 'write_lock', 'watching', 'tickets')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.write_lock = asyncio.Lock()  # Une réponse à la fois (drain)
+        self.watching = set()  # Identifiants des sessions regardées
+        self.tickets = set()  # Tickets de la file d'attente des parties entre joueurs
+
+
+def snapshot(game):
+    """
+    État complet d'une partie (nouvelle session, annulation, reconnexion)
+
+    Le client rejoue les coups sur sa propre copie de la grille : les
+    indices de case suffisent, pas besoin d'envoyer la grille.
+    """
+    return {
+        'variant': game.variant,
+        'mode': game.game_mode,
+        'level': game.ai_difficulty,
+        'moves': list(game.moves),
+        'redo': len(game.redo_stack),
+        'player': game.current_player,
+        'game_over': game.game_over,
+        'scores': game.get_scores(),
+        'thinking': game.get_ai_thinking_time() if game.is_ai_turn() else 0
+    }
+
+
+class GameServer:
+    """Sessions de jeu servies par une boucle asyncio"""
+
+    def __init__(self, max_sessions=None, ai_workers=None, idle_timeout=None, game_log=None,
+                 snapshot_path=None, snapshot_interval=None, ratings=None):
+        """
+        Args:
+            max_sessions: Nombre maximal de sessions ouvertes (SERVER_CONFIG par défaut)
+            ai_workers: Threads du pool des coups de l'IA
+            idle_timeout: Secondes sans requête avant fermeture d'une session
+            game_log: GameLogWriter optionnel partagé par toutes les sessions
+            snapshot_path: Instantané des sessions à reprendre puis à tenir à jour (aucun si None)
+            snapshot_interval: Secondes entre deux instantanés (0 : seulement à l'arrêt)
+            ratings: RatingStore des joueurs classés (parties appariées non classées si None)
+        """
+        self.max_sessions = max_sessions or SERVER_CONFIG['max_sessions']
+        self.idle_timeout = idle_timeout or SERVER_CONFIG['idle_timeout']
+        self.executor = ThreadPoolExecutor(max_workers=ai_workers or SERVER_CONFIG['ai_workers'],
+                                           thread_name_prefix='ai-move')
+        self.game_log = game_log
+        self.ai_service = AIService(self.executor) if SERVER_CONFIG['batch_ai'] else None
+        self.ratings = ratings
+        self.matchmaker = Matchmaker(self._start_match, choose_level=self._fallback_level)
+        self.sessions = {}  # id -> Session
+        self.connections = {}  # Flux d'écriture -> tâche de chaque connexion ouverte
+        self.spectators_dropped = 0  # Spectateurs trop lents retirés des parties fermées
+        self.requests = 0
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = (SERVER_CONFIG['snapshot_interval'] if snapshot_interval is None
+                                  else snapshot_interval)
+        self.restored = None  # SessionSnapshot des sessions pas encore reprises
+        self.sessions_restored = 0
+        self._restored_at = 0.0
+        self._snapshot_lock = asyncio.Lock()  # Un instantané écrit à la fois
+        self._server = None
+        self._reaper = None
+        self._snapshotter = None
+        self._seeds = itertools.count(secrets.randbits(32))
+
+    async def start(self, host=None, port=None):
+        """Ouvre le port d'écoute ; retourne le port effectif (port 0 : choisi par le système)"""
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            self.load_snapshot(self.snapshot_path)
+        if self.snapshot_path and self.snapshot_interval > 0:
+            self._snapshotter = asyncio.ensure_future(self._snapshot_periodically())
+        self._server = await asyncio.start_server(
+            self._serve_connection,
+            host or SERVER_CONFIG['host'],
+            SERVER_CONFIG['port'] if port is None else port,
+            limit=SERVER_CONFIG['max_line']
+        )
+        self._reaper = asyncio.ensure_future(self._reap_idle_sessions())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Sert les connexions jusqu'à l'annulation de la tâche"""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """Ferme le port et les tâches de fond, écrit le dernier instantané, arrête le pool de l'IA"""
+        for task in (self._reaper, self._snapshotter):
+            if task is not None:
+                task.cancel()
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self.connections.values())
+            for writer in list(self.connections):
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+        if self.snapshot_path:
+            try:
+                count = await self.save_snapshot()
+                print(f"💾 {count} sessions sauvegardées dans {self.snapshot_path}")
+            except OSError as e:
+                print(f"⚠️ Instantané des sessions non écrit ({self.snapshot_path}): {e}")
+        if self.restored is not None:
+            self.restored.close()
+            self.restored = None
+        if self.ratings is not None:
+            self.ratings.close()
+        self.executor.shutdown(wait=True)
+
+    # --- Instantanés ----------------------------------------------------------
+
+    def load_snapshot(self, path):
+        """
+        Ouvre un instantané : ses sessions seront recréées à leur première requête
+
+        Returns:
+            int: Sessions à reprendre (0 si le fichier est illisible)
+        """
+        try:
+            self.restored = SessionSnapshot(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Instantané des sessions ignoré: {e}")
+            return 0
+        self._restored_at = time.monotonic()
+        return len(self.restored)
+
+    async def save_snapshot(self, path=None):
+        """
+        Écrit toutes les sessions : celles ouvertes et celles de l'instantané pas encore reprises
+
+        Returns:
+            int: Nombre de sessions écrites
+        """
+        async with self._snapshot_lock:
+            records = []
+            for session in list(self.sessions.values()):
+                if session.lock.locked():
+                    # Coup de l'IA en cours dans le pool : l'écrire une fois joué
+                    async with session.lock:
+                        if self.sessions.get(session.id) is not session:
+                            continue
+                        records.append(self._snapshot_record(session))
+                else:
+                    records.append(self._snapshot_record(session))
+            if self.restored is not None:
+                records.extend(self.restored.remaining())
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, write_snapshot,
+                                              path or self.snapshot_path, records)
+
+    @staticmethod
+    def _snapshot_record(session):
+        """(clé, enregistrement) d'une session pour l'instantané"""
+        return session_key(session.id), encode_session(session.game, session.seats, session.players)
+
+    async def _snapshot_periodically(self):
+        """Écrit l'instantané toutes les snapshot_interval secondes"""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.save_snapshot()
+            except OSError as e:
+                print(f"⚠️ Instantané des sessions non écrit ({self.snapshot_path}): {e}")
+
+    def _find_session(self, session_id):
+        """Session ouverte, ou recréée depuis l'instantané à sa première requête (None si inconnue)"""
+        session = self.sessions.get(session_id)
+        if session is None and self.restored is not None:
+            state = self.restored.take(session_id)
+            if state is not None:
+                game = GameLogic.from_state(state, game_log=self.game_log)
+                session = self.sessions[session_id] = Session(session_id, game, state['seats'],
+                                                              state['players'])
+                self.sessions_restored += 1
+        return session
+
+    # --- Connexions -----------------------------------------------------------
+
+    async def _serve_connection(self, reader, writer):
+        """Lit les requêtes d'une connexion ; chacune est traitée dans sa propre tâche"""
+        self.connections[writer] = asyncio.current_task()
+        connection = Connection(writer)
+        pending = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break  # Ligne trop longue ou connexion coupée
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._answer(line, connection))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            for ticket in list(connection.tickets):
+                self.matchmaker.cancel(ticket)  # Plus personne pour jouer la partie
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            self.connections.pop(writer, None)
+            for session_id in connection.watching:
+                session = self.sessions.get(session_id)
+                if session is not None and session.broadcast is not None:
+                    session.broadcast.unsubscribe(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _answer(self, line, connection):
+        """Traite une requête et écrit sa réponse"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ServerError("requête JSON attendue")
+            request_id = request.get('id')
+            response = await self.handle(request, connection)
+            response['ok'] = True
+        except ServerError as e:
+            response = {'ok': False, 'error': str(e)}
+        except Exception as e:
+            # Une requête mal formée ne doit ni rester sans réponse ni arrêter la connexion
+            response = {'ok': False, 'error': f"requête invalide: {e!r}"}
+        response['id'] = request_id
+        async with connection.write_lock:
+            writer = connection.writer
+            try:
+                writer.write(json.dumps(response, separators=(',', ':')).encode() + b'\n')
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def handle(self, request, connection=None):
+        """
+        Exécute une requête décodée
+
+        Args:
+            request: Requête (dict)
+            connection: Connexion de la requête (nécessaire pour spectate)
+
+        Returns:
+            dict: Champs de la réponse (sans id ni ok)
+        """
+        self.requests += 1
+        op = request.get('op')
+        if op == 'new':
+            return self._new_session(request)
+        if op == 'queue':
+            return await self._queue(request, connection)
+        if op == 'unqueue':
+            tickets = list(connection.tickets) if connection is not None else []
+            for ticket in tickets:
+                self.matchmaker.cancel(ticket)
+            return {'cancelled': len(tickets)}
+        if op == 'rating':
+            return self._rating(request)
+        if op == 'stats':
+            return {'sessions': len(self.sessions), 'connections': len(self.connections),
+                    'requests': self.requests,
+                    'restored': self.sessions_restored,
+                    'restorable': len(self.restored) if self.restored is not None else 0,
+                    'spectators': sum(len(session.broadcast) for session in self.sessions.values()
+                                      if session.broadcast is not None),
+                    'spectators_dropped': self.spectators_dropped + sum(
+                        session.broadcast.dropped for session in self.sessions.values()
+                        if session.broadcast is not None),
+                    'ai_batches': self.ai_service.summary() if self.ai_service is not None else None,
+                    'matchmaking': self.matchmaker.summary()}
+        handler = getattr(self, f"_op_{op}", None) if isinstance(op, str) else None
+        if handler is None:
+            raise ServerError(f"opération inconnue: {op}")
+        session = self._find_session(request.get('session'))
+        if session is None:
+            raise ServerError("session inconnue")
+        if op in ('spectate', 'unspectate'):
+            # Regarder une partie n'attend pas la fin du coup en cours
+            return handler(session, connection)
+        session.touched = time.monotonic()
+        async with session.lock:
+            return await handler(session, request)
+
+    # --- Opérations -----------------------------------------------------------
+
+    def _new_session(self, request):
+        """Crée une partie"""
+        if len(self.sessions) >= self.max_sessions:
+            raise ServerError("trop de sessions ouvertes")
+        mode = request.get('mode', 'pvp')
+        level = request.get('level', 'medium')
+        variant = request.get('variant', 'classic')
+        if mode not in GAME_MODES:
+            raise ServerError(f"mode inconnu: {mode}")
+        if level not in AI_LEVELS:
+            raise ServerError(f"niveau inconnu: {level}")
+        if variant not in VARIANTS:
+            raise ServerError(f"variante inconnue: {variant}")
+        seed = request.get('seed')
+        game = GameLogic(game_mode=mode, ai_difficulty=level, variant=variant, game_log=self.game_log,
+                         seed=next(self._seeds) if seed is None else int(seed))
+        session = Session(secrets.token_hex(8), game)
+        self.sessions[session.id] = session
+        return {'session': session.id, 'state': snapshot(game)}
+
+    async def _queue(self, request, connection):
+        """Attend un adversaire (ou l'IA après MATCHMAKING_CONFIG['ai_fallback'] secondes)"""
+        if connection is None:
+            raise ServerError("queue demande une connexion")
+        variant = request.get('variant', 'classic')
+        if variant not in VARIANTS:
+            raise ServerError(f"variante inconnue: {variant}")
+        player = request.get('player')
+        if player is not None and not isinstance(player, str):
+            raise ServerError("player doit être un nom de profil")
+        rating = request.get('rating')
+        if player and self.ratings is not None:
+            # Un profil classé est placé à son classement, jamais à celui annoncé par le client
+            rating = self.ratings.get(human_entity(player), variant).rating
+        ticket = self.matchmaker.enqueue(None if rating is None else float(rating), variant, connection,
+                                         player or None)
+        connection.tickets.add(ticket)
+        try:
+            match = await ticket.future
+        finally:
+            connection.tickets.discard(ticket)
+            self.matchmaker.cancel(ticket)  # Sans effet une fois la partie créée
+        if match is None:
+            raise ServerError("attente annulée")
+        return match
+
+    def _start_match(self, tickets, level):
+        """
+        Crée la partie de joueurs appariés (appelée par le Matchmaker)
+
+        Args:
+            tickets: Deux tickets (le premier joue X), ou un seul contre l'IA
+            level: Niveau de l'IA, None entre joueurs
+
+        Returns:
+            list: Réponse à la requête queue de chaque ticket
+        """
+        if len(self.sessions) >= self.max_sessions:
+            raise ServerError("trop de sessions ouvertes")
+        variant = tickets[0].variant
+        mode = 'pvp' if level is None else 'ai'
+        game = GameLogic(game_mode=mode, ai_difficulty=level or 'medium', variant=variant,
+                         game_log=self.game_log, seed=next(self._seeds))
+        seats = {symbol: secrets.token_hex(8) for symbol, _ in zip(('X', 'O'), tickets)}
+        players = {symbol: human_entity(ticket.player) if ticket.player else None
+                   for symbol, ticket in zip(('X', 'O'), tickets)}
+        if level is not None:
+            players['O'] = ai_entity(variant, level)
+        if self.ratings is None or None in players.values() or players['X'] == players['O']:
+            players = None  # Partie non classée
+        session = Session(secrets.token_hex(8), game, seats, players)
+        self.sessions[session.id] = session
+        state = snapshot(game)
+        now = asyncio.get_running_loop().time()
+        results = []
+        for ticket, symbol in zip(tickets, ('X', 'O')):
+            other = tickets[1] if ticket is tickets[0] and len(tickets) > 1 else tickets[0]
+            results.append({'session': session.id, 'seat': seats[symbol], 'symbol': symbol,
+                            'opponent': 'human' if level is None else 'ai',
+                            'opponent_rating': other.rating if level is None else None,
+                            'level': level, 'rating': ticket.rating, 'rated': players is not None,
+                            'waited': now - ticket.enqueued, 'state': state})
+        return results
+
+    def _fallback_level(self, rating, variant):
+        """
+        Niveau de l'IA de repli : celui dont le classement est le plus proche du joueur
+
+        Seules les IA classées sur assez de parties (RATINGS_CONFIG['matchmaking_games'])
+        comptent ; sans elles, les seuils de MATCHMAKING_CONFIG['ai_levels'] décident.
+        """
+        if self.ratings is not None:
+            rated = []
+            for level in AI_LEVELS:
+                entry = self.ratings.get(ai_entity(variant, level), variant)
+                if entry.games >= RATINGS_CONFIG['matchmaking_games']:
+                    rated.append((abs(entry.rating - rating), level))
+            if rated:
+                return min(rated)[1]
+        return Matchmaker.ai_level(rating)
+
+    def _rating(self, request):
+        """Classement d'un profil (ou d'une IA avec level) dans une variante"""
+        if self.ratings is None:
+            raise ServerError("classements désactivés")
+        variant = request.get('variant', 'classic')
+        if variant not in VARIANTS:
+            raise ServerError(f"variante inconnue: {variant}")
+        if request.get('level') in AI_LEVELS:
+            entity = ai_entity(variant, request['level'])
+        elif isinstance(request.get('player'), str):
+            entity = human_entity(request['player'])
+        else:
+            raise ServerError("player ou level attendu")
+        return {'entity': entity, 'variant': variant, **self.ratings.get(entity, variant).to_dict()}
+
+    def _rate_game(self, session, result):
+        """Met à jour les classements des deux camps d'une partie classée terminée"""
+        winner = result['winner'] or 'draw'
+        players = session.players
+        self.ratings.record(players['X'], players['O'], winner, session.game.variant)
+
+    @staticmethod
+    def _check_seat(session, request, symbol=None):
+        """Dans une partie appariée, vérifie le jeton du joueur (celui de symbol s'il est donné)"""
+        if session.seats is None:
+            return
+        seat = request.get('seat')
+        if symbol is not None:
+            if seat != session.seats.get(symbol):
+                raise ServerError("ce n'est pas votre tour")
+        elif seat not in session.seats.values():
+            raise ServerError("place inconnue dans cette partie")
+
+    async def _op_move(self, session, request):
+        """Coup d'un joueur humain, validé par make_move"""
+        game = session.game
+        if game.is_ai_turn():
+            raise ServerError("c'est au tour de l'IA")
+        self._check_seat(session, request, game.current_player)
+        row, col = int(request['row']), int(request['col'])
+        if not self._on_board(game, row, col):
+            return self._move_response(session, {'valid': False})
+        return self._move_response(session, game.make_move(row, col))
+
+    @staticmethod
+    def _on_board(game, row, col):
+        """True si la case existe (les indices négatifs ne doivent pas reboucler sur la grille)"""
+        if not game.state.size:
+            return True  # Grille infinie
+        grid = game.board
+        return 0 <= row < len(grid) and 0 <= col < len(grid[0])
+
+    async def _op_ai_move(self, session, request):
+        """Coup de l'IA, cherché et joué dans le pool de threads"""
+        game = session.game
+        if not game.is_ai_turn() or game.game_over:
+            raise ServerError("ce n'est pas au tour de l'IA")
+        self._check_seat(session, request)
+        if self.ai_service is not None and game.variant == 'classic':
+            # IA classique : demande regroupée avec celles des autres sessions
+            move = await self.ai_service.get_move(game.ai, game.board)
+            result = game.make_move(*move) if move is not None else {'valid': False}
+        else:
+            loop = asyncio.get_running_loop()
+            move, result = await loop.run_in_executor(self.executor, self._play_ai_move, game)
+        response = self._move_response(session, result)
+        response['move'] = list(move) if move is not None else None
+        return response
+
+    @staticmethod
+    def _play_ai_move(game):
+        """Cherche et joue le coup de l'IA (thread du pool, session verrouillée)"""
+        move = game.get_ai_move()
+        if move is None:
+            return None, {'valid': False}
+        return move, game.make_move(*move)
+
+    def _move_response(self, session, result):
+        """Réponse à un coup (diffusé aux spectateurs s'il est valide) et de quoi tenir la copie du client à jour"""
+        game = session.game
+        response = {'result': result, 'player': game.current_player}
+        if result['valid']:
+            if result['game_over'] and session.players is not None:
+                self._rate_game(session, result)
+            response['cell'] = game.moves[-1]
+            if session.broadcast is not None:
+                session.broadcast.publish_move(game.moves[-1], result['player_who_played'], result)
+            response['scores'] = game.get_scores()
+            if game.is_ai_turn() and not game.game_over:
+                response['thinking'] = game.get_ai_thinking_time()
+        return response
+
+    def _check_undo(self, session, request):
+        """Annuler ou rétablir : refusé dans les parties appariées (classées ou entre joueurs)"""
+        self._check_seat(session, request)
+        if session.seats is not None:
+            raise ServerError("pas d'annulation dans une partie appariée")
+
+    async def _op_undo(self, session, request):
+        """Annule le dernier coup (et la réponse de l'IA)"""
+        self._check_undo(session, request)
+        undone = session.game.undo()
+        self._publish_snapshot(session)
+        return {'cells': [list(cell) for cell in undone], 'state': snapshot(session.game)}
+
+    async def _op_redo(self, session, request):
+        """Rétablit le dernier coup annulé"""
+        self._check_undo(session, request)
+        redone = session.game.redo()
+        self._publish_snapshot(session)
+        return {'cells': [list(cell) for cell in redone], 'state': snapshot(session.game)}
+
+    async def _op_restart(self, session, request):
+        """Nouvelle partie dans la même session (scores conservés)"""
+        self._check_seat(session, request)
+        session.game.restart_game()
+        self._publish_snapshot(session)
+        return {'state': snapshot(session.game)}
+
+    async def _op_reset_scores(self, session, request):
+        """Remet les scores de la session à zéro"""
+        self._check_seat(session, request)
+        session.game.reset_scores()
+        self._publish_snapshot(session)
+        return {'scores': session.game.get_scores()}
+
+    async def _op_state(self, session, request):
+        """État complet de la partie"""
+        return {'state': snapshot(session.game)}
+
+    async def _op_close(self, session, request):
+        """Ferme la session"""
+        self._check_seat(session, request)
+        self._close_session(session)
+        return {}
+
+    def _op_spectate(self, session, connection):
+        """Abonne la connexion aux coups de la partie ; retourne l'état complet"""
+        if connection is None:
+            raise ServerError("spectate demande une connexion")
+        if session.broadcast is None:
+            session.broadcast = Broadcast(session.id, lambda: snapshot(session.game))
+        connection.watching.add(session.id)
+        return session.broadcast.subscribe(connection.writer)
+
+    def _op_unspectate(self, session, connection):
+        """Désabonne la connexion de la partie"""
+        if connection is not None:
+            connection.watching.discard(session.id)
+            if session.broadcast is not None:
+                session.broadcast.unsubscribe(connection.writer)
+        return {}
+
+    @staticmethod
+    def _publish_snapshot(session):
+        """Diffuse l'état complet après un changement autre qu'un coup"""
+        if session.broadcast is not None:
+            session.broadcast.publish_snapshot()
+
+    def _close_session(self, session):
+        """Retire une session et prévient ses spectateurs"""
+        self.sessions.pop(session.id, None)
+        if session.broadcast is not None:
+            self.spectators_dropped += session.broadcast.dropped
+            session.broadcast.close()
+
+    async def _reap_idle_sessions(self):
+        """Ferme périodiquement les sessions sans requête depuis idle_timeout secondes"""
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 10))
+            deadline = time.monotonic() - self.idle_timeout
+            idle = [session for session in self.sessions.values()
+                    if session.touched < deadline and not session.lock.locked()]
+            for session in idle:
+                self._close_session(session)
+            if idle:
+                print(f"🧹 {len(idle)} sessions inactives fermées ({len(self.sessions)} ouvertes)")
+            if self.restored is not None and self._restored_at < deadline:
+                # Sessions de l'instantané sans requête depuis le redémarrage : inactives aussi
+                print(f"🧹 {len(self.restored)} sessions de l'instantané non reprises abandonnées")
+                self.restored.close()
+                self.restored = None
+
+
+async def run_server(host=None, port=None, game_log=None, snapshot_path=None, ratings=None):
+    """Lance un serveur et le sert jusqu'à l'interruption"""
+    server = GameServer(game_log=game_log, snapshot_path=snapshot_path, ratings=ratings)
+    bound = await server.start(host, port)
+    print(f"🌐 Serveur de parties sur {host or SERVER_CONFIG['host']}:{bound}")
+    if server.restored is not None:
+        print(f"♻️ {len(server.restored)} sessions à reprendre depuis {snapshot_path}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Serveur de parties Tic Tac Toe")
+    parser.add_argument('--host', default=SERVER_CONFIG['host'], help="adresse d'écoute")
+    parser.add_argument('--port', type=int, default=SERVER_CONFIG['port'], help="port d'écoute")
+    parser.add_argument('--log', default=None, help="journal des parties à compléter")
+    parser.add_argument('--snapshot', default=SERVER_CONFIG['snapshot_path'],
+                        help="instantané des sessions ('' pour ne pas sauvegarder)")
+    parser.add_argument('--ratings', default=STATS_CONFIG['path'] if RATINGS_CONFIG['enabled'] else '',
+                        help="base SQLite des classements ('' pour ne pas classer les parties)")
+    args = parser.parse_args(argv)
+
+    game_log = None
+    if args.log:
+        from .game_log import GameLogWriter
+        game_log = GameLogWriter(args.log)
+    ratings = RatingStore(args.ratings) if args.ratings else None
+    try:
+        asyncio.run(run_server(args.host, args.port, game_log, args.snapshot or None, ratings))
+    except KeyboardInterrupt:
+        print("👋 Serveur arrêté")
+    finally:
+        if game_log is not None:
+            game_log.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Instantanés des sessions du serveur de parties
+
+Le serveur écrit toutes ses sessions dans un fichier binaire versionné,
+périodiquement (SERVER_CONFIG['snapshot_interval']) et à l'arrêt. Au
+redémarrage le fichier est projeté en mémoire et seul l'en-tête est lu :
+une session n'est décodée qu'à sa première requête, la durée de démarrage
+ne dépend pas du nombre de sessions.
+
+Format (entiers little-endian) :
+
+    en-tête   magic(8) version(u16) réservé(u16) sessions(u32) écrit_le(f64)
+    index     sessions x [id(8 octets) position(u32) longueur(u32)], trié par id
+    sessions  un enregistrement par session
+
+Enregistrement : variante, mode, niveau, drapeaux (u8 chacun), graine de la
+partie (u64), début de la partie (f64), puis en LEB128 la graine et les
+tirages du générateur de graines, ceux de l'IA et son compteur de coups,
+les scores, les coups et les coups annulés ; enfin, pour une partie
+appariée (src.matchmaking), les jetons des places X et O (8 octets chacun)
+puis les entités classées de X et de O (longueur LEB128 et UTF-8, vide si
+la partie n'est pas classée).
+La grille, le joueur courant et la fin de partie se reconstruisent en
+rejouant les coups (GameLogic.from_state).
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import time
+
+from .game_log import encode_varint, decode_varint, VARIANT_CODES, MODE_CODES, AI_LEVEL_CODES
+
+SNAPSHOT_MAGIC = b'TTTSNAP\n'
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct('<8sHHId')
+_ENTRY = struct.Struct('<8sII')
+_RECORD = struct.Struct('<BBBBQd')
+ID_SIZE = 8  # Identifiants de session : 16 caractères hexadécimaux
+
+_VARIANTS = {code: name for name, code in VARIANT_CODES.items()}
+_MODES = {code: name for name, code in MODE_CODES.items()}
+_AI_LEVELS = {code: name for name, code in AI_LEVEL_CODES.items()}
+
+# Drapeaux d'un enregistrement
+FLAG_RECORDED = 1  # Partie terminée déjà ajoutée au journal
+FLAG_AI = 2  # Session contre l'IA (compteur et générateur de l'IA présents)
+FLAG_SEATS = 4  # Partie appariée : jetons des places X et O présents
+FLAG_PLAYERS = 8  # Partie classée : entités de X et de O présentes (src.ratings)
+
+_NO_SEAT = bytes(ID_SIZE)
+
+
+def encode_session(game, seats=None, players=None):
+    """
+    Enregistrement binaire d'une session
+
+    Args:
+        game: GameLogic de la session
+        seats: Jetons des places d'une partie appariée ({symbole: jeton hexadécimal})
+        players: Entités classées d'une partie appariée ({symbole: entité})
+
+    Returns:
+        bytearray: Enregistrement (voir le format du module)
+    """
+    state = game.export_state()
+    flags = ((FLAG_RECORDED if state['recorded'] else 0) | (FLAG_AI if state['ai'] else 0)
+             | (FLAG_SEATS if seats else 0) | (FLAG_PLAYERS if players else 0))
+    out = bytearray(_RECORD.pack(VARIANT_CODES[state['variant']], MODE_CODES[state['mode']],
+                                 AI_LEVEL_CODES[state['level']], flags, state['seed'], state['started_at']))
+    fields = list(state['seed_source'])
+    if state['ai']:
+        fields.extend(state['ai'])
+    fields.extend(state['scores'])
+    for value in fields:
+        encode_varint(value, out)
+    for cells in (state['moves'], state['redo']):
+        encode_varint(len(cells), out)
+        for cell in cells:
+            encode_varint(cell, out)
+    if seats:
+        for symbol in ('X', 'O'):
+            out += bytes.fromhex(seats[symbol]) if symbol in seats else _NO_SEAT
+    if players:
+        for symbol in ('X', 'O'):
+            name = (players.get(symbol) or '').encode()
+            encode_varint(len(name), out)
+            out += name
+    return out
+
+
+def decode_session(data):
+    """
+    État d'une session (format de GameLogic.export_state) depuis son enregistrement
+
+    Args:
+        data: Enregistrement (bytes ou bytearray)
+
+    Returns:
+        dict: État à passer à GameLogic.from_state, plus 'seats' et 'players' (None hors partie appariée)
+    """
+    variant, mode, level, flags, seed, started_at = _RECORD.unpack_from(data, 0)
+    pos = _RECORD.size
+    values = []
+    for _ in range(7 if flags & FLAG_AI else 4):
+        value, pos = decode_varint(data, pos)
+        values.append(value)
+    lists = []
+    for _ in range(2):
+        count, pos = decode_varint(data, pos)
+        cells = []
+        for _ in range(count):
+            cell, pos = decode_varint(data, pos)
+            cells.append(cell)
+        lists.append(cells)
+    seats = None
+    if flags & FLAG_SEATS:
+        seats = {}
+        for symbol in ('X', 'O'):
+            token = bytes(data[pos:pos + ID_SIZE])
+            pos += ID_SIZE
+            if token != _NO_SEAT:
+                seats[symbol] = token.hex()
+    players = None
+    if flags & FLAG_PLAYERS:
+        players = {}
+        for symbol in ('X', 'O'):
+            length, pos = decode_varint(data, pos)
+            players[symbol] = bytes(data[pos:pos + length]).decode() or None
+            pos += length
+    return {
+        'variant': _VARIANTS[variant],
+        'mode': _MODES[mode],
+        'level': _AI_LEVELS[level],
+        'moves': lists[0],
+        'redo': lists[1],
+        'scores': (values[-2], values[-1]),
+        'recorded': bool(flags & FLAG_RECORDED),
+        'seed': seed,
+        'seed_source': (values[0], values[1]),
+        'started_at': started_at,
+        'ai': tuple(values[2:5]) if flags & FLAG_AI else None,
+        'seats': seats,
+        'players': players
+    }
+
+
+def session_key(session_id):
+    """Clé de l'index d'un identifiant de session (None s'il n'a pas la forme attendue)"""
+    if not isinstance(session_id, str) or len(session_id) != 2 * ID_SIZE:
+        return None
+    try:
+        return bytes.fromhex(session_id)
+    except ValueError:
+        return None
+
+
+def write_snapshot(path, records):
+    """
+    Écrit un instantané (remplacement atomique du fichier précédent)
+
+    Args:
+        path: Fichier de destination
+        records: Itérable de (clé de 8 octets, enregistrement)
+
+    Returns:
+        int: Nombre de sessions écrites
+    """
+    records = sorted(records, key=lambda record: record[0])
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as out:
+        out.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(records), time.time()))
+        offset = _HEADER.size + len(records) * _ENTRY.size
+        index = bytearray()
+        for key, data in records:
+            index += _ENTRY.pack(key, offset, len(data))
+            offset += len(data)
+        out.write(index)
+        for _, data in records:
+            out.write(data)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+class _Keys:
+    """Vue en séquence des clés de l'index (recherche dichotomique sans les copier toutes)"""
+
+    __slots__ = ('data', 'count')
+
+    def __init__(self, data, count):
+        self.data = data
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = _HEADER.size + i * _ENTRY.size
+        return self.data[start:start + ID_SIZE]
+
+
+class SessionSnapshot:
+    """Instantané projeté en mémoire : les sessions sont lues une à une, à la demande"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Fichier écrit par write_snapshot
+
+        Raises:
+            ValueError: Fichier qui n'est pas un instantané de cette version
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} est vide")
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} n'est pas un instantané de sessions")
+        magic, version, _, self.count, self.written_at = _HEADER.unpack_from(self._mmap, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"{path} n'est pas un instantané de sessions (version {SNAPSHOT_VERSION})")
+        self._keys = _Keys(self._mmap, self.count)
+        self.taken = set()  # Clés déjà restaurées (ou fermées) : plus à reprendre
+
+    def __len__(self):
+        """Sessions de l'instantané pas encore restaurées"""
+        return self.count - len(self.taken)
+
+    def _find(self, key):
+        """Rang de la clé dans l'index, ou -1"""
+        i = bisect.bisect_left(self._keys, key)
+        if i < self.count and self._keys[i] == key:
+            return i
+        return -1
+
+    def _record(self, i):
+        """Enregistrement de rang i (seuls ses octets sont lus dans la projection)"""
+        _, offset, length = _ENTRY.unpack_from(self._mmap, _HEADER.size + i * _ENTRY.size)
+        return self._mmap[offset:offset + length]
+
+    def take(self, session_id):
+        """
+        Retire une session de l'instantané
+
+        Returns:
+            dict: État de la session (GameLogic.from_state), None si absente ou déjà reprise
+        """
+        key = session_key(session_id)
+        if key is None or key in self.taken:
+            return None
+        i = self._find(key)
+        if i < 0:
+            return None
+        self.taken.add(key)
+        return decode_session(self._record(i))
+
+    def remaining(self):
+        """(clé, enregistrement) des sessions pas encore reprises, recopiées telles quelles dans l'instantané suivant"""
+        return [(self._keys[i], self._record(i)) for i in range(self.count)
+                if self._keys[i] not in self.taken]
+
+    def close(self):
+        """Libère la projection mémoire"""
+        self._mmap.close()
+        self._file.close()
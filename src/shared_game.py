@@ -0,0 +1,194 @@
+"""
+Partie partagée entre plusieurs threads (hôtes multi-threads)
+
+GameLogic n'est pas protégée : make_move modifie la grille, le joueur
+courant, la fin de partie et les scores sans synchronisation. SharedGame
+l'enveloppe pour un hôte où l'interface ou le réseau soumettent des coups
+pendant que des threads de travail cherchent ceux de l'IA :
+
+- chaque écriture (coup, annulation, nouvelle partie...) prend le verrou de
+  la partie et incrémente sa version ;
+- un coup peut porter la version pour laquelle il a été calculé : s'il
+  arrive après une autre écriture, il est refusé sans toucher la partie
+  ({'valid': False, 'stale': True}) ;
+- après chaque écriture, un instantané immuable (GameSnapshot) est publié
+  par simple remplacement de référence : les lecteurs ne prennent aucun
+  verrou et voient toujours un état cohérent.
+
+La recherche de l'IA joue sur une copie de la position, hors du verrou de
+la partie : les lecteurs et les coups humains ne l'attendent pas. Un second
+verrou sérialise l'usage de l'IA (générateur, compteur de coups, tables) ;
+annuler, rétablir et recommencer, qui touchent aussi à l'IA, attendent la
+fin de la recherche en cours. Ordre des verrous : IA puis partie.
+
+    shared = SharedGame(GameLogic(game_mode='ai'))
+    view = shared.snapshot()
+    result = shared.make_move(1, 1, version=view.version)
+    shared.play_ai_move()  # Thread de travail
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+
+GameSnapshot = namedtuple('GameSnapshot', [
+    'version',    # Nombre d'écritures depuis la création
+    'variant',    # Clé de game.VARIANTS
+    'moves',      # Indices des cases jouées (tuple)
+    'board',      # Grille (tuple de tuples), None pour la grille infinie
+    'player',     # Joueur dont c'est le tour
+    'game_over',
+    'winner',     # 'X', 'O' ou None
+    'scores',     # {'X': ..., 'O': ...}
+    'can_undo',
+    'can_redo',
+])
+
+
+def take_snapshot(game, version):
+    """
+    Instantané immuable d'une GameLogic (à prendre sous le verrou de la partie)
+
+    Args:
+        game: GameLogic
+        version: Version de la partie
+
+    Returns:
+        GameSnapshot: Copie de l'état, partageable entre threads
+    """
+    board = tuple(tuple(row) for row in game.board) if game.state.size else None
+    return GameSnapshot(
+        version=version,
+        variant=game.variant,
+        moves=tuple(game.moves),
+        board=board,
+        player=game.current_player,
+        game_over=game.game_over,
+        winner=game.state.winner,
+        scores=game.get_scores(),
+        can_undo=game.can_undo(),
+        can_redo=game.can_redo()
+    )
+
+
+class SharedGame:
+    """GameLogic protégée par un verrou, à état versionné et instantanés sans verrou"""
+
+    def __init__(self, game):
+        """
+        Args:
+            game: GameLogic enveloppée ; elle ne doit plus être modifiée directement
+        """
+        self.game = game
+        self._lock = threading.Lock()  # Écritures de la partie
+        self._ai_lock = threading.Lock()  # Une recherche de l'IA à la fois
+        self.version = 0
+        self.stale_moves = 0  # Coups refusés car calculés pour une version dépassée
+        self._snapshot = take_snapshot(game, 0)
+
+    def snapshot(self):
+        """Dernier instantané publié (lecture sans verrou)"""
+        return self._snapshot
+
+    def _publish(self):
+        """Nouvelle version et nouvel instantané (sous le verrou de la partie)"""
+        self.version += 1
+        self._snapshot = take_snapshot(self.game, self.version)
+
+    def _stale(self):
+        """Réponse à un coup calculé pour une version dépassée"""
+        self.stale_moves += 1
+        return {'valid': False, 'stale': True, 'version': self.version}
+
+    def make_move(self, row, col, version=None):
+        """
+        Joue un coup si la partie n'a pas changé depuis la version donnée
+
+        Args:
+            row: Ligne de la case
+            col: Colonne de la case
+            version: Version pour laquelle le coup a été choisi (None : pas de contrôle)
+
+        Returns:
+            dict: Résultat de GameLogic.make_move, avec la version de la partie ;
+                {'valid': False, 'stale': True, ...} si la version est dépassée
+        """
+        with self._lock:
+            if version is not None and version != self.version:
+                return self._stale()
+            result = self.game.make_move(row, col)
+            if result['valid']:
+                self._publish()
+            result['version'] = self.version
+            return result
+
+    def think(self):
+        """
+        Cherche le coup de l'IA sur une copie de la position, sans bloquer la partie
+
+        Returns:
+            tuple: ((row, col) ou None, version de la position analysée)
+        """
+        with self._ai_lock:
+            with self._lock:
+                game = self.game
+                version = self.version
+                if not (game.ai and game.is_ai_turn()) or game.game_over:
+                    return None, version
+                if game.variant == 'classic':
+                    position = [row[:] for row in game.board]
+                else:
+                    position = game.state.copy()
+            if game.metrics is None:
+                return game.ai.get_move(position), version
+            started = time.perf_counter()
+            move = game.ai.get_move(position)
+            game.metrics.record('get_move', time.perf_counter() - started, **game._metric_labels())
+            return move, version
+
+    def play_ai_move(self):
+        """
+        Cherche puis joue le coup de l'IA (thread de travail)
+
+        Un coup joué entre-temps sur la partie rend la recherche obsolète : le
+        coup est refusé ({'stale': True}) ; le tirage aléatoire de l'IA est
+        consommé quand même.
+
+        Returns:
+            tuple: ((row, col) ou None, résultat du coup)
+        """
+        move, version = self.think()
+        if move is None:
+            return None, {'valid': False, 'version': version}
+        return move, self.make_move(*move, version=version)
+
+    def _write(self, action):
+        """Écriture qui touche aussi à l'IA : après la recherche en cours, puis sous le verrou"""
+        with self._ai_lock, self._lock:
+            result = action()
+            self._publish()
+            return result
+
+    def undo(self):
+        """Annule le dernier coup (et la réponse de l'IA), voir GameLogic.undo"""
+        return self._write(self.game.undo)
+
+    def redo(self):
+        """Rétablit le dernier coup annulé, voir GameLogic.redo"""
+        return self._write(self.game.redo)
+
+    def restart_game(self):
+        """Nouvelle partie (scores conservés)"""
+        return self._write(self.game.restart_game)
+
+    def reset_scores(self):
+        """Remet les scores à zéro"""
+        with self._lock:
+            self.game.reset_scores()
+            self._publish()
+
+    def is_ai_turn(self):
+        """Retourne True si c'est le tour de l'IA (dernier instantané)"""
+        view = self._snapshot
+        return self.game.game_mode == 'ai' and view.player == 'O' and not view.game_over
@@ -0,0 +1,306 @@
+"""
+Stockage SQLite des scores et statistiques par profil
+
+Une seule connexion par fichier (mode WAL) est partagée par tous les
+utilisateurs du store. Les parties terminées sont insérées par lots et les
+agrégats (scores, résultats par mode et niveau, séries) sont gardés en cache
+mémoire : l'interface lit le cache, jamais la base, à chaque rafraîchissement.
+"""
+
+import os
+import sqlite3
+import threading
+
+# Connexions partagées par chemin de base (une seule connexion par fichier)
+_connections = {}
+_connections_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS scores (
+    profile_id INTEGER NOT NULL,
+    game_mode TEXT NOT NULL,
+    ai_level TEXT NOT NULL,
+    score_x INTEGER NOT NULL DEFAULT 0,
+    score_o INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (profile_id, game_mode, ai_level)
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    profile_id INTEGER NOT NULL,
+    game_mode TEXT NOT NULL,
+    ai_level TEXT NOT NULL,
+    result TEXT NOT NULL,
+    move_count INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    ended_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_profile_mode
+    ON results (profile_id, game_mode, ai_level, result);
+CREATE TABLE IF NOT EXISTS streaks (
+    profile_id INTEGER NOT NULL,
+    game_mode TEXT NOT NULL,
+    ai_level TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    current INTEGER NOT NULL DEFAULT 0,
+    best INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (profile_id, game_mode, ai_level, symbol)
+);
+"""
+
+
+def get_connection(path):
+    """
+    Retourne la connexion partagée pour un fichier de base (créée si besoin)
+
+    Args:
+        path: Chemin du fichier SQLite
+
+    Returns:
+        tuple: (connexion, verrou) partagés par tous les stores de ce fichier
+    """
+    path = os.path.abspath(path)
+    with _connections_lock:
+        if path not in _connections:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            _connections[path] = (conn, threading.RLock())
+        return _connections[path]
+
+
+def close_connections():
+    """Ferme toutes les connexions partagées (fin de l'application)"""
+    with _connections_lock:
+        for conn, lock in _connections.values():
+            with lock:
+                conn.close()
+        _connections.clear()
+
+
+def _new_aggregate():
+    """Agrégat vide pour un couple (mode, niveau)"""
+    return {
+        'scores': {'X': 0, 'O': 0},
+        'results': {'X': 0, 'O': 0, 'draw': 0},
+        'streaks': {'X': [0, 0], 'O': [0, 0]},  # [série actuelle, meilleure série]
+    }
+
+
+class StatsStore:
+    """Scores et statistiques persistants d'un profil"""
+
+    def __init__(self, path, profile='joueur', batch_size=1):
+        self.path = path
+        self.profile = profile
+        self.batch_size = batch_size  # Parties accumulées avant insertion
+        self._conn, self._lock = get_connection(path)
+        self._pending = []
+        self._retracted = []
+        self._dirty = set()
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO profiles (name) VALUES (?)", (profile,))
+            (self.profile_id,) = self._conn.execute(
+                "SELECT id FROM profiles WHERE name = ?", (profile,)
+            ).fetchone()
+        self._cache = {}
+        self._load_aggregates()
+
+    @staticmethod
+    def _key(game_mode, ai_level):
+        """Clé de cache : le niveau de l'IA n'a de sens qu'en mode IA (ex. 'ai', 'ultimate-ai')"""
+        is_ai = game_mode.rsplit('-', 1)[-1] == 'ai'
+        return (game_mode, ai_level if is_ai and ai_level else '')
+
+    def _aggregate(self, game_mode, ai_level):
+        """Retourne (en le créant si besoin) l'agrégat en cache d'un mode"""
+        key = self._key(game_mode, ai_level)
+        if key not in self._cache:
+            self._cache[key] = _new_aggregate()
+        return self._cache[key]
+
+    def _load_aggregates(self):
+        """Charge tous les agrégats du profil en une passe de requêtes indexées"""
+        with self._lock:
+            scores = self._conn.execute(
+                "SELECT game_mode, ai_level, score_x, score_o FROM scores WHERE profile_id = ?",
+                (self.profile_id,)
+            ).fetchall()
+            results = self._conn.execute(
+                "SELECT game_mode, ai_level, result, COUNT(*) FROM results"
+                " WHERE profile_id = ? GROUP BY game_mode, ai_level, result",
+                (self.profile_id,)
+            ).fetchall()
+            streaks = self._conn.execute(
+                "SELECT game_mode, ai_level, symbol, current, best FROM streaks WHERE profile_id = ?",
+                (self.profile_id,)
+            ).fetchall()
+
+        for game_mode, ai_level, score_x, score_o in scores:
+            aggregate = self._aggregate(game_mode, ai_level)
+            aggregate['scores'] = {'X': score_x, 'O': score_o}
+        for game_mode, ai_level, result, count in results:
+            self._aggregate(game_mode, ai_level)['results'][result] = count
+        for game_mode, ai_level, symbol, current, best in streaks:
+            self._aggregate(game_mode, ai_level)['streaks'][symbol] = [current, best]
+
+    def record_game(self, game_mode, ai_level, result, move_count=0, duration=0.0, ended_at=0.0):
+        """
+        Enregistre une partie terminée (cache immédiat, base par lots)
+
+        Args:
+            game_mode: 'pvp' ou 'ai'
+            ai_level: Niveau de l'IA (ignoré en pvp)
+            result: 'X', 'O' ou 'draw'
+            move_count: Nombre de coups joués
+            duration: Durée de la partie en secondes
+            ended_at: Horodatage de fin de partie
+        """
+        key = self._key(game_mode, ai_level)
+        aggregate = self._aggregate(*key)
+        aggregate['results'][result] += 1
+
+        streaks = aggregate['streaks']
+        for symbol, streak in streaks.items():
+            if symbol == result:
+                streak[0] += 1
+                streak[1] = max(streak[1], streak[0])
+            else:
+                streak[0] = 0
+        if result in aggregate['scores']:
+            aggregate['scores'][result] += 1
+
+        self._dirty.add(key)
+        self._pending.append((self.profile_id, key[0], key[1], result, move_count, duration, ended_at))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def retract_game(self, game_mode, ai_level, result):
+        """
+        Retire la dernière partie enregistrée avec ce résultat (coup annulé)
+
+        La meilleure série n'est pas recalculée : seule la série en cours recule.
+        """
+        key = self._key(game_mode, ai_level)
+        aggregate = self._aggregate(*key)
+        if aggregate['results'][result] == 0:
+            return
+        aggregate['results'][result] -= 1
+        if result in aggregate['scores'] and aggregate['scores'][result] > 0:
+            aggregate['scores'][result] -= 1
+        if result in aggregate['streaks'] and aggregate['streaks'][result][0] > 0:
+            aggregate['streaks'][result][0] -= 1
+        self._dirty.add(key)
+
+        # Partie pas encore écrite : il suffit de la retirer du lot en attente
+        for i in range(len(self._pending) - 1, -1, -1):
+            row = self._pending[i]
+            if row[1:4] == (key[0], key[1], result):
+                del self._pending[i]
+                break
+        else:
+            self._retracted.append((self.profile_id, key[0], key[1], result))
+        self.flush()
+
+    def reset_scores(self, game_mode, ai_level):
+        """Remet les scores d'un mode à zéro (l'historique des résultats est conservé)"""
+        key = self._key(game_mode, ai_level)
+        self._aggregate(*key)['scores'] = {'X': 0, 'O': 0}
+        self._dirty.add(key)
+        self.flush()
+
+    def flush(self):
+        """Écrit en une transaction les parties en attente et les agrégats modifiés"""
+        if not self._pending and not self._dirty and not self._retracted:
+            return
+        pending, self._pending = self._pending, []
+        retracted, self._retracted = self._retracted, []
+        dirty, self._dirty = self._dirty, set()
+
+        score_rows = []
+        streak_rows = []
+        for game_mode, ai_level in dirty:
+            aggregate = self._cache[(game_mode, ai_level)]
+            score_rows.append((self.profile_id, game_mode, ai_level,
+                               aggregate['scores']['X'], aggregate['scores']['O']))
+            for symbol, (current, best) in aggregate['streaks'].items():
+                streak_rows.append((self.profile_id, game_mode, ai_level, symbol, current, best))
+
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO results (profile_id, game_mode, ai_level, result, move_count, duration, ended_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)", pending)
+                self._conn.executemany(
+                    "DELETE FROM results WHERE id = (SELECT MAX(id) FROM results"
+                    " WHERE profile_id = ? AND game_mode = ? AND ai_level = ? AND result = ?)",
+                    retracted)
+                self._conn.executemany(
+                    "INSERT INTO scores (profile_id, game_mode, ai_level, score_x, score_o)"
+                    " VALUES (?, ?, ?, ?, ?) ON CONFLICT (profile_id, game_mode, ai_level)"
+                    " DO UPDATE SET score_x = excluded.score_x, score_o = excluded.score_o",
+                    score_rows)
+                self._conn.executemany(
+                    "INSERT INTO streaks (profile_id, game_mode, ai_level, symbol, current, best)"
+                    " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (profile_id, game_mode, ai_level, symbol)"
+                    " DO UPDATE SET current = excluded.current, best = excluded.best",
+                    streak_rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                # Remettre les écritures en attente pour une prochaine tentative
+                self._pending = pending + self._pending
+                self._retracted = retracted + self._retracted
+                self._dirty |= dirty
+                print(f"⚠️ Erreur d'écriture des statistiques: {e}")
+
+    def get_scores(self, game_mode, ai_level):
+        """Retourne les scores en cache d'un mode ({'X': n, 'O': n})"""
+        return dict(self._aggregate(game_mode, ai_level)['scores'])
+
+    def get_summary(self, game_mode, ai_level):
+        """
+        Retourne les agrégats en cache d'un mode (aucun accès à la base)
+
+        Returns:
+            dict: games, results {'X', 'O', 'draw'}, streaks {symbole: (actuelle, meilleure)}
+        """
+        aggregate = self._aggregate(game_mode, ai_level)
+        results = dict(aggregate['results'])
+        return {
+            'games': sum(results.values()),
+            'results': results,
+            'streaks': {symbol: tuple(streak) for symbol, streak in aggregate['streaks'].items()},
+        }
+
+    def query_results(self, game_mode=None, ai_level=None):
+        """
+        Requête agrégée sur la base (rapports hors interface)
+
+        Returns:
+            list: Tuples (game_mode, ai_level, result, nombre, durée moyenne, coups moyens)
+        """
+        self.flush()
+        sql = ("SELECT game_mode, ai_level, result, COUNT(*), AVG(duration), AVG(move_count)"
+               " FROM results WHERE profile_id = ?")
+        params = [self.profile_id]
+        if game_mode is not None:
+            sql += " AND game_mode = ?"
+            params.append(game_mode)
+            if ai_level is not None:
+                sql += " AND ai_level = ?"
+                params.append(self._key(game_mode, ai_level)[1])
+        sql += " GROUP BY game_mode, ai_level, result"
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        """Écrit les données en attente (la connexion partagée reste ouverte)"""
+        self.flush()
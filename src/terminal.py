@@ -0,0 +1,369 @@
+"""
+Interface terminal (curses) pour les postes sans affichage graphique
+
+Pas de tkinter ni d'animation : la partie (GameLogic, IA comprise) est
+jouée au clavier dans un terminal, y compris par SSH. Seules les cases
+modifiées sont redessinées : les évènements de la partie (src.events)
+marquent les cases à redessiner, et une case n'est réécrite que si son
+symbole ou son style a changé. Sert aussi de banc d'essai rapide des
+moteurs.
+
+Touches : flèches ou hjkl pour déplacer le curseur, Entrée ou espace pour
+jouer, u/r pour annuler/rétablir, n pour une nouvelle partie, s pour
+remettre les scores à zéro, q pour quitter. En Puissance 4, le pion tombe
+dans la colonne du curseur ; la grille infinie défile avec le curseur.
+
+Usage: python -m src.terminal --mode ai --level hard --variant gomoku
+"""
+
+import argparse
+import curses
+
+from .game import GameLogic, VARIANTS
+from .events import MovePlayed, MoveUndone, Reset
+
+# Largeur d'une case en caractères (symbole + espace)
+CELL_W = 2
+
+# Lignes d'en-tête au-dessus de la grille
+BOARD_TOP = 3
+
+MOVES = {
+    curses.KEY_UP: (-1, 0), ord('k'): (-1, 0),
+    curses.KEY_DOWN: (1, 0), ord('j'): (1, 0),
+    curses.KEY_LEFT: (0, -1), ord('h'): (0, -1),
+    curses.KEY_RIGHT: (0, 1), ord('l'): (0, 1),
+}
+
+HELP = "flèches/hjkl: curseur  Entrée: jouer  u/r: annuler/rétablir  n: nouvelle partie  s: scores à zéro  q: quitter"
+
+
+def square_layout(row, col):
+    """Position (ligne, colonne en cases) d'une case d'une grille simple"""
+    return row, col
+
+
+def ultimate_layout(row, col):
+    """Position d'une case de l'Ultimate : une ligne et une colonne vides entre les sous-grilles"""
+    return row + row // 3, col + col // 3
+
+
+def qubic_layout(row, col):
+    """Position d'une case du Qubic : les 4 couches 4x4 disposées en carré 2x2"""
+    layer, row_in_layer = divmod(row, 4)
+    return (layer // 2) * 5 + row_in_layer, (layer % 2) * 5 + col
+
+
+LAYOUTS = {
+    'ultimate': ultimate_layout,
+    'qubic': qubic_layout,
+}
+
+
+class TerminalUI:
+    """Partie affichée dans une fenêtre curses, redessinée case par case"""
+
+    def __init__(self, screen, game_logic):
+        """
+        Args:
+            screen: Fenêtre curses (curses.wrapper)
+            game_logic: GameLogic de la partie
+        """
+        self.screen = screen
+        self.game = game_logic
+        self.layout = LAYOUTS.get(game_logic.variant, square_layout)
+        self.infinite = not game_logic.state.size
+        self.cursor = (0, 0) if self.infinite else self._start_cell()
+        self.origin = (0, 0)  # Case en haut à gauche de la fenêtre (grille infinie)
+        self.message = ""
+        self.highlight = set()  # Cases de la ligne gagnante
+        self._drawn = {}  # (y, x) écran -> (texte, style) déjà affiché
+        self._status = {}  # Ligne d'en-tête/pied -> texte déjà affiché
+        self._dirty = set()  # Cases à redessiner
+        self._full = True  # Grille entière à redessiner
+        self._styles = {'X': curses.A_BOLD, 'O': curses.A_BOLD, 'win': curses.A_STANDOUT}
+        self._unsubscribe = game_logic.events.subscribe(self._on_event, MovePlayed, MoveUndone, Reset)
+
+    def _start_cell(self):
+        """Case de départ du curseur : le centre de la grille"""
+        board = self.game.board
+        return len(board) // 2, len(board[0]) // 2
+
+    def setup_colors(self):
+        """Couleurs des symboles si le terminal en dispose"""
+        if not curses.has_colors():
+            return
+        curses.start_color()
+        try:
+            curses.use_default_colors()
+            background = -1
+        except curses.error:
+            background = curses.COLOR_BLACK
+        curses.init_pair(1, curses.COLOR_RED, background)
+        curses.init_pair(2, curses.COLOR_CYAN, background)
+        curses.init_pair(3, curses.COLOR_YELLOW, background)
+        self._styles = {
+            'X': curses.color_pair(1) | curses.A_BOLD,
+            'O': curses.color_pair(2) | curses.A_BOLD,
+            'win': curses.color_pair(3) | curses.A_STANDOUT,
+        }
+
+    # --- Évènements --------------------------------------------------------------
+
+    def _on_event(self, event):
+        """Case jouée ou annulée : à redessiner ; nouvelle partie : toute la grille"""
+        if type(event) is Reset:
+            self._full = True
+            self.highlight = set()
+        else:
+            self._dirty.add((event.row, event.col))
+            if type(event) is MoveUndone and self.highlight:
+                self._dirty |= self.highlight
+                self.highlight = set()
+
+    def close(self):
+        """Se désabonne des évènements de la partie"""
+        self._unsubscribe()
+
+    # --- Dessin ------------------------------------------------------------------
+
+    def _screen_pos(self, row, col):
+        """Position écran (y, x) d'une case, None si elle est hors de la fenêtre"""
+        if self.infinite:
+            row, col = row - self.origin[0], col - self.origin[1]
+            height, width = self._view_size()
+            if not (0 <= row < height and 0 <= col < width):
+                return None
+        else:
+            row, col = self.layout(row, col)
+        return BOARD_TOP + row, col * CELL_W
+
+    def _view_size(self):
+        """Nombre de lignes et de colonnes de cases visibles (grille infinie)"""
+        lines, cols = self.screen.getmaxyx()
+        return max(1, lines - BOARD_TOP - 3), max(1, (cols - 1) // CELL_W)
+
+    def _put(self, y, x, text, style=0):
+        """Écrit un texte s'il diffère de celui déjà affiché à cet endroit"""
+        if self._drawn.get((y, x)) == (text, style):
+            return
+        self._drawn[(y, x)] = (text, style)
+        try:
+            self.screen.addstr(y, x, text, style)
+        except curses.error:
+            pass  # Hors de la fenêtre (terminal trop petit)
+
+    def _draw_cell(self, row, col):
+        """Dessine une case : symbole, surbrillance gagnante et curseur"""
+        pos = self._screen_pos(row, col)
+        if pos is None:
+            return
+        symbol = self.game.board[row][col]
+        if (row, col) in self.highlight:
+            style = self._styles['win']
+        else:
+            style = self._styles.get(symbol, curses.A_DIM)
+        if (row, col) == self.cursor:
+            style |= curses.A_REVERSE
+        self._put(pos[0], pos[1], symbol or '·', style)
+
+    def _all_cells(self):
+        """Cases affichées : toute la grille, ou la fenêtre de la grille infinie"""
+        if self.infinite:
+            height, width = self._view_size()
+            top, left = self.origin
+            return [(top + i, left + j) for i in range(height) for j in range(width)]
+        board = self.game.board
+        return [(i, j) for i in range(len(board)) for j in range(len(board[0]))]
+
+    def _status_line(self, y, text, style=0):
+        """Ligne d'en-tête ou de pied, réécrite seulement si elle a changé"""
+        if self._status.get(y) == (text, style):
+            return
+        self._status[y] = (text, style)
+        width = self.screen.getmaxyx()[1]
+        try:
+            self.screen.addstr(y, 0, text[:width - 1].ljust(width - 1), style)
+        except curses.error:
+            pass
+
+    def _board_height(self):
+        """Hauteur de la grille à l'écran, en lignes"""
+        if self.infinite:
+            return self._view_size()[0]
+        board = self.game.board
+        return self.layout(len(board) - 1, len(board[0]) - 1)[0] + 1
+
+    def render(self):
+        """Redessine l'en-tête, les cases modifiées et le pied, puis rafraîchit l'écran"""
+        game = self.game
+        if self._full:
+            self.screen.erase()
+            self._drawn.clear()
+            self._status.clear()
+            self._dirty = set(self._all_cells())
+            self._full = False
+        for row, col in self._dirty:
+            self._draw_cell(row, col)
+        self._dirty.clear()
+
+        scores = game.get_scores()
+        mode = "joueur vs IA (" + game.ai_difficulty + ")" if game.game_mode == 'ai' else "joueur vs joueur"
+        self._status_line(0, f"TIC TAC TOE DELUXE — {game.variant}, {mode}", curses.A_BOLD)
+        if game.game_over:
+            winner = game.state.winner
+            turn = f"Victoire de {winner} !" if winner else "Match nul !"
+        else:
+            turn = f"Tour de {game.current_player}"
+        self._status_line(1, f"X: {scores['X']}  O: {scores['O']}    {turn}    coups: {len(game.moves)}")
+        if self.infinite:
+            self._status_line(2, f"curseur {self.cursor[0]},{self.cursor[1]}", curses.A_DIM)
+        bottom = BOARD_TOP + self._board_height() + 1
+        self._status_line(bottom, self.message)
+        self._status_line(bottom + 1, HELP, curses.A_DIM)
+        self.screen.refresh()
+
+    # --- Actions -----------------------------------------------------------------
+
+    def move_cursor(self, d_row, d_col):
+        """Déplace le curseur (borné à la grille, ou fait défiler la grille infinie)"""
+        old = self.cursor
+        row, col = old[0] + d_row, old[1] + d_col
+        if self.infinite:
+            height, width = self._view_size()
+            top, left = self.origin
+            if not (top <= row < top + height and left <= col < left + width):
+                # Curseur sorti de la fenêtre : recentrer
+                self.origin = (row - height // 2, col - width // 2)
+                self._full = True
+        else:
+            board = self.game.board
+            row = min(max(row, 0), len(board) - 1)
+            col = min(max(col, 0), len(board[0]) - 1)
+        self.cursor = (row, col)
+        self._dirty.update((old, self.cursor))
+
+    def play(self):
+        """Joue la case du curseur (la colonne en Puissance 4), puis la réponse de l'IA"""
+        game = self.game
+        if game.game_over or game.is_ai_turn():
+            return
+        row, col = self.cursor
+        if game.variant == 'gravity':
+            drop_row = game.state.drop_row(col)
+            if drop_row is not None:
+                row = drop_row
+        result = game.make_move(row, col)
+        if not result['valid']:
+            self.message = "Coup impossible"
+            return
+        self.message = ""
+        if not self._after_move(result) and game.is_ai_turn():
+            self.message = "L'IA réfléchit..."
+            self.render()
+            move = game.get_ai_move()
+            self.message = ""
+            if move is not None:
+                self._after_move(game.make_move(*move))
+
+    def _after_move(self, result):
+        """Fin de partie : surbrillance de la ligne gagnante ; retourne True si la partie est finie"""
+        if not result['game_over']:
+            return False
+        self.highlight = set(self.game.state.get_winning_positions() or ())
+        self._dirty |= self.highlight
+        return True
+
+    def undo(self):
+        """Annule le dernier coup (et la réponse de l'IA)"""
+        if self.game.can_undo():
+            self.game.undo()
+            self.message = ""
+
+    def redo(self):
+        """Rétablit le dernier coup annulé"""
+        if self.game.can_redo():
+            self.game.redo()
+            if self.game.game_over:
+                self._after_move({'game_over': True})
+
+    def restart(self):
+        """Nouvelle partie ; l'IA joue si c'est à elle de commencer"""
+        self.game.restart_game()
+        self.message = ""
+        if self.game.is_ai_turn():
+            move = self.game.get_ai_move()
+            if move is not None:
+                self.game.make_move(*move)
+
+    def handle_key(self, key):
+        """
+        Applique une touche
+
+        Returns:
+            bool: False pour quitter
+        """
+        if key in MOVES:
+            self.move_cursor(*MOVES[key])
+        elif key in (curses.KEY_ENTER, 10, 13, ord(' ')):
+            self.play()
+        elif key == ord('u'):
+            self.undo()
+        elif key == ord('r'):
+            self.redo()
+        elif key == ord('n'):
+            self.restart()
+        elif key == ord('s'):
+            self.game.reset_scores()
+        elif key == curses.KEY_RESIZE:
+            self._full = True
+        elif key in (ord('q'), 27):
+            return False
+        return True
+
+    def run(self):
+        """Boucle clavier jusqu'à q ou Échap"""
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        self.setup_colors()
+        self.screen.keypad(True)
+        try:
+            self.render()
+            while self.handle_key(self.screen.getch()):
+                self.render()
+        finally:
+            self.close()
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Tic Tac Toe dans le terminal")
+    parser.add_argument('--mode', default='ai', choices=('ai', 'pvp'), help="contre l'IA ou à deux")
+    parser.add_argument('--level', default='medium', choices=('easy', 'medium', 'hard'),
+                        help="niveau de l'IA (joueur O)")
+    parser.add_argument('--variant', default='classic', choices=sorted(VARIANTS), help="variante jouée")
+    parser.add_argument('--seed', type=int, default=None, help="graine de la partie")
+    parser.add_argument('--log', default=None, help="journal des parties à compléter")
+    args = parser.parse_args(argv)
+
+    game_log = None
+    if args.log:
+        from .game_log import GameLogWriter
+        game_log = GameLogWriter(args.log)
+
+    game_logic = GameLogic(game_mode=args.mode, ai_difficulty=args.level, seed=args.seed,
+                           game_log=game_log, variant=args.variant)
+    try:
+        curses.wrapper(lambda screen: TerminalUI(screen, game_logic).run())
+    finally:
+        if game_log is not None:
+            game_log.close()
+
+    scores = game_logic.get_scores()
+    print(f"✓ Scores - X: {scores['X']}, O: {scores['O']}")
+
+
+if __name__ == '__main__':
+    main()
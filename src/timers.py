@@ -0,0 +1,265 @@
+"""
+Registre des callbacks after() planifiés par un écran
+
+Chaque écran (menu, jeu) possède son propre registre : tous les callbacks
+programmés passent par lui, ce qui permet de les annuler en bloc lors du
+changement d'écran et de détecter les fuites de callbacks.
+
+Les animations interpolées (TweenScheduler) passent par le même registre :
+une seule boucle after() par écran fait avancer toutes les interpolations
+en cours, image par image.
+"""
+
+import time
+import weakref
+from collections import Counter
+
+
+class TimerRegistry:
+    """Registre des callbacks after() d'un écran, annulables en bloc"""
+
+    # Tous les registres vivants, pour la détection de fuites entre écrans
+    _registries = weakref.WeakSet()
+
+    def __init__(self, master, name='écran'):
+        self.master = master
+        self.name = name
+        self.closed = False
+        self.total_scheduled = 0
+        self._handles = {}  # after_id -> étiquette du callback
+        TimerRegistry._registries.add(self)
+
+    def after(self, delay, callback, *args, label=None):
+        """
+        Programme un callback après un délai et le garde sous contrôle
+
+        Args:
+            delay: Délai en millisecondes
+            callback: Fonction à appeler
+            *args: Arguments passés au callback
+            label: Étiquette utilisée dans les rapports de fuites
+
+        Returns:
+            str: Identifiant after() ou None si le registre est fermé
+        """
+        return self._schedule(delay, callback, args, label)
+
+    def after_idle(self, callback, *args, label=None):
+        """Programme un callback dès que la boucle Tk est inactive"""
+        return self._schedule(None, callback, args, label)
+
+    def _schedule(self, delay, callback, args, label):
+        """Programme un callback et l'enregistre jusqu'à son exécution"""
+        if self.closed or not self.master:
+            return None
+
+        def run():
+            # Le callback n'est plus en attente dès qu'il démarre
+            self._handles.pop(after_id, None)
+            if not self.closed:
+                callback(*args)
+
+        try:
+            if delay is None:
+                after_id = self.master.after_idle(run)
+            else:
+                after_id = self.master.after(delay, run)
+        except Exception:
+            # Fenêtre déjà détruite : rien à programmer
+            return None
+
+        self._handles[after_id] = label or getattr(callback, '__name__', 'callback')
+        self.total_scheduled += 1
+        return after_id
+
+    def cancel(self, after_id):
+        """Annule un callback précis s'il est encore en attente"""
+        if after_id is None or self._handles.pop(after_id, None) is None:
+            return False
+        try:
+            self.master.after_cancel(after_id)
+        except Exception:
+            pass
+        return True
+
+    def cancel_all(self):
+        """
+        Annule tous les callbacks en attente de cet écran
+
+        Returns:
+            int: Nombre de callbacks annulés
+        """
+        pending = list(self._handles)
+        self._handles.clear()
+        for after_id in pending:
+            try:
+                self.master.after_cancel(after_id)
+            except Exception:
+                pass
+        return len(pending)
+
+    def close(self):
+        """Annule tout et refuse les programmations suivantes (fin de l'écran)"""
+        cancelled = self.cancel_all()
+        self.closed = True
+        return cancelled
+
+    def live_count(self):
+        """Retourne le nombre de callbacks encore en attente"""
+        return len(self._handles)
+
+    def live_callbacks(self):
+        """Retourne le nombre de callbacks en attente par étiquette"""
+        return Counter(self._handles.values())
+
+    def report(self):
+        """Affiche l'état du registre (utile pour traquer les fuites)"""
+        live = self.live_callbacks()
+        details = ", ".join(f"{label}×{count}" for label, count in live.most_common())
+        state = "fermé" if self.closed else "actif"
+        print(f"⏱️ Timers [{self.name}] ({state}): {sum(live.values())} en attente"
+              f" / {self.total_scheduled} programmés" + (f" — {details}" if details else ""))
+
+    @classmethod
+    def total_live(cls):
+        """Retourne le nombre total de callbacks en attente, tous écrans confondus"""
+        return sum(registry.live_count() for registry in list(cls._registries))
+
+    @classmethod
+    def report_all(cls):
+        """Affiche l'état de tous les registres encore référencés"""
+        for registry in list(cls._registries):
+            registry.report()
+
+
+def ease_out_cubic(t):
+    """Courbe d'accélération : départ rapide, arrivée amortie"""
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_quad(t):
+    """Courbe d'accélération : départ lent, arrivée rapide (chute)"""
+    return t * t
+
+
+def linear(t):
+    """Progression constante"""
+    return t
+
+
+class Tween:
+    """Interpolation en cours : step(progression) appelé à chaque image"""
+
+    __slots__ = ('step', 'done', 'easing', 'start', 'duration', 'cancelled')
+
+    def __init__(self, step, done, easing, start, duration):
+        self.step = step
+        self.done = done
+        self.easing = easing
+        self.start = start
+        self.duration = duration
+        self.cancelled = False
+
+
+class TweenScheduler:
+    """Animations interpolées d'un écran, toutes avancées par une seule boucle after()"""
+
+    FRAME_MS = 16  # Environ 60 images par seconde
+
+    def __init__(self, timers):
+        """
+        Args:
+            timers: TimerRegistry de l'écran (les images sont annulées avec lui)
+        """
+        self.timers = timers
+        self._tweens = []
+        self._frame = None
+
+    def tween(self, duration, step, done=None, easing=ease_out_cubic, delay=0):
+        """
+        Lance une interpolation
+
+        Args:
+            duration: Durée en millisecondes
+            step: Fonction appelée avec la progression (0.0 à 1.0, après easing)
+            done: Fonction appelée à la fin (pas en cas d'annulation)
+            easing: Courbe appliquée à la progression
+            delay: Attente avant le début, en millisecondes
+
+        Returns:
+            Tween: Interpolation, annulable par cancel()
+        """
+        start = time.perf_counter() + delay / 1000
+        tween = Tween(step, done, easing, start, max(duration, 1) / 1000)
+        self._tweens.append(tween)
+        if self._frame is None:
+            self._frame = self.timers.after(self.FRAME_MS, self._tick, label='tween')
+        return tween
+
+    def sequence(self, duration, values, apply, done=None):
+        """
+        Parcourt une suite de valeurs discrètes (couleurs d'un clignotement...)
+
+        Args:
+            duration: Durée totale en millisecondes
+            values: Valeurs successives
+            apply: Fonction appelée avec chaque nouvelle valeur
+            done: Fonction appelée à la fin
+
+        Returns:
+            Tween: Interpolation, annulable par cancel()
+        """
+        last = len(values) - 1
+        shown = [None]
+
+        def step(t):
+            index = min(int(t * len(values)), last)
+            if index != shown[0]:
+                shown[0] = index
+                apply(values[index])
+
+        return self.tween(duration, step, done, easing=linear)
+
+    def cancel(self, tween):
+        """Arrête une interpolation sans appeler done"""
+        if tween is not None:
+            tween.cancelled = True
+
+    def cancel_all(self):
+        """Arrête toutes les interpolations en cours"""
+        for tween in self._tweens:
+            tween.cancelled = True
+        self._tweens = []
+        self.timers.cancel(self._frame)
+        self._frame = None
+
+    def active_count(self):
+        """Nombre d'interpolations en cours"""
+        return sum(1 for tween in self._tweens if not tween.cancelled)
+
+    def _tick(self):
+        """Image suivante : fait avancer toutes les interpolations en cours"""
+        self._frame = None
+        now = time.perf_counter()
+        # Les interpolations lancées par les callbacks rejoignent la nouvelle liste
+        current, self._tweens = self._tweens, []
+        running = []
+        for tween in current:
+            if tween.cancelled:
+                continue
+            if now < tween.start:
+                running.append(tween)
+                continue
+            progress = min(1.0, (now - tween.start) / tween.duration)
+            try:
+                tween.step(tween.easing(progress))
+                if progress >= 1.0 and tween.done is not None:
+                    tween.done()
+            except Exception:
+                # Widget détruit pendant l'animation : l'interpolation s'arrête
+                continue
+            if progress < 1.0:
+                running.append(tween)
+        self._tweens = running + self._tweens
+        if self._tweens and self._frame is None:
+            self._frame = self.timers.after(self.FRAME_MS, self._tick, label='tween')
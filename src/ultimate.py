@@ -0,0 +1,417 @@
+"""
+Ultimate Tic Tac Toe : 9 sous-grilles et une méta-grille
+
+Chaque sous-grille est un masque de 9 bits par joueur ; une sous-grille
+gagnée (ou pleine) est fermée et marque la case correspondante de la
+méta-grille. La case jouée désigne la sous-grille où l'adversaire doit
+jouer (choix libre si elle est fermée).
+
+Les victoires sont détectées par des tables précalculées à partir des
+lignes gagnantes de utils : un accès à WIN_TABLE par coup, sans parcourir
+la grille, pour les sous-grilles comme pour la méta-grille.
+"""
+
+import random
+import time
+from .utils import ReplayableRandom, create_empty_board, winning_lines, zobrist_keys, switch_player
+from .search_stats import SearchInstrumentation
+from config.settings import ULTIMATE_CONFIG
+
+FULL_MASK = 0x1FF  # 9 cases occupées
+
+# Masques des lignes gagnantes d'une grille 3x3
+LINE_MASKS = tuple(sum(1 << cell for cell in line) for line in winning_lines(3))
+
+# WIN_TABLE[masque] vaut 1 si le masque contient une ligne gagnante
+WIN_TABLE = bytes(int(any(mask & line == line for line in LINE_MASKS)) for mask in range(512))
+
+# THREATS[masque] : cases qui compléteraient une ligne pour ce masque
+THREATS = tuple(
+    sum(1 << cell for cell in range(9) if not mask >> cell & 1 and WIN_TABLE[mask | 1 << cell])
+    for mask in range(512)
+)
+
+POPCOUNT = bytes(bin(mask).count('1') for mask in range(512))
+
+# CELLS[masque] : indices des bits à 1 d'un masque
+CELLS = tuple(tuple(cell for cell in range(9) if mask >> cell & 1) for mask in range(512))
+
+# Poids positionnels des cases (centre, coins, côtés) pour l'évaluation
+SQUARE_WEIGHTS = (3, 2, 3, 2, 4, 2, 3, 2, 3)
+
+# Clés de Zobrist : une par case (81) et par sous-grille imposée (9 + choix libre)
+MOVE_KEYS = zobrist_keys(9)
+_next_rng = random.Random(0x0171)
+NEXT_BOARD_KEYS = tuple(_next_rng.getrandbits(64) for _ in range(10))
+
+
+def move_to_cell(move):
+    """Convertit un coup (sous-grille * 9 + case) en position (row, col) sur la grille 9x9"""
+    board, cell = divmod(move, 9)
+    return (board // 3) * 3 + cell // 3, (board % 3) * 3 + cell % 3
+
+
+def cell_to_move(row, col):
+    """Convertit une position (row, col) de la grille 9x9 en coup (sous-grille * 9 + case)"""
+    return ((row // 3) * 3 + col // 3) * 9 + (row % 3) * 3 + col % 3
+
+
+class UltimateState:
+    """
+    Position d'Ultimate Tic Tac Toe jouée/annulée en place
+
+    Expose la même interface que BoardState (make, unmake, is_full,
+    empty_cells, winner, key, grid 9x9) pour être pilotée par GameLogic.
+    """
+
+    size = 9
+
+    def __init__(self):
+        self.grid = create_empty_board(9)
+        self.boards = {'X': [0] * 9, 'O': [0] * 9}  # Masques des sous-grilles
+        self.meta = {'X': 0, 'O': 0}  # Sous-grilles gagnées
+        self.closed = 0  # Sous-grilles gagnées ou pleines
+        self.next_board = -1  # Sous-grille imposée (-1 : choix libre)
+        self.filled = 0
+        self.winner = None
+        self.key = NEXT_BOARD_KEYS[9]
+        self.history = []  # Pile d'annulation
+
+    def copy(self):
+        """Copie indépendante (recherche de l'IA sans toucher la partie)"""
+        other = UltimateState.__new__(UltimateState)
+        other.grid = [row[:] for row in self.grid]
+        other.boards = {symbol: masks[:] for symbol, masks in self.boards.items()}
+        other.meta = dict(self.meta)
+        other.closed = self.closed
+        other.next_board = self.next_board
+        other.filled = self.filled
+        other.winner = self.winner
+        other.key = self.key
+        other.history = list(self.history)
+        return other
+
+    def legal_moves(self):
+        """Retourne les coups légaux (sous-grille * 9 + case)"""
+        if self.winner is not None:
+            return []
+        boards_x, boards_o = self.boards['X'], self.boards['O']
+        if self.next_board >= 0:
+            targets = (self.next_board,)
+        else:
+            targets = CELLS[~self.closed & FULL_MASK]
+        moves = []
+        for board in targets:
+            base = board * 9
+            moves.extend(base + cell for cell in CELLS[~(boards_x[board] | boards_o[board]) & FULL_MASK])
+        return moves
+
+    def make_move(self, move, symbol):
+        """
+        Joue un coup
+
+        Args:
+            move: Sous-grille * 9 + case
+            symbol: 'X' ou 'O'
+
+        Returns:
+            bool: True si le coup gagne la partie
+        """
+        board, cell = divmod(move, 9)
+        masks = self.boards[symbol]
+        self.history.append((move, self.next_board, self.closed, self.meta[symbol], self.winner))
+
+        masks[board] |= 1 << cell
+        row, col = move_to_cell(move)
+        self.grid[row][col] = symbol
+        self.filled += 1
+        self.key ^= MOVE_KEYS[symbol][move] ^ NEXT_BOARD_KEYS[self.next_board]
+
+        if WIN_TABLE[masks[board]]:
+            self.meta[symbol] |= 1 << board
+            self.closed |= 1 << board
+            if WIN_TABLE[self.meta[symbol]]:
+                self.winner = symbol
+        elif masks[board] | self.boards[switch_player(symbol)][board] == FULL_MASK:
+            self.closed |= 1 << board
+
+        # La case jouée désigne la prochaine sous-grille, sauf si elle est fermée
+        self.next_board = -1 if self.closed >> cell & 1 else cell
+        self.key ^= NEXT_BOARD_KEYS[self.next_board]
+        return self.winner is not None
+
+    def unmake_move(self):
+        """Annule le dernier coup joué"""
+        move, next_board, closed, meta, winner = self.history.pop()
+        board, cell = divmod(move, 9)
+        row, col = move_to_cell(move)
+        symbol = self.grid[row][col]
+        self.key ^= NEXT_BOARD_KEYS[self.next_board] ^ MOVE_KEYS[symbol][move] ^ NEXT_BOARD_KEYS[next_board]
+        self.boards[symbol][board] &= ~(1 << cell)
+        self.grid[row][col] = ""
+        self.filled -= 1
+        self.next_board = next_board
+        self.closed = closed
+        self.meta[symbol] = meta
+        self.winner = winner
+
+    def make(self, row, col, symbol):
+        """Joue un coup donné en coordonnées de la grille 9x9 (interface BoardState)"""
+        return self.make_move(cell_to_move(row, col), symbol)
+
+    def unmake(self, row, col):
+        """Annule le dernier coup, qui doit être celui de la case (row, col)"""
+        self.unmake_move()
+
+    def is_legal(self, row, col):
+        """Retourne True si la case (row, col) peut être jouée"""
+        if self.winner is not None or self.grid[row][col] != "":
+            return False
+        board = (row // 3) * 3 + col // 3
+        if self.next_board >= 0:
+            return board == self.next_board
+        return not self.closed >> board & 1
+
+    def is_full(self):
+        """Retourne True si toutes les sous-grilles sont fermées (plus aucun coup possible)"""
+        return self.closed == FULL_MASK
+
+    def empty_cells(self):
+        """Retourne les coups légaux sous forme de (row, col)"""
+        return [move_to_cell(move) for move in self.legal_moves()]
+
+    def get_winning_positions(self):
+        """Retourne les cases des sous-grilles de la ligne gagnante de la méta-grille, ou None"""
+        if self.winner is None:
+            return None
+        meta = self.meta[self.winner]
+        for line in winning_lines(3):
+            if all(meta >> board & 1 for board in line):
+                return [move_to_cell(board * 9 + cell) for board in line for cell in range(9)]
+        return None
+
+
+class _SearchTimeout(Exception):
+    """Temps de réflexion écoulé (ou arrêt demandé) pendant la recherche"""
+
+
+# Bornes des scores : les victoires sont ramenées au nombre de coups pour préférer les plus rapides
+WIN_SCORE = 100000
+MATE_THRESHOLD = WIN_SCORE - 1000
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
+class UltimateAI(SearchInstrumentation):
+    """IA alpha-beta à approfondissement itératif pour Ultimate Tic Tac Toe"""
+
+    def __init__(self, difficulty='hard', player_symbol='O', seed=None, time_limit=None):
+        self.difficulty = difficulty
+        self.player_symbol = player_symbol
+        self.human_symbol = switch_player(player_symbol)
+        self.move_count = 0
+        self.rng = ReplayableRandom(seed)
+        self.max_depth = ULTIMATE_CONFIG['max_depth'][difficulty]
+        self.time_limit = ULTIMATE_CONFIG['time_limit'] if time_limit is None else time_limit
+        self._transpositions = {}
+        self._stop_requested = False
+        self._deadline = 0.0
+        self._nodes = 0
+
+    def reseed(self, seed):
+        """Réinitialise le générateur aléatoire de l'IA avec une graine donnée"""
+        self.rng.seed(seed)
+
+    def reset_game(self):
+        """Réinitialise l'état de l'IA pour une nouvelle partie"""
+        self.move_count = 0
+        self._transpositions = {}
+
+    def get_thinking_time(self):
+        """Délai d'affichage avant le coup (la recherche a sa propre limite de temps)"""
+        return 0.3
+
+    def stop(self):
+        """Demande l'arrêt de la recherche en cours (le meilleur coup trouvé est retourné)"""
+        self._stop_requested = True
+
+    def clear_stop(self):
+        """Oublie un stop précédent (à appeler avant de lancer la recherche qu'un stop peut interrompre)"""
+        self._stop_requested = False
+
+    def get_move(self, state):
+        """
+        Retourne le coup de l'IA
+
+        Args:
+            state: UltimateState de la partie (non modifié)
+
+        Returns:
+            tuple: (row, col) sur la grille 9x9
+        """
+        self.move_count += 1
+        started = self._begin_stats()
+        move = self._search(state.copy())
+        self._end_stats(started, move)
+        return move
+
+    def _search(self, state):
+        """Approfondissement itératif jusqu'à la profondeur maximale ou la limite de temps"""
+        moves = state.legal_moves()
+        if not moves:
+            return None
+        # Ordre initial mélangé : parties variées à évaluation égale
+        self.rng.shuffle(moves)
+        best_move = moves[0]
+        if len(moves) == 1:
+            return move_to_cell(best_move)
+
+        self._deadline = time.perf_counter() + self.time_limit
+        self._nodes = 0
+        stats = self._stats
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._timed('alphabeta', self._root, state, moves, depth)
+            except _SearchTimeout:
+                break
+            best_move = move
+            # Coup trouvé en tête de liste à l'itération suivante
+            moves.remove(move)
+            moves.insert(0, move)
+            if stats is not None:
+                stats.max_depth = depth
+                stats.score = score
+            if abs(score) >= MATE_THRESHOLD:
+                break
+        return move_to_cell(best_move)
+
+    def _root(self, state, moves, depth):
+        """Recherche à la racine : retourne (score, meilleur coup)"""
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_move = moves[0]
+        for move in moves:
+            state.make_move(move, self.player_symbol)
+            score = -self._alphabeta(state, self.human_symbol, depth - 1, -beta, -alpha, 1)
+            state.unmake_move()
+            if score > alpha:
+                alpha = score
+                best_move = move
+        return alpha, best_move
+
+    def _alphabeta(self, state, symbol, depth, alpha, beta, ply):
+        """
+        Négamax avec élagage alpha-beta et table de transposition
+
+        Args:
+            state: Position jouée/annulée en place
+            symbol: Joueur au trait
+            depth: Profondeur restante
+            alpha: Borne basse de la fenêtre
+            beta: Borne haute de la fenêtre
+            ply: Distance à la racine
+
+        Returns:
+            int: Score du point de vue du joueur au trait
+        """
+        self._nodes += 1
+        if self._nodes & 1023 == 0 and (self._stop_requested or time.perf_counter() > self._deadline):
+            raise _SearchTimeout()
+        stats = self._stats
+        if stats is not None:
+            stats.nodes += 1
+
+        # Le coup précédent a gagné : le joueur au trait a perdu
+        if state.winner is not None:
+            return ply - WIN_SCORE
+        if state.is_full():
+            return 0
+        if depth == 0:
+            return self._evaluate(state, symbol)
+
+        alpha_orig = alpha
+        key = state.key if symbol == 'X' else ~state.key
+        entry = self._transpositions.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, value, bound, tt_move = entry
+            if entry_depth >= depth:
+                value = _from_table(value, ply)
+                if bound == EXACT or (bound == LOWER_BOUND and value >= beta) or (bound == UPPER_BOUND and value <= alpha):
+                    if stats is not None:
+                        stats.cache_hits += 1
+                    return value
+
+        moves = state.legal_moves()
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        opponent = switch_player(symbol)
+        best = -WIN_SCORE - 1
+        best_move = moves[0]
+        for move in moves:
+            state.make_move(move, symbol)
+            score = -self._alphabeta(state, opponent, depth - 1, -beta, -alpha, ply + 1)
+            state.unmake_move()
+            if score > best:
+                best = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if stats is not None:
+                            stats.cutoffs += 1
+                        break
+
+        if best <= alpha_orig:
+            bound = UPPER_BOUND
+        elif best >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._transpositions[key] = (depth, _to_table(best, ply), bound, best_move)
+        return best
+
+    def _evaluate(self, state, symbol):
+        """Évaluation statique du point de vue de symbol"""
+        return _side_score(state, symbol) - _side_score(state, switch_player(symbol))
+
+
+def _side_score(state, symbol):
+    """
+    Score positionnel d'un joueur (tables précalculées, sans parcourir la grille)
+
+    Sous-grilles gagnées (pondérées par leur place), menaces ouvertes sur la
+    méta-grille et menaces ouvertes dans chaque sous-grille encore jouable.
+    """
+    meta = state.meta[symbol]
+    open_boards = ~state.closed & FULL_MASK
+
+    score = 0
+    for board in CELLS[meta]:
+        score += 100 * SQUARE_WEIGHTS[board]
+    score += 400 * POPCOUNT[THREATS[meta] & open_boards]
+
+    masks, other = state.boards[symbol], state.boards[switch_player(symbol)]
+    for board in CELLS[open_boards]:
+        free = ~(masks[board] | other[board]) & FULL_MASK
+        score += SQUARE_WEIGHTS[board] * (5 * POPCOUNT[THREATS[masks[board]] & free] + POPCOUNT[masks[board]])
+    return score
+
+
+def _to_table(score, ply):
+    """Score de victoire rendu indépendant de la distance à la racine (stockage)"""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _from_table(score, ply):
+    """Score de victoire ramené à la distance à la racine courante (lecture)"""
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
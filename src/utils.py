@@ -2,39 +2,164 @@
 Fonctions utilitaires pour le jeu Tic Tac Toe
 """
 
+import os
+import random
+from functools import lru_cache
+from itertools import product
+
+ZOBRIST_SEED = 0x5A0B  # Graine fixe : les clés sont identiques d'une exécution à l'autre
+
+class ReplayableRandom(random.Random):
+    """
+    Générateur aléatoire dont l'état tient en deux entiers : sa graine et le
+    nombre de mots de 32 bits tirés depuis (instantanés de sessions du serveur)
+
+    Les tirages sont identiques à ceux de random.Random avec la même graine :
+    tous passent par random() (2 mots) ou getrandbits() (un mot par tranche
+    de 32 bits). Le cache de gauss() n'est pas compté.
+    """
+
+    def seed(self, a=None, version=2):
+        """Réinitialise le générateur (graine tirée au hasard si None)"""
+        if a is None:
+            a = int.from_bytes(os.urandom(8), 'little')
+        elif isinstance(a, int):
+            a = abs(a)  # random.Random ignore le signe
+        self.seed_value = a
+        self.words = 0
+        super().seed(a, version)
+
+    def random(self):
+        self.words += 2
+        return super().random()
+
+    def getrandbits(self, k):
+        self.words += (k + 31) // 32
+        return super().getrandbits(k)
+
+    def restore(self, seed, words):
+        """Remet le générateur dans l'état décrit par (seed_value, words)"""
+        self.seed(seed)
+        getrandbits = super().getrandbits
+        for _ in range(words):
+            getrandbits(32)
+        self.words = words
+
 def create_empty_board(size=3):
     """Crée une grille de jeu vide"""
     return [["" for _ in range(size)] for _ in range(size)]
 
-def check_winner(board):
+@lru_cache(maxsize=None)
+def winning_lines(size=3, dimensions=2):
     """
-    Vérifie s'il y a un gagnant sur le plateau
+    Retourne les lignes gagnantes d'une grille carrée ou d'un cube (calculées une seule fois)
     
     Args:
-        board: La grille de jeu 3x3
+        size: Taille de la grille
+        dimensions: 2 pour une grille, 3 pour un cube (76 lignes en 4x4x4)
         
     Returns:
-        bool: True s'il y a un gagnant, False sinon
+        tuple: Lignes, colonnes puis diagonales, chacune sous forme de tuple
+        d'indices de cases (row * size + col, ou layer * size² + row * size + col)
+    """
+    if dimensions != 2:
+        return _cube_lines(size, dimensions)
+    lines = []
+    for i in range(size):
+        lines.append(tuple(i * size + j for j in range(size)))
+    for j in range(size):
+        lines.append(tuple(i * size + j for i in range(size)))
+    lines.append(tuple(i * size + i for i in range(size)))
+    lines.append(tuple(i * size + (size - 1 - i) for i in range(size)))
+    return tuple(lines)
+
+def _cube_lines(size, dimensions):
+    """Lignes d'un hypercube : toutes les directions, chaque ligne prise depuis sa première case"""
+    strides = [size ** axis for axis in range(dimensions)]
+    # Une direction par paire (d, -d) : première composante non nulle positive
+    directions = [d for d in product((-1, 0, 1), repeat=dimensions)
+                  if any(d) and next(step for step in d if step) > 0]
+    lines = []
+    for direction in directions:
+        for start in product(range(size), repeat=dimensions):
+            end = [coord + (size - 1) * step for coord, step in zip(start, direction)]
+            before = [coord - step for coord, step in zip(start, direction)]
+            if not all(0 <= coord < size for coord in end):
+                continue
+            if all(0 <= coord < size for coord in before):
+                continue  # La ligne a déjà été comptée depuis une case précédente
+            cells = []
+            for k in range(size):
+                coords = [coord + k * step for coord, step in zip(start, direction)]
+                cells.append(sum(coord * stride for coord, stride in zip(reversed(coords), strides)))
+            lines.append(tuple(cells))
+    return tuple(lines)
+
+@lru_cache(maxsize=None)
+def cell_lines(size=3, dimensions=2):
+    """
+    Retourne, pour chaque case, les indices des lignes gagnantes qui la contiennent
+    
+    Args:
+        size: Taille de la grille
+        dimensions: 2 pour une grille, 3 pour un cube
+        
+    Returns:
+        tuple: Pour chaque indice de case, tuple des indices de lignes
+    """
+    membership = [[] for _ in range(size ** dimensions)]
+    for line_index, line in enumerate(winning_lines(size, dimensions)):
+        for cell in line:
+            membership[cell].append(line_index)
+    return tuple(tuple(lines) for lines in membership)
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size=3, dimensions=2):
+    """
+    Retourne les clés de Zobrist d'une grille carrée ou d'un cube (tirées une seule fois)
+    
+    Args:
+        size: Taille de la grille
+        dimensions: 2 pour une grille, 3 pour un cube
+        
+    Returns:
+        dict: Pour 'X' et 'O', tuple d'une clé 64 bits par indice de case
+    """
+    rng = random.Random(ZOBRIST_SEED + size + (dimensions - 2) * 0x100)
+    cells = size ** dimensions
+    return {symbol: tuple(rng.getrandbits(64) for _ in range(cells)) for symbol in ('X', 'O')}
+
+def zobrist_key(board):
+    """
+    Calcule entièrement la clé de Zobrist d'une grille (XOR des clés des cases occupées)
+    
+    Args:
+        board: La grille de jeu
+        
+    Returns:
+        int: Clé 64 bits de la position
     """
     size = len(board)
+    keys = zobrist_keys(size)
+    key = 0
+    for row in range(size):
+        for col in range(size):
+            symbol = board[row][col]
+            if symbol:
+                key ^= keys[symbol][row * size + col]
+    return key
+
+def check_winner(board):
+    """
+    Vérifie s'il y a un gagnant sur le plateau
     
-    # Vérifier les lignes
-    for row in board:
-        if row[0] == row[1] == row[2] != "":
-            return True
-            
-    # Vérifier les colonnes
-    for col in range(size):
-        if board[0][col] == board[1][col] == board[2][col] != "":
-            return True
-            
-    # Vérifier les diagonales
-    if board[0][0] == board[1][1] == board[2][2] != "":
-        return True
-    if board[0][2] == board[1][1] == board[2][0] != "":
-        return True
+    Args:
+        board: La grille de jeu (3x3 par défaut)
         
-    return False
+    Returns:
+        bool: True s'il y a un gagnant, False sinon
+    """
+    return get_winning_positions(board) is not None
 
 def is_board_full(board):
     """
@@ -57,28 +182,36 @@ def get_winning_positions(board):
     Retourne les positions de la ligne gagnante
     
     Args:
-        board: La grille de jeu 3x3
+        board: La grille de jeu (3x3 par défaut)
         
     Returns:
         list: Liste des positions (row, col) de la ligne gagnante ou None
     """
     size = len(board)
+    line = find_winning_line([symbol for row in board for symbol in row], size)
+    if line is None:
+        return None
+    return [(cell // size, cell % size) for cell in line]
+
+def find_winning_line(cells, size=3, dimensions=2):
+    """
+    Cherche une ligne gagnante dans une grille ou un cube à plat
     
-    # Vérifier les lignes
-    for i, row in enumerate(board):
-        if row[0] == row[1] == row[2] != "":
-            return [(i, 0), (i, 1), (i, 2)]
-            
-    # Vérifier les colonnes
-    for col in range(size):
-        if board[0][col] == board[1][col] == board[2][col] != "":
-            return [(0, col), (1, col), (2, col)]
-            
-    # Vérifier les diagonales
-    if board[0][0] == board[1][1] == board[2][2] != "":
-        return [(0, 0), (1, 1), (2, 2)]
-    if board[0][2] == board[1][1] == board[2][0] != "":
-        return [(0, 2), (1, 1), (2, 0)]
+    Args:
+        cells: Symboles des cases, indexés comme dans winning_lines
+        size: Taille de la grille
+        dimensions: 2 pour une grille, 3 pour un cube
+        
+    Returns:
+        tuple: Indices des cases de la ligne gagnante ou None
+    """
+    # Vérifier les lignes, les colonnes puis les diagonales
+    for line in winning_lines(size, dimensions):
+        first = cells[line[0]]
+        if first == "":
+            continue
+        if all(cells[cell] == first for cell in line):
+            return line
         
     return None
 